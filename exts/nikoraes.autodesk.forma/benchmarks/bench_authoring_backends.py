@@ -0,0 +1,61 @@
+"""Compare authoring meshes through a composed Usd.Stage with writing the prim specs straight into an Sdf.Layer.
+
+Every run writes `--prims` meshes into a new layer, one request at a time like `importmesh` does,
+so the stage backend pays for composition and change processing on every mesh.
+
+Usage:
+    python benchmarks/bench_authoring_backends.py [--prims 1 1000] [--vertices 3000] [--repeat 3]
+"""
+import argparse
+
+import numpy as np
+from pxr import Sdf, Usd
+
+from bench_utils import load_forma_module, make_triangle_soup, timed
+
+forma_mesh = load_forma_module("forma_mesh")
+
+
+def author_stage(meshes):
+    stage = Usd.Stage.CreateInMemory()
+    for prim_path, mesh_data in meshes:
+        forma_mesh.author_mesh(stage, prim_path, mesh_data)
+
+
+def author_layer(meshes):
+    layer = Sdf.Layer.CreateAnonymous()
+    for prim_path, mesh_data in meshes:
+        with Sdf.ChangeBlock():
+            forma_mesh.author_mesh_spec(layer, prim_path, mesh_data)
+
+
+def author_layer_watched(meshes):
+    """The Sdf backend while a stage is open on the layer, like the stage open in Kit"""
+    stage = Usd.Stage.CreateInMemory()
+    layer = stage.GetRootLayer()
+    for prim_path, mesh_data in meshes:
+        with Sdf.ChangeBlock():
+            forma_mesh.author_mesh_spec(layer, prim_path, mesh_data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--prims", type=int, nargs="+", default=[1, 1000], help="Meshes written per layer")
+    parser.add_argument("--vertices", type=int, default=3000, help="Vertices per mesh")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per size, the best one is reported")
+    args = parser.parse_args()
+
+    vertices = np.frombuffer(make_triangle_soup(args.vertices), dtype=np.float32).reshape((-1, 3))
+    mesh_data = forma_mesh.triangle_soup_to_mesh(vertices)
+
+    print(f"{'prims':>8} {'stage (s)':>12} {'layer (s)':>12} {'layer+stage (s)':>16} {'speedup':>9}")
+    for prim_count in args.prims:
+        meshes = [(f"/World/_mesh{i}", mesh_data) for i in range(prim_count)]
+        stage = timed(author_stage, meshes, repeat=args.repeat)
+        layer = timed(author_layer, meshes, repeat=args.repeat)
+        watched = timed(author_layer_watched, meshes, repeat=args.repeat)
+        print(f"{prim_count:>8} {stage:>12.4f} {layer:>12.4f} {watched:>16.4f} {stage / layer:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Compare the per-vertex Python mesh authoring with the vectorized NumPy to Vt path.
+
+Usage:
+    python benchmarks/bench_import_mesh.py [--sizes 10000 1000000 10000000] [--repeat 3]
+"""
+import argparse
+
+from pxr import Gf, Usd, UsdGeom
+
+from bench_utils import load_forma_module, make_triangle_soup, timed
+
+forma_mesh = load_forma_module("forma_mesh")
+
+DEFAULT_SIZES = [10_000, 1_000_000, 10_000_000]
+
+
+def author_legacy(file_bytes: bytes):
+    """The authoring code of `handle_import_mesh` before the vectorized path"""
+    import numpy as np
+
+    stage = Usd.Stage.CreateInMemory()
+    mesh = np.frombuffer(file_bytes, dtype=np.float32)
+    mesh_prim = UsdGeom.Mesh.Define(stage, "/World/_mesh")
+    vertices = mesh.reshape((-1, 3))
+    points = [
+        Gf.Vec3f(vertices[i][0].item(), vertices[i][1].item(), vertices[i][2].item())
+        for i in range(len(vertices))
+    ]
+    mesh_prim.CreatePointsAttr(points)
+    mesh_prim.CreateFaceVertexCountsAttr([3 for _ in range(len(points) // 3)])
+    mesh_prim.CreateFaceVertexIndicesAttr([i for i in range(len(points))])
+
+
+def author_vectorized(file_bytes: bytes):
+    stage = Usd.Stage.CreateInMemory()
+    vertices = forma_mesh.vertices_from_buffer(file_bytes)
+    forma_mesh.author_mesh(stage, "/World/_mesh", forma_mesh.triangle_soup_to_mesh(vertices))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Vertex counts")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per size, the best one is reported")
+    parser.add_argument("--skip-legacy", action="store_true", help="Only time the vectorized path")
+    args = parser.parse_args()
+
+    print(f"{'vertices':>12} {'legacy (s)':>12} {'vectorized (s)':>15} {'speedup':>9}")
+    for size in args.sizes:
+        file_bytes = make_triangle_soup(size)
+        vectorized = timed(author_vectorized, file_bytes, repeat=args.repeat)
+        if args.skip_legacy:
+            print(f"{size:>12} {'-':>12} {vectorized:>15.4f} {'-':>9}")
+            continue
+        legacy = timed(author_legacy, file_bytes, repeat=args.repeat)
+        print(f"{size:>12} {legacy:>12.4f} {vectorized:>15.4f} {legacy / vectorized:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Multi-client load test: import throughput as the requests are spread over more distinct stages.
+
+Clients submit imports through the request manager, which runs the requests of one stage one at a time.
+Conversion runs in a worker pool and authoring plus saving on the main loop, like in the extension.
+With more distinct stages, the conversion of one stage overlaps with the work on the others.
+
+Usage:
+    python benchmarks/bench_stage_lanes.py [--clients 16] [--requests 128] [--stages 1 2 4 8] [--workers 4]
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import functools
+import os
+import tempfile
+import time
+
+from pxr import Sdf, Usd
+
+from bench_utils import load_forma_module, make_triangle_soup
+
+forma_mesh = load_forma_module("forma_mesh")
+forma_request_manager = load_forma_module("forma_request_manager")
+
+
+async def _run(args, stage_count: int, folder: str, payloads: list) -> float:
+    loop = asyncio.get_event_loop()
+    pool = concurrent.futures.ThreadPoolExecutor(max_workers=args.workers)
+    manager = forma_request_manager.RequestManager(max_pending=args.requests, retry_after=1.0)
+    options = forma_mesh.ConversionOptions(weld_vertices=True)
+    stages = {}
+
+    def convert(vertices):
+        return forma_mesh.prepare_mesh(forma_mesh.triangle_soup_to_mesh(vertices), options)
+
+    async def import_mesh(usd_path: str, forma_path: str, vertices):
+        mesh_data = await loop.run_in_executor(pool, functools.partial(convert, vertices))
+        stage = stages.get(usd_path)
+        if stage is None:
+            stage = stages[usd_path] = Usd.Stage.CreateNew(usd_path)
+        with Sdf.ChangeBlock():
+            forma_mesh.author_mesh_spec(stage.GetRootLayer(), f"/World/_{forma_path}", mesh_data)
+        stage.Save()
+        return {"ok": True}
+
+    async def client(index: int):
+        for request in range(index, args.requests, args.clients):
+            usd_path = os.path.join(folder, f"stage_{stage_count}_{request % stage_count}.usdc")
+            vertices = payloads[request % len(payloads)]
+            await manager.submit(
+                usd_path,
+                forma_request_manager.IMPORT,
+                str(request),
+                lambda usd_path=usd_path, request=request, vertices=vertices: import_mesh(
+                    usd_path, str(request), vertices
+                ),
+            )
+
+    start = time.perf_counter()
+    await asyncio.gather(*[client(i) for i in range(args.clients)])
+    elapsed = time.perf_counter() - start
+    pool.shutdown()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent clients")
+    parser.add_argument("--requests", type=int, default=128, help="Import requests in total")
+    parser.add_argument("--vertices", type=int, default=60_000, help="Vertices per mesh")
+    parser.add_argument("--stages", type=int, nargs="+", default=[1, 2, 4, 8], help="Distinct stages to spread over")
+    parser.add_argument("--workers", type=int, default=4, help="Worker pool size")
+    args = parser.parse_args()
+
+    payloads = [forma_mesh.vertices_from_buffer(make_triangle_soup(args.vertices, seed=i)) for i in range(8)]
+
+    print(f"{'stages':>7} {'time (s)':>9} {'requests/s':>11} {'scaling':>8}")
+    baseline = None
+    with tempfile.TemporaryDirectory() as folder:
+        for stage_count in args.stages:
+            elapsed = asyncio.run(_run(args, stage_count, folder, payloads))
+            throughput = args.requests / elapsed
+            baseline = baseline or throughput
+            print(f"{stage_count:>7} {elapsed:>9.2f} {throughput:>11.1f} {throughput / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
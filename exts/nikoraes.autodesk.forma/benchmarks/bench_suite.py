@@ -0,0 +1,266 @@
+"""Headless benchmark suite of the import pipeline, with machine-readable JSON results to catch regressions.
+
+Drives the ImportPipeline behind `importmesh`, `importmeshbatch` and `deletemesh` through the request manager,
+like the endpoints do, with local stand-ins for omni.client, omni.usd and carb (see kit_stand_ins.py).
+Stages are written to a temporary folder. The meshes are terrain-like triangle soups, as sent by the connector.
+
+Scenarios:
+    import          one mesh of each --triangles size, imported --repeat times
+    import_elements --elements single mesh requests of --element-triangles, submitted at once
+    resync_elements the same requests again, skipped as unchanged
+    batch_elements  the same elements in a single batch request, to a new stage
+    delete_elements a delete request for every element
+
+Every result has the throughput, p50/p99 request latency and the peak RSS of the process so far,
+the per-step timing spans of the whole run are reported as well.
+
+Usage:
+    python benchmarks/bench_suite.py [--triangles 1000 100000 1000000 10000000] [--elements 1 100 1000 5000]
+        [--element-triangles 1000] [--repeat 5] [--workers 2] [--layout monolithic] [--crate-cache] [--lods 50000,10000]
+        [--output results.json]
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+from pxr import Usd
+
+import kit_stand_ins
+from bench_utils import load_forma_module, make_forma_mesh
+
+kit_stand_ins.install()
+
+forma_crate_cache = load_forma_module("forma_crate_cache")
+forma_mesh = load_forma_module("forma_mesh")
+forma_metrics = load_forma_module("forma_metrics")
+forma_pipeline = load_forma_module("forma_pipeline")
+forma_request_manager = load_forma_module("forma_request_manager")
+forma_save = load_forma_module("forma_save")
+forma_stage_cache = load_forma_module("forma_stage_cache")
+forma_stage_router = load_forma_module("forma_stage_router")
+
+DEFAULT_TRIANGLES = [1_000, 100_000, 1_000_000, 10_000_000]
+DEFAULT_ELEMENTS = [1, 100, 1_000, 5_000]
+
+# Distinct payloads used round robin by the element scenarios
+PAYLOAD_VARIANTS = 16
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _result(scenario: str, triangles: int, elements: int, latencies: list, seconds: float) -> dict:
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        "scenario": scenario,
+        "triangles": triangles,
+        "elements": elements,
+        "requests": len(latencies),
+        "seconds": round(seconds, 6),
+        "requests_per_second": round(len(latencies) / seconds, 3),
+        "triangles_per_second": round(triangles * elements / seconds, 1),
+        "p50_ms": round(float(np.percentile(latencies_ms, 50)), 3),
+        "p99_ms": round(float(np.percentile(latencies_ms, 99)), 3),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+    }
+
+
+class _Bench:
+    def __init__(self, args, folder: str) -> None:
+        self.args = args
+        self.folder = folder
+        self.stage_cache = forma_stage_cache.StageCache(max_size=8, idle_timeout=0)
+        self.saver = forma_save.DeferredSaver(2.0, 10.0, on_saved=self.stage_cache.mark_saved)
+        self.pool = concurrent.futures.ThreadPoolExecutor(args.workers) if args.workers > 0 else None
+        self.crate_cache = (
+            forma_crate_cache.CrateCache(os.path.join(folder, "crate_cache")) if args.crate_cache else None
+        )
+        self.pipeline = forma_pipeline.ImportPipeline(
+            forma_stage_router.StageRouter(self.stage_cache), self.saver, self.pool, self.crate_cache
+        )
+        self.manager = forma_request_manager.RequestManager(
+            max_pending=max(args.elements + [args.repeat]), retry_after=1.0
+        )
+        self.options = forma_mesh.ConversionOptions(
+            weld_vertices=args.weld, normals=args.normals, lod_budgets=forma_mesh.parse_lod_budgets(args.lods)
+        )
+        self.authoring = forma_mesh.AuthoringOptions(payload_layout=args.layout == "payload")
+
+    def usd_path(self, name: str) -> str:
+        return os.path.join(self.folder, f"{name}.usd").replace("\\", "/")
+
+    async def timed_request(self, usd_path: str, kind: str, forma_path: str, work) -> float:
+        start = time.perf_counter()
+        result = await self.manager.submit(usd_path, kind, forma_path, work)
+        if not result.get("ok"):
+            raise RuntimeError(f"{kind} {forma_path} failed: {result}")
+        return time.perf_counter() - start
+
+    def import_work(self, usd_path: str, forma_path: str, payload):
+        return lambda: self.pipeline.import_mesh(
+            usd_path, forma_path, payload, False, self.options, self.authoring, not self.args.deferred
+        )
+
+    def delete_work(self, usd_path: str, forma_path: str):
+        return lambda: self.pipeline.delete_mesh(usd_path, forma_path, not self.args.deferred)
+
+    async def run_import(self, triangles: int) -> dict:
+        usd_path = self.usd_path(f"import_{triangles}")
+        payload = forma_mesh.vertices_from_buffer(make_forma_mesh(triangles))
+
+        start = time.perf_counter()
+        latencies = []
+        for i in range(self.args.repeat):
+            forma_path = f"site/import/{i}"
+            latencies.append(
+                await self.timed_request(
+                    usd_path, forma_request_manager.IMPORT, forma_path, self.import_work(usd_path, forma_path, payload)
+                )
+            )
+        self.saver.flush()
+        return _result("import", triangles, len(latencies), latencies, time.perf_counter() - start)
+
+    async def run_elements(self, elements: int) -> list:
+        triangles = self.args.element_triangles
+        payloads = [
+            forma_mesh.vertices_from_buffer(make_forma_mesh(triangles, seed=seed)) for seed in range(PAYLOAD_VARIANTS)
+        ]
+        forma_paths = [f"site/element/{i}" for i in range(elements)]
+        usd_path = self.usd_path(f"elements_{elements}")
+        results = []
+
+        async def submit_all(scenario: str, kind: str, work):
+            start = time.perf_counter()
+            latencies = await asyncio.gather(
+                *[
+                    self.timed_request(usd_path, kind, forma_path, work(forma_path, payloads[i % PAYLOAD_VARIANTS]))
+                    for i, forma_path in enumerate(forma_paths)
+                ]
+            )
+            self.saver.flush()
+            results.append(_result(scenario, triangles, elements, latencies, time.perf_counter() - start))
+
+        def import_work(forma_path, payload):
+            return self.import_work(usd_path, forma_path, payload)
+
+        def delete_work(forma_path, payload):
+            return self.delete_work(usd_path, forma_path)
+
+        await submit_all("import_elements", forma_request_manager.IMPORT, import_work)
+        await submit_all("resync_elements", forma_request_manager.IMPORT, import_work)
+
+        batch_path = self.usd_path(f"batch_{elements}")
+        batch = [(forma_path, payloads[i % PAYLOAD_VARIANTS]) for i, forma_path in enumerate(forma_paths)]
+        start = time.perf_counter()
+        latency = await self.timed_request(
+            batch_path,
+            forma_request_manager.BATCH,
+            None,
+            lambda: self.pipeline.import_mesh_batch(
+                batch_path, batch, False, self.options, self.authoring, not self.args.deferred
+            ),
+        )
+        self.saver.flush()
+        batch_result = _result("batch_elements", triangles, elements, [latency], time.perf_counter() - start)
+        batch_result["requests_per_second"] = round(elements / batch_result["seconds"], 3)
+        results.append(batch_result)
+
+        await submit_all("delete_elements", forma_request_manager.DELETE, delete_work)
+        return results
+
+    def shutdown(self):
+        self.manager.shutdown()
+        self.saver.flush()
+        if self.pool is not None:
+            self.pool.shutdown()
+        self.stage_cache.invalidate()
+
+
+async def _run(args, folder: str) -> list:
+    bench = _Bench(args, folder)
+    results = []
+    try:
+        for triangles in args.triangles:
+            results.append(await bench.run_import(triangles))
+            _report(results[-1])
+        for elements in args.elements:
+            for result in await bench.run_elements(elements):
+                results.append(result)
+                _report(result)
+    finally:
+        bench.shutdown()
+    return results
+
+
+def _report(result: dict):
+    print(
+        f"{result['scenario']:>16} {result['triangles']:>10} {result['elements']:>8} {result['seconds']:>9.3f} "
+        f"{result['requests_per_second']:>10.1f} {result['p50_ms']:>10.2f} {result['p99_ms']:>10.2f} "
+        f"{result['peak_rss_mb']:>9.1f}",
+        file=sys.stderr,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--triangles", type=int, nargs="*", default=DEFAULT_TRIANGLES, help="Mesh sizes to import")
+    parser.add_argument("--elements", type=int, nargs="*", default=DEFAULT_ELEMENTS, help="Element counts to sync")
+    parser.add_argument("--element-triangles", type=int, default=1_000, help="Triangles per element")
+    parser.add_argument("--repeat", type=int, default=5, help="Imports per mesh size")
+    parser.add_argument("--workers", type=int, default=2, help="Worker pool size, 0 converts inline")
+    parser.add_argument("--layout", choices=["monolithic", "payload"], default="monolithic")
+    parser.add_argument("--weld", action="store_true", help="Weld vertices")
+    parser.add_argument("--normals", choices=["none", "face", "vertex"], default="none")
+    parser.add_argument("--deferred", action="store_true", help="Defer saves like autosave_stage false")
+    parser.add_argument("--crate-cache", action="store_true", help="Copy converted meshes from a crate cache")
+    parser.add_argument("--lods", default="", help="Comma separated triangle budgets of the levels of detail")
+    parser.add_argument("--output", help="Write the JSON results to this file instead of stdout")
+    args = parser.parse_args()
+
+    print(
+        f"{'scenario':>16} {'triangles':>10} {'elements':>8} {'time (s)':>9} {'req/s':>10} "
+        f"{'p50 (ms)':>10} {'p99 (ms)':>10} {'RSS (MB)':>9}",
+        file=sys.stderr,
+    )
+    with tempfile.TemporaryDirectory() as folder:
+        results = asyncio.run(_run(args, folder))
+
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "usd": ".".join(str(part) for part in Usd.GetVersion()),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "options": {
+            "workers": args.workers,
+            "layout": args.layout,
+            "weld": args.weld,
+            "normals": args.normals,
+            "deferred": args.deferred,
+        },
+        "results": results,
+        "spans": forma_metrics.get_metrics().snapshot()["spans"],
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
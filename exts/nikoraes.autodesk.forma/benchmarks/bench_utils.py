@@ -0,0 +1,65 @@
+"""Helpers shared by the headless benchmarks.
+
+The benchmarks run with a plain Python that has `numpy` and `pxr` (e.g. `pip install numpy usd-core`),
+outside of Kit. Modules are imported from the extension package without running its `__init__`,
+which would pull in the Kit-only service and UI modules.
+"""
+import importlib
+import os
+import sys
+import time
+import types
+
+PACKAGE_NAME = "nikoraes.autodesk.forma"
+PACKAGE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), *PACKAGE_NAME.split("."))
+
+
+def load_forma_module(name: str):
+    """Import `nikoraes.autodesk.forma.<name>` without executing the package `__init__`"""
+    if PACKAGE_NAME not in sys.modules:
+        parent = ""
+        for part in PACKAGE_NAME.split("."):
+            parent = f"{parent}.{part}" if parent else part
+            if parent not in sys.modules:
+                package = types.ModuleType(parent)
+                package.__path__ = []
+                sys.modules[parent] = package
+        sys.modules[PACKAGE_NAME].__path__ = [PACKAGE_DIR]
+
+    return importlib.import_module(f"{PACKAGE_NAME}.{name}")
+
+
+def make_triangle_soup(vertex_count: int, seed: int = 0):
+    """Random float32 triangle soup bytes, as sent by the Forma connector"""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    vertex_count -= vertex_count % 3
+    return rng.random((vertex_count, 3), dtype=np.float32).tobytes()
+
+
+def make_forma_mesh(triangle_count: int, seed: int = 0):
+    """Terrain-like float32 triangle soup bytes: a height field grid, sent with three vertices per triangle"""
+    import numpy as np
+
+    side = max(1, int(np.ceil(np.sqrt(triangle_count / 2))))
+    rng = np.random.default_rng(seed)
+    x, y = np.meshgrid(np.arange(side + 1, dtype=np.float32), np.arange(side + 1, dtype=np.float32))
+    z = np.sin(x / 7.0 + seed) * np.cos(y / 11.0) * 5.0 + rng.random(x.shape, dtype=np.float32) * 0.1
+    grid = np.stack([x, y, z], axis=-1).reshape((-1, 3)).astype(np.float32)
+
+    corner = (np.arange(side)[np.newaxis, :] + (side + 1) * np.arange(side)[:, np.newaxis]).reshape(-1)
+    triangles = np.stack(
+        [corner, corner + 1, corner + side + 2, corner, corner + side + 2, corner + side + 1], axis=1
+    ).reshape((-1, 3))[:triangle_count]
+    return grid[triangles].tobytes()
+
+
+def timed(fn, *args, repeat: int = 1, **kwargs) -> float:
+    """Best wall time in seconds over `repeat` runs"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best
@@ -0,0 +1,105 @@
+"""Measure how much importing meshes stalls the main loop, with the conversion inline or in a worker pool.
+
+A ticker coroutine stands in for the Kit frame loop at 60 fps. Its frame times are reported while meshes
+are hashed, welded and authored, with the CPU-bound steps run inline or in a thread pool.
+
+Usage:
+    python benchmarks/bench_worker_pool.py [--meshes 8] [--vertices 600000] [--workers 0 1 2 4]
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import functools
+import time
+
+import numpy as np
+from pxr import Sdf, Usd
+
+from bench_utils import load_forma_module, make_triangle_soup
+
+forma_mesh = load_forma_module("forma_mesh")
+
+FRAME_TIME = 1.0 / 60.0
+
+
+async def _ticker(frame_times: list, stop: asyncio.Event):
+    last = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(FRAME_TIME)
+        now = time.perf_counter()
+        frame_times.append(now - last)
+        last = now
+
+
+def _convert(vertices: np.ndarray, options) -> "forma_mesh.MeshData":
+    return forma_mesh.prepare_mesh(forma_mesh.triangle_soup_to_mesh(vertices), options)
+
+
+async def _import(payloads: list, pool) -> float:
+    loop = asyncio.get_event_loop()
+    options = forma_mesh.ConversionOptions(weld_vertices=True)
+    stage = Usd.Stage.CreateInMemory()
+
+    async def run(fn, *args):
+        if pool is None:
+            return fn(*args)
+        return await loop.run_in_executor(pool, functools.partial(fn, *args))
+
+    async def import_one(index: int, vertices: np.ndarray):
+        await run(forma_mesh.content_hash, vertices)
+        mesh_data = await run(_convert, vertices, options)
+        # Authoring stays on the main loop
+        with Sdf.ChangeBlock():
+            forma_mesh.author_mesh_spec(stage.GetRootLayer(), f"/World/_{index}", mesh_data)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[import_one(i, vertices) for i, vertices in enumerate(payloads)])
+    return time.perf_counter() - start
+
+
+async def _measure(payloads: list, workers: int) -> dict:
+    pool = concurrent.futures.ThreadPoolExecutor(max_workers=workers) if workers > 0 else None
+    frame_times = []
+    stop = asyncio.Event()
+    ticker = asyncio.ensure_future(_ticker(frame_times, stop))
+    await asyncio.sleep(FRAME_TIME * 3)
+
+    wall_time = await _import(payloads, pool)
+
+    stop.set()
+    await ticker
+    if pool is not None:
+        pool.shutdown()
+
+    frame_times_ms = np.array(frame_times) * 1000
+    return {
+        "workers": workers,
+        "wall_time_s": wall_time,
+        "frame_p50_ms": float(np.percentile(frame_times_ms, 50)),
+        "frame_p99_ms": float(np.percentile(frame_times_ms, 99)),
+        "frame_max_ms": float(frame_times_ms.max()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--meshes", type=int, default=8, help="Meshes imported concurrently")
+    parser.add_argument("--vertices", type=int, default=600_000, help="Vertices per mesh")
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 1, 2, 4], help="Pool sizes, 0 runs inline")
+    args = parser.parse_args()
+
+    payloads = [
+        forma_mesh.vertices_from_buffer(make_triangle_soup(args.vertices, seed=i)) for i in range(args.meshes)
+    ]
+
+    print(f"{'workers':>8} {'wall (s)':>9} {'frame p50 (ms)':>15} {'frame p99 (ms)':>15} {'frame max (ms)':>15}")
+    for workers in args.workers:
+        result = asyncio.run(_measure(payloads, workers))
+        print(
+            f"{result['workers']:>8} {result['wall_time_s']:>9.3f} {result['frame_p50_ms']:>15.1f}"
+            f" {result['frame_p99_ms']:>15.1f} {result['frame_max_ms']:>15.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
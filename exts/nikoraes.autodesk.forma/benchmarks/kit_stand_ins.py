@@ -0,0 +1,107 @@
+"""Local stand-ins for the Kit modules imported by the import pipeline, so it runs over plain `pxr`.
+
+`omni.client` maps URLs to the local file system, `omni.usd` has no stage open, and `carb` only logs
+warnings and errors. Nothing is installed when the real modules are importable, e.g. inside Kit.
+"""
+import enum
+import os
+import shutil
+import sys
+import types
+
+
+class Result(enum.Enum):
+    OK = 0
+    ERROR_NOT_FOUND = 1
+    ERROR = 2
+
+
+def _stat(url: str):
+    try:
+        st = os.stat(url)
+    except FileNotFoundError:
+        return Result.ERROR_NOT_FOUND, None
+    return Result.OK, types.SimpleNamespace(modified_time=st.st_mtime_ns, size=st.st_size)
+
+
+def _delete(url: str):
+    try:
+        os.remove(url)
+    except FileNotFoundError:
+        return Result.ERROR_NOT_FOUND
+    return Result.OK
+
+
+class CopyBehavior(enum.Enum):
+    ERROR_IF_EXISTS = 0
+    OVERWRITE = 1
+
+
+def _copy(src_url: str, dst_url: str, behavior: CopyBehavior = CopyBehavior.ERROR_IF_EXISTS, message: str = ""):
+    if behavior == CopyBehavior.ERROR_IF_EXISTS and os.path.exists(dst_url):
+        return Result.ERROR
+    try:
+        os.makedirs(os.path.dirname(dst_url), exist_ok=True)
+        shutil.copyfile(src_url, dst_url)
+    except FileNotFoundError:
+        return Result.ERROR_NOT_FOUND
+    return Result.OK
+
+
+def _normalize_url(url: str) -> str:
+    return url.replace("\\", "/")
+
+
+class _UsdContext:
+    def get_stage(self):
+        return None
+
+    def get_stage_url(self) -> str:
+        return ""
+
+
+def _log(level: str):
+    def log(message: str):
+        print(f"[{level}] {message}", file=sys.stderr)
+
+    return log
+
+
+def _module(name: str, **attributes):
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    sys.modules[name] = module
+    parent, _, child = name.rpartition(".")
+    if parent:
+        setattr(sys.modules[parent], child, module)
+    return module
+
+
+def install():
+    """Register the stand-ins in `sys.modules`, unless the Kit modules are available"""
+    try:
+        import omni.client  # noqa: F401
+
+        return
+    except ImportError:
+        pass
+
+    _module("carb", log_verbose=lambda message: None, log_info=lambda message: None)
+    sys.modules["carb"].log_warn = _log("warning")
+    sys.modules["carb"].log_error = _log("error")
+    _module("carb.tokens")
+
+    _module("omni")
+    _module(
+        "omni.client",
+        Result=Result,
+        CopyBehavior=CopyBehavior,
+        stat=_stat,
+        delete=_delete,
+        copy=_copy,
+        normalize_url=_normalize_url,
+    )
+    _module("omni.usd", get_context=lambda: _UsdContext())
+    _module("omni.kit")
+    _module("omni.kit.commands")
+    _module("omni.kit.notification_manager")
@@ -1,7 +1,7 @@
 from omni.kit.window.filepicker import FilePickerDialog
 from omni.kit.widget.filebrowser import FileBrowserItem
 import omni.ui as ui
-import threading
+import asyncio
 
 
 class FilePickerDialogWrapper:
@@ -11,14 +11,16 @@ class FilePickerDialogWrapper:
         item_filter_options: list,
         show_file_extensions: list,
         apply_button_label: str,
+        ok_handler=None,
     ) -> None:
         self.window_title = window_title
         self.item_filter_options = item_filter_options
         self.show_file_extensions = show_file_extensions
         self.apply_button_label = apply_button_label
-        self.wait_event = threading.Event()
-        self.wait_event.clear()
+        self.ok_handler = ok_handler
         self.file_url = ""
+        # Completed with the selected url, or "" when cancelled, by the apply and cancel handlers
+        self._future = None
 
         self.dialog = FilePickerDialog(
             self.window_title,
@@ -49,15 +51,105 @@ class FilePickerDialogWrapper:
 
     def _on_click_cancel(self, dialog: FilePickerDialog, filename: str, dirname: str):
         dialog.hide()
-        self.file_url = ""
-        self.wait_event.set()
+        self._complete("")
 
     def _on_click_open(self, dialog: FilePickerDialog, filename: str, dirname: str):
         # Normally, you'd want to hide the dialog
         dialog.hide()
-        self.file_url = dirname + filename
-        self.wait_event.set()
+        self._complete(dirname + filename)
+
+    def _complete(self, file_url: str):
+        self.file_url = file_url
+        if file_url and self.ok_handler is not None:
+            self.ok_handler(file_url)
+        if self._future is not None and not self._future.done():
+            self._future.set_result(file_url)
 
     def show_dialog(self, url: str):
         # Display dialog at pre-determined path
         self.dialog.show(path=url)
+
+    async def pick(self, url: str, timeout: float = None) -> str:
+        """Show the dialog and wait for the selected url, "" when cancelled
+
+        Raises asyncio.TimeoutError and hides the dialog when nothing is selected within the timeout.
+        """
+        self._future = asyncio.get_event_loop().create_future()
+        self.show_dialog(url)
+        try:
+            return await asyncio.wait_for(self._future, timeout)
+        except asyncio.TimeoutError:
+            self.dialog.hide()
+            raise
+        finally:
+            self._future = None
+
+    def destroy(self):
+        # Release a request still waiting on the dialog
+        self._complete("")
+        self.dialog.destroy()
+        self.dialog = None
+
+
+class FilePickerDialogPool:
+    """Reuses the file picker dialogs of the filebrowser endpoint instead of building one per request
+
+    Dialogs are keyed by their title, filter options and labels. A dialog is used by one request at a time,
+    concurrent requests with the same options get a dialog each, and at most max_idle of them are kept.
+    """
+
+    def __init__(self, max_idle: int = 4) -> None:
+        self._max_idle = max_idle
+        self._idle = {}
+        self._in_use = set()
+
+    @staticmethod
+    def _key(window_title: str, item_filter_options: list, show_file_extensions: list, apply_button_label: str):
+        return (window_title, tuple(item_filter_options), tuple(show_file_extensions), apply_button_label)
+
+    def acquire(
+        self,
+        window_title: str,
+        item_filter_options: list,
+        show_file_extensions: list,
+        apply_button_label: str,
+    ) -> FilePickerDialogWrapper:
+        key = self._key(window_title, item_filter_options, show_file_extensions, apply_button_label)
+        idle = self._idle.get(key)
+        if idle:
+            dialog_wrapper = idle.pop()
+        else:
+            dialog_wrapper = FilePickerDialogWrapper(
+                window_title=window_title,
+                item_filter_options=item_filter_options,
+                show_file_extensions=show_file_extensions,
+                apply_button_label=apply_button_label,
+            )
+        self._in_use.add(dialog_wrapper)
+        return dialog_wrapper
+
+    def release(self, dialog_wrapper: FilePickerDialogWrapper):
+        self._in_use.discard(dialog_wrapper)
+        # Already destroyed with the pool
+        if dialog_wrapper.dialog is None:
+            return
+
+        key = self._key(
+            dialog_wrapper.window_title,
+            dialog_wrapper.item_filter_options,
+            dialog_wrapper.show_file_extensions,
+            dialog_wrapper.apply_button_label,
+        )
+        if sum(len(idle) for idle in self._idle.values()) >= self._max_idle:
+            dialog_wrapper.destroy()
+            return
+        self._idle.setdefault(key, []).append(dialog_wrapper)
+
+    def destroy(self):
+        for dialog_wrapper in self._in_use:
+            dialog_wrapper.destroy()
+        self._in_use.clear()
+        for idle in self._idle.values():
+            for dialog_wrapper in idle:
+                dialog_wrapper.destroy()
+        self._idle.clear()
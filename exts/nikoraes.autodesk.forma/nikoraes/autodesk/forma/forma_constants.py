@@ -14,7 +14,21 @@ class Layers(object):
     ROOT = "Root"
 
 
+class CustomData(object):
+    CONTENT_HASH = "formaContentHash"
+    CONVERSION = "formaConversion"
+
+
+class MeshLayout(object):
+    MONOLITHIC = "monolithic"
+    PAYLOAD = "payload"
+
+
 class ServiceEndpoints(object):
     FILE_BROWSER = "/kit/formaconnector/filebrowser"
     IMPORT_MESH = "/kit/formaconnector/importmesh"
+    IMPORT_MESH_BATCH = "/kit/formaconnector/importmeshbatch"
     DELETE_MESH = "/kit/formaconnector/deletemesh"
+    FLUSH = "/kit/formaconnector/flush"
+    SYNC = "/kit/formaconnector/sync"
+    METRICS = "/kit/formaconnector/metrics"
@@ -0,0 +1,228 @@
+import hashlib
+import os
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+
+import carb
+import numpy as np
+from pxr import Sdf, Vt
+
+from . import forma_mesh
+
+# Default folder of the cache, when the crateCacheFolder setting is empty
+DEFAULT_FOLDER = os.path.join(tempfile.gettempdir(), "forma_crate_cache")
+
+# Key of the mesh counts and extent in the custom layer data of a cached layer
+CACHE_DATA_KEY = "formaCrateCache"
+
+# Name of the default prim of a cached layer, the mesh is its `mesh` child
+_ROOT_NAME = "geometry"
+
+
+class CachedMesh(object):
+    """A converted mesh found in the crate cache, authored by copying its layer instead of converting the payload"""
+
+    def __init__(self, path: str, layer: Sdf.Layer, vertex_count: int, face_count: int, extent: np.ndarray) -> None:
+        self.path = path
+        self.layer = layer
+        self.vertex_count = vertex_count
+        self.face_count = face_count
+        self.extent = extent
+        # Cached meshes are never written as instances
+        self.translation = None
+
+    @property
+    def mesh_path(self) -> Sdf.Path:
+        """The path of the mesh in the cached layer"""
+        return Sdf.Path(f"/{_ROOT_NAME}/mesh")
+
+
+def get_cache_key(content_hash: str, compact: bool, options: forma_mesh.ConversionOptions) -> str:
+    """The key of a converted payload: its content hash, wire format, conversion options and converter version"""
+    key = hashlib.blake2b(digest_size=16)
+    key.update(f"{content_hash} compact={compact} {options.signature} v{forma_mesh.CONVERTER_VERSION}".encode())
+    return key.hexdigest()
+
+
+class CrateCache:
+    """Converted meshes kept on disk as .usdc layers, keyed by `get_cache_key`, so importing the same payload
+    into another stage, or again after a stage was wiped, skips the decode and conversion
+
+    Every cached layer holds the mesh like a payload layer of the payload layout, see
+    `forma_mesh.author_payload_layer`. The least recently used layers are deleted once the cache grows over
+    max_size bytes. The max_open most recently used layers are kept open, as opening a layer takes longer than
+    copying a small mesh. Layers are put from the worker pool threads, the rest runs on the Kit main loop.
+    """
+
+    def __init__(self, folder: str = "", max_size: int = 1024 * 1024 * 1024, max_open: int = 64) -> None:
+        self.folder = folder or DEFAULT_FOLDER
+        self.max_size = max_size
+        self.max_open = max_open
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        # File sizes by key, least recently used first
+        self._entries = OrderedDict()
+        self._size = 0
+        # Cached meshes with an open layer, least recently used first
+        self._open = OrderedDict()
+        self._load()
+
+    def _load(self):
+        """Index the layers already in the folder, ordered by their last use"""
+        os.makedirs(self.folder, exist_ok=True)
+        found = []
+        for entry in os.scandir(self.folder):
+            name, ext = os.path.splitext(entry.name)
+            if ext != ".usdc" or not entry.is_file():
+                continue
+            # Leftovers of a put that didn't finish
+            if "." in name:
+                _remove_file(entry.path)
+                continue
+            stat = entry.stat()
+            found.append((stat.st_mtime, name, stat.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._size += size
+
+    def get_path(self, key: str) -> str:
+        return os.path.join(self.folder, f"{key}.usdc").replace("\\", "/")
+
+    def get(self, key: str) -> CachedMesh:
+        """The cached mesh of a key, or None when it isn't cached"""
+        with self._lock:
+            size = self._entries.get(key)
+            if size is not None:
+                self._entries.move_to_end(key)
+        if size is None:
+            self.misses += 1
+            return None
+
+        cached = self._open.pop(key, None)
+        if cached is None:
+            cached = self._open_mesh(key)
+            if cached is None:
+                self._discard(key)
+                self.misses += 1
+                return None
+            # The modification time keeps the order of use for the next session
+            try:
+                os.utime(cached.path)
+            except OSError:
+                pass
+        self._open[key] = cached
+        while len(self._open) > self.max_open:
+            self._open.popitem(last=False)
+
+        self.hits += 1
+        self.bytes_saved += size
+        return cached
+
+    def _open_mesh(self, key: str) -> CachedMesh:
+        path = self.get_path(key)
+        try:
+            layer = Sdf.Layer.FindOrOpen(path)
+            data = layer.customLayerData.get(CACHE_DATA_KEY) if layer else None
+        except Exception as e:
+            carb.log_warn(f"Failed to open cached mesh {path}: {e}")
+            return None
+        if not data:
+            return None
+        return CachedMesh(
+            path,
+            layer,
+            int(data.get("vertexCount", 0)),
+            int(data.get("faceCount", 0)),
+            np.array(data.get("extent", Vt.Vec3fArray(2)), dtype=np.float32),
+        )
+
+    def put(self, key: str, mesh_data: forma_mesh.MeshData):
+        """Write a converted mesh to the cache, this runs in the worker pool
+
+        The layer is written next to its final path and moved there, so a layer in the cache is always complete.
+        Writing is best effort, a failure is logged and the mesh is simply not cached.
+        """
+        path = self.get_path(key)
+        temp_path = os.path.join(self.folder, f"{key}.{uuid.uuid4().hex[:8]}.usdc")
+        try:
+            layer = Sdf.Layer.CreateAnonymous(".usdc")
+            with Sdf.ChangeBlock():
+                forma_mesh.author_payload_layer(layer, _ROOT_NAME, mesh_data)
+                layer.customLayerData = {
+                    CACHE_DATA_KEY: {
+                        "vertexCount": mesh_data.vertex_count,
+                        "faceCount": mesh_data.face_count,
+                        "extent": Vt.Vec3fArray.FromNumpy(np.ascontiguousarray(mesh_data.extent, dtype=np.float32)),
+                    }
+                }
+            if not layer.Export(temp_path):
+                raise RuntimeError("the layer could not be exported")
+            os.replace(temp_path, path)
+            size = os.path.getsize(path)
+        except Exception as e:
+            _remove_file(temp_path)
+            carb.log_warn(f"Failed to cache converted mesh {path}: {e}")
+            return
+
+        with self._lock:
+            self._size += size - self._entries.pop(key, 0)
+            self._entries[key] = size
+
+    def trim(self):
+        """Delete the least recently used layers until the cache fits in max_size
+
+        Called once the meshes of a request are authored, so a batch never loses a layer it is about to copy.
+        """
+        while True:
+            with self._lock:
+                if self._size <= self.max_size or not self._entries:
+                    return
+                key, size = self._entries.popitem(last=False)
+                self._size -= size
+                self.evictions += 1
+            self._open.pop(key, None)
+            _remove_file(self.get_path(key))
+
+    def clear(self):
+        with self._lock:
+            keys = list(self._entries)
+            self._entries.clear()
+            self._size = 0
+        self._open.clear()
+        for key in keys:
+            _remove_file(self.get_path(key))
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "bytes_saved": self.bytes_saved,
+                "evictions": self.evictions,
+            }
+
+    def _discard(self, key: str):
+        """Drop a layer that is missing or unreadable"""
+        with self._lock:
+            self._size -= self._entries.pop(key, 0)
+        self._open.pop(key, None)
+        _remove_file(self.get_path(key))
+
+
+def _remove_file(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        carb.log_warn(f"Failed to delete {path}: {e}")
@@ -1,12 +1,17 @@
 import os
 import uuid
 import asyncio
+import concurrent.futures
+import contextlib
+import math
+import time
 import pathlib
 import shutil
-import numpy as np
+import pydantic
 from collections import deque, Counter
-from fastapi import FastAPI, File, UploadFile, Form, Depends
-from fastapi.responses import JSONResponse
+from typing import Literal
+from fastapi import FastAPI, File, UploadFile, Form, Depends, Query
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 import omni.client
 import omni.ext
@@ -18,26 +23,65 @@ import omni.ui as ui
 import omni.ext
 import carb
 from omni.services.core import main, routers
-from pxr import Gf, Usd, UsdGeom
 from . import (
     file_picker_dialog,
     forma_core,
     forma_constants,
     forma_data,
+    forma_mesh,
+    forma_profile,
+    forma_request_manager,
+    forma_upload,
+    forma_wire_format,
 )
+from .forma_crate_cache import CrateCache
+from .forma_metrics import get_metrics
+from .forma_pipeline import ImportPipeline
+from .forma_save import DeferredSaver
+from .forma_stage_cache import StageCache
+from .forma_stage_router import StageRouter
 from .forma_settings import FormaSettings
 from .forma_settings_window import FormaSettingsWindow
 from .forma_request_bodies import (
     FileBrowserRequestBody,
     FileBrowserResponseBody,
+    FormaBatchManifest,
+    FormaDeleteRequestBody,
     FormaRequestBody,
     FormaResponseBody,
+    FormaSyncRequestBody,
 )
-from .utils import nucleus_file_exists
+from .utils import set_listing_cache_ttl
 
 g_app = omni.kit.app.get_app()
+g_file_picker_pool = None
 g_forma_link = None
+g_import_pipeline = None
 g_request_manager = None
+g_crate_cache = None
+g_settings = None
+g_stage_cache = None
+g_stage_router = None
+g_stage_saver = None
+g_worker_pool = None
+
+
+def get_crate_cache():
+    """Get the instance of the crate cache, None when the crateCache setting is off"""
+
+    return g_crate_cache
+
+
+def get_file_picker_pool():
+    """Get the instance of the file picker dialog pool"""
+
+    return g_file_picker_pool
+
+
+def get_import_pipeline():
+    """Get the instance of the import pipeline"""
+
+    return g_import_pipeline
 
 
 def get_request_manager():
@@ -46,6 +90,30 @@ def get_request_manager():
     return g_request_manager
 
 
+def get_settings():
+    """Get the instance of the settings, its getters read the current values"""
+
+    return g_settings
+
+
+def get_stage_cache():
+    """Get the instance of the stage cache"""
+
+    return g_stage_cache
+
+
+def get_stage_router():
+    """Get the instance of the stage router"""
+
+    return g_stage_router
+
+
+def get_stage_saver():
+    """Get the instance of the deferred stage saver"""
+
+    return g_stage_saver
+
+
 def _get_forma_link_instance():
     """Get the instance of the painter link to manage the busy state widget
 
@@ -92,6 +160,103 @@ def validate_extension_version(
     return forma_data.Validation("Extension version is correct.", True)
 
 
+def _get_conversion_options(settings: FormaSettings) -> forma_mesh.ConversionOptions:
+    return forma_mesh.ConversionOptions(
+        weld_vertices=settings.get_weld_vertices(),
+        weld_tolerance=settings.get_weld_tolerance(),
+        normals=_get_normals(settings),
+        lod_budgets=_get_lod_budgets(settings),
+    )
+
+
+def _get_normals(settings: FormaSettings) -> str:
+    """The normals to compute, none when the normals setting is invalid"""
+    normals = settings.get_normals()
+    if normals not in forma_mesh.NORMALS_MODES:
+        carb.log_warn(f"Ignoring the normals setting {normals!r}, it must be one of {forma_mesh.NORMALS_MODES}")
+        return forma_mesh.NORMALS_NONE
+    return normals
+
+
+def _get_lod_budgets(settings: FormaSettings) -> tuple:
+    """The triangle budgets of the levels of detail, none when the lods setting is off or lodBudgets is invalid"""
+    if not settings.get_lods():
+        return ()
+    try:
+        return forma_mesh.parse_lod_budgets(settings.get_lod_budgets())
+    except ValueError as e:
+        carb.log_warn(f"Ignoring the lodBudgets setting: {e}")
+        return ()
+
+
+def _get_authoring_options(settings: FormaSettings) -> forma_mesh.AuthoringOptions:
+    return forma_mesh.AuthoringOptions(
+        sdf_authoring=settings.get_sdf_authoring(),
+        payload_layout=settings.get_mesh_layout() == forma_constants.MeshLayout.PAYLOAD,
+        instancing=settings.get_instancing(),
+    )
+
+
+async def _read_payload(file: UploadFile, compact: bool, settings: FormaSettings):
+    """Read an uploaded mesh, as compact payload bytes or as a legacy raw float32 (N, 3) vertex array"""
+    with get_metrics().span("upload"):
+        if compact:
+            payload = await file.read()
+            get_metrics().increment("bytes_received", len(payload))
+            return payload
+
+        # Read the file in chunks, straight into an (N, 3) float32 vertex array
+        payload = await forma_upload.read_upload_vertices(
+            file, settings.get_upload_chunk_size(), settings.get_upload_spool_threshold()
+        )
+        get_metrics().increment("bytes_received", payload.nbytes)
+        return payload
+
+
+def _profile_request(base: FormaRequestBody, name: str):
+    """Profile a handler when the request or the profileRequests setting asks for it, else do nothing"""
+    settings = get_settings()
+    if not (base.profile or settings.get_profile_requests()):
+        return contextlib.nullcontext()
+    return forma_profile.RequestProfiler(
+        name, settings.get_profile_folder(), settings.get_profile_top_functions()
+    )
+
+
+async def _submit_request(usd_path: str, kind: str, forma_path: str, work):
+    """Queue a request in the request manager, answering 429 when the queue is full
+
+    The work is timed in the span named after its kind, without the time spent waiting in the queue.
+
+    An empty usd_path, when no usd_path was given and no stage is open in Kit, is answered with a 400.
+    """
+    if not usd_path:
+        return JSONResponse(
+            status_code=400,
+            content={"ok": False, "error": "No usd_path was given and no stage is open in Kit"},
+        )
+    # The kind's span times the work once it is the request's turn, the queue span the wait for it
+    queued = time.perf_counter()
+
+    async def timed_work():
+        get_metrics().observe("queue", time.perf_counter() - queued)
+        with get_metrics().span(kind):
+            return await work()
+
+    # The work runs in the task of the request manager, keep profiling it in the worker pool
+    profiler = forma_profile.current_profiler()
+    if profiler is not None:
+        timed_work = profiler.bind(timed_work)
+    try:
+        return await get_request_manager().submit(usd_path, kind, forma_path, timed_work)
+    except forma_request_manager.QueueFullError as e:
+        return JSONResponse(
+            status_code=429,
+            content={"ok": False, "error": str(e)},
+            headers={"Retry-After": str(math.ceil(e.retry_after))},
+        )
+
+
 # Import mesh Endpoint
 import_mesh_router = routers.ServiceAPIRouter(tags=["connector"])
 
@@ -103,65 +268,96 @@ async def handle_import_mesh(
 ):
     carb.log_info("Import mesh")
 
-    forma_path = base.forma_path
-
-    # Read the file as bytes
-    file_bytes = await file.read()
-
-    # Convert the bytes to a numpy array of type float32
-    mesh = np.frombuffer(file_bytes, dtype=np.float32)
-
-    usd_context = omni.usd.get_context()
-    stage = usd_context.get_stage()
-    current_stage_url = usd_context.get_stage_url()
-    # if current stage url is the same, add a sublayer to the session layer and use that
-    # else try to find the stage. If it doesn't exist create it
-    if not nucleus_file_exists(base.usd_path):
-        # Create a new stage
-        stage = Usd.Stage.CreateNew(base.usd_path)
-    else:
-        # Open the existing stage
-        stage = Usd.Stage.Open(base.usd_path)
-
-    # TODO: Check if the selected USD path is the same as the current stage path
-    # If so, just continue
-    # If not, we need to add the new USD file to a sublayer of the current stage
-    # As the up axis will be Z, we will need to set this on that layer/stage
-
-    if UsdGeom.GetStageUpAxis(stage) != UsdGeom.Tokens.z:
-        UsdGeom.SetStageUpAxis(stage, UsdGeom.Tokens.z)
+    with _profile_request(base, "importmesh"):
+        settings = get_settings()
+        compact = forma_wire_format.is_compact(base.protocol_version)
+        options = _get_conversion_options(settings)
+        authoring = _get_authoring_options(settings)
+
+        payload = await _read_payload(file, compact, settings)
+
+        # A newer import or delete of the same element replaces this one while it waits for its turn
+        usd_path = get_stage_router().resolve(base.usd_path)
+        return await _submit_request(
+            usd_path,
+            forma_request_manager.IMPORT,
+            base.forma_path,
+            lambda: _import_mesh(base, usd_path, payload, compact, options, authoring),
+        )
 
-    prim_path = f"/World/_{forma_path.split('/')[-1]}"
 
-    # Define a Mesh primitive on the stage
-    mesh_prim = UsdGeom.Mesh.Define(stage, prim_path)
+async def _import_mesh(
+    base: FormaRequestBody,
+    usd_path: str,
+    payload,
+    compact: bool,
+    options: forma_mesh.ConversionOptions,
+    authoring: forma_mesh.AuthoringOptions,
+):
+    try:
+        return await get_import_pipeline().import_mesh(
+            usd_path, base.forma_path, payload, compact, options, authoring, base.autosave_stage
+        )
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"ok": False, "error": str(e)})
 
-    vertices = mesh.reshape((-1, 3))
 
-    # Set the 'points' attribute using your vertex coordinates
-    # You need to convert your numpy array to a list of Gf.Vec3f objects
-    points = [
-        Gf.Vec3f(vertices[i][0].item(), vertices[i][1].item(), vertices[i][2].item())
-        for i in range(len(vertices))
-    ]
-    mesh_prim.CreatePointsAttr(points)
+# Import mesh batch Endpoint
+import_mesh_batch_router = routers.ServiceAPIRouter(tags=["connector"])
 
-    # Set the 'faceVertexCounts' attribute
-    # This is a list where each element is the number of vertices in a face
-    # For a mesh of triangles, each face has 3 vertices
-    faceVertexCounts = [3 for _ in range(len(points) // 3)]
-    mesh_prim.CreateFaceVertexCountsAttr(faceVertexCounts)
 
-    # Set the 'faceVertexIndices' attribute
-    # This is a list where each group of three integers represents a triangle
-    # The integers are indices into the 'points' list
-    faceVertexIndices = [i for i in range(len(points))]
-    mesh_prim.CreateFaceVertexIndicesAttr(faceVertexIndices)
+# This function is the service endpoint to import many meshes in one request
+# The manifest is a JSON FormaBatchManifest giving the byte range of every mesh in the uploaded buffer
+@import_mesh_batch_router.post(f"{forma_constants.ServiceEndpoints.IMPORT_MESH_BATCH}")
+async def handle_import_mesh_batch(
+    base: FormaRequestBody = Depends(),
+    manifest: str = Form(...),
+    file: UploadFile = File(...),
+):
+    carb.log_info("Import mesh batch")
+
+    with _profile_request(base, "importmeshbatch"):
+        try:
+            batch = FormaBatchManifest.parse_raw(manifest)
+        except pydantic.ValidationError as e:
+            return JSONResponse(status_code=400, content={"ok": False, "error": str(e)})
+
+        settings = get_settings()
+        compact = forma_wire_format.is_compact(base.protocol_version)
+        options = _get_conversion_options(settings)
+        authoring = _get_authoring_options(settings)
+
+        # Compact payloads are sliced from the bytes, raw float32 payloads from one (N, 3) vertex array
+        buffer = await _read_payload(file, compact, settings)
+        ranges = [(element.forma_path, element.offset, element.length) for element in batch.elements]
+        try:
+            elements = forma_upload.slice_batch(buffer, compact, ranges)
+        except ValueError as e:
+            return JSONResponse(status_code=400, content={"ok": False, "error": str(e)})
+
+        usd_path = get_stage_router().resolve(base.usd_path)
+        return await _submit_request(
+            usd_path,
+            forma_request_manager.BATCH,
+            None,
+            lambda: _import_mesh_batch(base, usd_path, elements, compact, options, authoring),
+        )
 
-    # Save the stage to a USD file
-    stage.Save()
 
-    return {"ok": True}
+async def _import_mesh_batch(
+    base: FormaRequestBody,
+    usd_path: str,
+    elements: list,
+    compact: bool,
+    options: forma_mesh.ConversionOptions,
+    authoring: forma_mesh.AuthoringOptions,
+):
+    try:
+        return await get_import_pipeline().import_mesh_batch(
+            usd_path, elements, compact, options, authoring, base.autosave_stage
+        )
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"ok": False, "error": str(e)})
 
 
 # Delete mesh Endpoint
@@ -171,21 +367,130 @@ delete_mesh_router = routers.ServiceAPIRouter(tags=["connector"])
 # This function is the service endpoint for the import mesh
 @delete_mesh_router.post(f"{forma_constants.ServiceEndpoints.DELETE_MESH}")
 async def handle_delete_mesh(
-    req: FormaRequestBody,
+    req: FormaDeleteRequestBody,
 ):
     carb.log_info("Delete mesh")
 
-    usd_context = omni.usd.get_context()
-    stage = usd_context.get_stage()
+    with _profile_request(req, "deletemesh"):
+        # Without a usd_path, the mesh is deleted from the stage open in Kit
+        usd_path = get_stage_router().resolve(req.usd_path)
+
+        # A list of elements or a prefix is deleted in one go, with one save
+        if req.forma_paths or req.prefix:
+            forma_paths = req.forma_paths + ([req.forma_path] if req.forma_path else [])
+            return await _submit_request(
+                usd_path,
+                forma_request_manager.DELETE,
+                None,
+                lambda: get_import_pipeline().delete_meshes(usd_path, forma_paths, req.prefix, req.autosave_stage),
+            )
+
+        # A newer delete of the same element replaces this one while it waits for its turn
+        return await _submit_request(
+            usd_path,
+            forma_request_manager.DELETE,
+            req.forma_path,
+            lambda: get_import_pipeline().delete_mesh(usd_path, req.forma_path, req.autosave_stage),
+        )
+
+
+# Sync Endpoint
+sync_router = routers.ServiceAPIRouter(tags=["connector"])
+
+
+# This function is the service endpoint to negotiate a sync before uploading any mesh
+# The site is sent as (forma_path, content_hash) pairs, the answer lists the elements to upload
+# and the elements that are no longer in the site, which are deleted in one go
+@sync_router.post(f"{forma_constants.ServiceEndpoints.SYNC}")
+async def handle_sync(
+    req: FormaSyncRequestBody,
+):
+    carb.log_info("Sync")
+
+    with _profile_request(req, "sync"):
+        settings = get_settings()
+        options = _get_conversion_options(settings)
+        authoring = _get_authoring_options(settings)
+        elements = [(element.forma_path, element.content_hash) for element in req.elements]
+
+        usd_path = get_stage_router().resolve(req.usd_path)
+        return await _submit_request(
+            usd_path,
+            forma_request_manager.SYNC,
+            None,
+            lambda: _sync(usd_path, elements, req, options, authoring),
+        )
+
+
+async def _sync(
+    usd_path: str,
+    elements: list,
+    req: FormaSyncRequestBody,
+    options: forma_mesh.ConversionOptions,
+    authoring: forma_mesh.AuthoringOptions,
+):
+    try:
+        return await get_import_pipeline().sync(
+            usd_path, elements, req.prefix, req.delete_stale, options, authoring, req.autosave_stage
+        )
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"ok": False, "error": str(e)})
 
-    forma_path = req.forma_path
-    prim_path = f"/World/_{forma_path.split('/')[-1]}"
-    stage.RemovePrim(prim_path)
 
-    # Save the stage to a USD file
-    stage.Save()
+# Flush Endpoint
+flush_router = routers.ServiceAPIRouter(tags=["connector"])
 
-    return {"ok": True}
+
+# This function is the service endpoint to save the stages with deferred saves
+@flush_router.post(f"{forma_constants.ServiceEndpoints.FLUSH}")
+async def handle_flush(
+    req: FormaRequestBody,
+):
+    carb.log_info("Flush")
+
+    # Without a usd_path, every pending stage is saved
+    if not req.usd_path:
+        return {"ok": True, "saved": get_stage_saver().flush()}
+
+    # Queued behind the pending writes to the stage, so they are part of the save
+    usd_path = get_stage_router().resolve(req.usd_path)
+    return await _submit_request(
+        usd_path,
+        forma_request_manager.FLUSH,
+        None,
+        lambda: _flush(usd_path),
+    )
+
+
+async def _flush(usd_path: str):
+    return {"ok": True, "saved": get_stage_saver().flush(usd_path)}
+
+
+# Metrics Endpoint
+metrics_router = routers.ServiceAPIRouter(tags=["connector"])
+
+
+def _get_gauges() -> dict:
+    """The stage cache, crate cache and request manager stats, reported next to the pipeline metrics"""
+    gauges = {}
+    if get_stage_cache() is not None:
+        gauges.update({f"stage_cache_{name}": value for name, value in get_stage_cache().stats().items()})
+    if get_crate_cache() is not None:
+        gauges.update({f"crate_cache_{name}": value for name, value in get_crate_cache().stats().items()})
+    if get_request_manager() is not None:
+        gauges.update({f"requests_{name}": value for name, value in get_request_manager().stats().items()})
+    return gauges
+
+
+# This function is the service endpoint for the timing spans and counters of the import pipeline
+# format is json, or prometheus for the Prometheus text exposition format
+@metrics_router.get(forma_constants.ServiceEndpoints.METRICS)
+async def handle_metrics(fmt: Literal["json", "prometheus"] = Query("json", alias="format")):
+    if fmt == "prometheus":
+        return PlainTextResponse(
+            get_metrics().to_prometheus(_get_gauges()), media_type="text/plain; version=0.0.4"
+        )
+    return {**get_metrics().snapshot(), "gauges": _get_gauges()}
 
 
 # File Browser Endpoint
@@ -224,25 +529,26 @@ async def handle_filebrowser(
         response.succeeded = ext_version_validation.succeeded
         return response
 
-    dialog_wrapper = file_picker_dialog.FilePickerDialogWrapper(
+    # The apply and cancel handlers of the dialog complete the request, an abandoned dialog times out
+    dialog_wrapper = get_file_picker_pool().acquire(
         window_title=req.window_title,
         item_filter_options=req.item_filter_options,
         show_file_extensions=req.show_file_extensions,
         apply_button_label="Select",
     )
-
-    dialog_wrapper.show_dialog(req.initial_url)
-    await omni.kit.app.get_app().next_update_async()
-    await omni.kit.app.get_app().next_update_async()
-    while not dialog_wrapper.wait_event.is_set():
-        await asyncio.sleep(1)
-
-    dialog_wrapper.wait_event.clear()
+    try:
+        url = await dialog_wrapper.pick(req.initial_url, get_settings().get_file_browser_timeout() or None)
+    except asyncio.TimeoutError:
+        response.status = "Timed out waiting for a file selection"
+        response.succeeded = False
+        return response
+    finally:
+        get_file_picker_pool().release(dialog_wrapper)
 
     return FileBrowserResponseBody.parse_obj(
         {
             "extension_version_is_valid": ext_version_validation.succeeded,
-            "url": dialog_wrapper.file_url,
+            "url": url,
             "options": "None Selected",
             "status": "OK",
             "succeeded": True,
@@ -270,7 +576,58 @@ class FormaLinkExtension(omni.ext.IExt):
 
         self.__version = version
 
-        self._settings = FormaSettings()
+        # Constructed once for all requests, as it sets the default of every setting, its getters stay live
+        global g_settings
+        g_settings = FormaSettings()
+        self._settings = g_settings
+
+        set_listing_cache_ttl(self._settings.get_listing_cache_ttl())
+
+        global g_stage_cache
+        g_stage_cache = StageCache(
+            self._settings.get_stage_cache_size(),
+            self._settings.get_stage_cache_idle_timeout(),
+        )
+
+        global g_stage_router
+        g_stage_router = StageRouter(g_stage_cache)
+
+        global g_worker_pool
+        worker_count = self._settings.get_worker_count()
+        g_worker_pool = (
+            concurrent.futures.ThreadPoolExecutor(max_workers=worker_count, thread_name_prefix="forma")
+            if worker_count > 0
+            else None
+        )
+
+        global g_request_manager
+        g_request_manager = forma_request_manager.RequestManager(
+            self._settings.get_request_queue_size(),
+            self._settings.get_request_retry_after(),
+            on_busy=set_busy,
+            on_idle=set_idle,
+        )
+
+        global g_stage_saver
+        g_stage_saver = DeferredSaver(
+            self._settings.get_save_quiet_period(),
+            self._settings.get_save_max_delay(),
+            on_saved=lambda usd_path: g_stage_cache.mark_saved(usd_path),
+        )
+
+        global g_crate_cache
+        g_crate_cache = (
+            CrateCache(self._settings.get_crate_cache_folder(), self._settings.get_crate_cache_size())
+            if self._settings.get_crate_cache()
+            else None
+        )
+
+        global g_import_pipeline
+        g_import_pipeline = ImportPipeline(g_stage_router, g_stage_saver, g_worker_pool, g_crate_cache)
+
+        global g_file_picker_pool
+        g_file_picker_pool = file_picker_dialog.FilePickerDialogPool()
+
         print(
             f"[{ext}] APIs are up at {self._settings.get_kit_services_transport_port()}"
         )
@@ -295,8 +652,16 @@ class FormaLinkExtension(omni.ext.IExt):
         main.register_router(file_browser_router)
         import_mesh_router.register_facility("context", self.context)
         main.register_router(import_mesh_router)
+        import_mesh_batch_router.register_facility("context", self.context)
+        main.register_router(import_mesh_batch_router)
         delete_mesh_router.register_facility("context", self.context)
         main.register_router(delete_mesh_router)
+        flush_router.register_facility("context", self.context)
+        main.register_router(flush_router)
+        sync_router.register_facility("context", self.context)
+        main.register_router(sync_router)
+        metrics_router.register_facility("context", self.context)
+        main.register_router(metrics_router)
 
         print(
             f"[{ext}] APIs are up at {self._settings.get_kit_services_transport_port()}"
@@ -306,6 +671,48 @@ class FormaLinkExtension(omni.ext.IExt):
         global g_forma_link
         g_forma_link = None
 
+        global g_request_manager
+        if g_request_manager is not None:
+            g_request_manager.shutdown()
+            g_request_manager = None
+
+        global g_import_pipeline
+        g_import_pipeline = None
+
+        # Answer the filebrowser requests still waiting on a dialog
+        global g_file_picker_pool
+        if g_file_picker_pool is not None:
+            g_file_picker_pool.destroy()
+            g_file_picker_pool = None
+
+        # Save whatever is still waiting for a deferred save
+        global g_stage_saver
+        if g_stage_saver is not None:
+            g_stage_saver.flush()
+            g_stage_saver = None
+
+        global g_worker_pool
+        if g_worker_pool is not None:
+            g_worker_pool.shutdown(wait=True)
+            g_worker_pool = None
+
+        global g_crate_cache
+        if g_crate_cache is not None:
+            carb.log_info(f"Crate cache stats: {g_crate_cache.stats()}")
+            g_crate_cache = None
+
+        global g_stage_router
+        g_stage_router = None
+
+        global g_stage_cache
+        if g_stage_cache is not None:
+            carb.log_info(f"Stage cache stats: {g_stage_cache.stats()}")
+            g_stage_cache.invalidate()
+            g_stage_cache = None
+
+        global g_settings
+        g_settings = None
+
         # For now let's not clean anything out
         # global g_local_texture_root_folder
         # if g_local_texture_root_folder is not None:
@@ -318,7 +725,11 @@ class FormaLinkExtension(omni.ext.IExt):
 
         main.deregister_endpoint("post", forma_constants.ServiceEndpoints.FILE_BROWSER)
         main.deregister_endpoint("post", forma_constants.ServiceEndpoints.IMPORT_MESH)
+        main.deregister_endpoint("post", forma_constants.ServiceEndpoints.IMPORT_MESH_BATCH)
         main.deregister_endpoint("post", forma_constants.ServiceEndpoints.DELETE_MESH)
+        main.deregister_endpoint("post", forma_constants.ServiceEndpoints.FLUSH)
+        main.deregister_endpoint("post", forma_constants.ServiceEndpoints.SYNC)
+        main.deregister_endpoint("get", forma_constants.ServiceEndpoints.METRICS)
 
     def _set_busy(self):
         self._settings_window.busy = True
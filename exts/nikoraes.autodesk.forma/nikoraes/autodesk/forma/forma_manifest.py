@@ -0,0 +1,242 @@
+import datetime
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Tuple
+
+from pxr import Sdf, Tf
+
+from . import forma_mesh
+
+# Key of the manifest in the custom layer data
+MANIFEST_KEY = "formaManifest"
+
+
+class ManifestEntry(object):
+    """A Forma element imported into a stage"""
+
+    def __init__(
+        self,
+        prim_path: str,
+        content_hash: str = "",
+        vertex_count: int = 0,
+        updated: str = "",
+        prototype: str = "",
+    ) -> None:
+        self.prim_path = prim_path
+        self.content_hash = content_hash
+        self.vertex_count = vertex_count
+        self.updated = updated
+        # The prototype path of an element written as an instance
+        self.prototype = prototype
+
+    def to_dict(self) -> dict:
+        data = {
+            "primPath": self.prim_path,
+            "contentHash": self.content_hash,
+            "vertexCount": self.vertex_count,
+            "updated": self.updated,
+        }
+        if self.prototype:
+            data["prototype"] = self.prototype
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ManifestEntry":
+        return cls(
+            data.get("primPath", ""),
+            data.get("contentHash", ""),
+            int(data.get("vertexCount", 0)),
+            data.get("updated", ""),
+            data.get("prototype", ""),
+        )
+
+
+class StageManifest:
+    """Index of the Forma elements in a stage: forma_path to prim path, content hash, vertex count and update time
+
+    Loaded once from the custom layer data, updated in memory on every import and delete,
+    and written back to the layer right before it is saved.
+    The prototypes of instanced meshes are indexed by geometry key, with the number of elements using them.
+    """
+
+    def __init__(self, entries: Dict[str, ManifestEntry] = None, prototypes: Dict[str, str] = None) -> None:
+        self._entries = dict(entries or {})
+        # Prim paths taken by an element, also the ones handed out but not imported yet
+        self._owners = {entry.prim_path: forma_path for forma_path, entry in self._entries.items()}
+        self._prototypes = {}
+        self._prototype_keys = {}
+        for prototype_path, geometry_key in (prototypes or {}).items():
+            self._add_prototype(prototype_path, geometry_key)
+        self._prototype_users = {}
+        for entry in self._entries.values():
+            self._use_prototype(entry.prototype, 1)
+        self.dirty = False
+
+    @classmethod
+    def load(cls, layer: Sdf.Layer) -> "StageManifest":
+        data = layer.customLayerData.get(MANIFEST_KEY, {})
+        prototypes = {}
+        root_spec = layer.GetPrimAtPath(forma_mesh.PROTOTYPES_PATH)
+        if root_spec:
+            for prototype_spec in root_spec.nameChildren:
+                geometry_key = prototype_spec.customData.get(forma_mesh.GEOMETRY_KEY)
+                if geometry_key:
+                    prototypes[str(prototype_spec.path)] = geometry_key
+        return cls({forma_path: ManifestEntry.from_dict(entry) for forma_path, entry in data.items()}, prototypes)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, forma_path: str) -> bool:
+        return forma_path in self._entries
+
+    def get(self, forma_path: str) -> ManifestEntry:
+        return self._entries.get(forma_path)
+
+    def items(self) -> Iterator[Tuple[str, ManifestEntry]]:
+        return iter(self._entries.items())
+
+    def find_prim_path(self, forma_path: str, base_path: str) -> str:
+        """The prim path of an element, base_path for elements imported before there was a manifest,
+        or None when base_path belongs to another element
+        """
+        entry = self._entries.get(forma_path)
+        if entry is not None:
+            return entry.prim_path
+        if self._owners.get(base_path, forma_path) != forma_path:
+            return None
+        return base_path
+
+    def prim_path_for(self, forma_path: str, base_path: str, reserved: Dict[str, str] = None) -> str:
+        """The prim path of an element, the one it was imported to or else base_path made unique
+
+        A base path taken by another element gets a numbered suffix, so elements whose
+        Forma paths end in the same segment no longer overwrite each other. The prim path is only
+        taken once the element is recorded with `update`, elements imported together share a
+        reserved dict of the prim paths handed out to them so far.
+        """
+        entry = self._entries.get(forma_path)
+        if entry is not None:
+            return entry.prim_path
+
+        reserved = {} if reserved is None else reserved
+        prim_path = base_path
+        suffix = 1
+        while self._owners.get(prim_path, reserved.get(prim_path, forma_path)) != forma_path:
+            suffix += 1
+            prim_path = f"{base_path}_{suffix}"
+        reserved[prim_path] = forma_path
+        return prim_path
+
+    def update(
+        self, forma_path: str, prim_path: str, content_hash: str, vertex_count: int, prototype: str = ""
+    ) -> ManifestEntry:
+        """Record an imported element, returning the entry it replaces or None"""
+        previous = self.remove(forma_path)
+        self._entries[forma_path] = ManifestEntry(
+            prim_path,
+            content_hash,
+            vertex_count,
+            datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            prototype,
+        )
+        self._owners[prim_path] = forma_path
+        self._use_prototype(prototype, 1)
+        self.dirty = True
+        return previous
+
+    def remove(self, forma_path: str) -> ManifestEntry:
+        """Drop an element, returning its entry or None when it was not in the manifest"""
+        entry = self._entries.pop(forma_path, None)
+        if entry is not None:
+            if self._owners.get(entry.prim_path) == forma_path:
+                del self._owners[entry.prim_path]
+            self._use_prototype(entry.prototype, -1)
+            self.dirty = True
+        return entry
+
+    def prototypes(self, geometry_key: str) -> List[str]:
+        """The paths of the prototypes with a geometry key, see forma_mesh.center_mesh"""
+        return self._prototypes.get(geometry_key, [])
+
+    def add_prototype(self, geometry_key: str) -> str:
+        """Pick the path of a new prototype with a geometry key"""
+        base_path = f"{forma_mesh.PROTOTYPES_PATH}/geometry_{geometry_key}"
+        prototype_path = base_path
+        suffix = 1
+        while prototype_path in self._prototype_keys:
+            suffix += 1
+            prototype_path = f"{base_path}_{suffix}"
+        self._add_prototype(prototype_path, geometry_key)
+        return prototype_path
+
+    def remove_prototype(self, prototype_path: str):
+        geometry_key = self._prototype_keys.pop(prototype_path, None)
+        if geometry_key is not None:
+            self._prototypes[geometry_key].remove(prototype_path)
+
+    def prototype_users(self, prototype_path: str) -> int:
+        """The number of elements written as an instance of a prototype"""
+        return self._prototype_users.get(prototype_path, 0)
+
+    def _add_prototype(self, prototype_path: str, geometry_key: str):
+        self._prototypes.setdefault(geometry_key, []).append(prototype_path)
+        self._prototype_keys[prototype_path] = geometry_key
+
+    def _use_prototype(self, prototype_path: str, count: int):
+        if prototype_path:
+            self._prototype_users[prototype_path] = self._prototype_users.get(prototype_path, 0) + count
+
+    def write(self, layer: Sdf.Layer):
+        """Write the manifest to the custom layer data, when it changed"""
+        if not self.dirty:
+            return
+        custom_layer_data = layer.customLayerData
+        custom_layer_data[MANIFEST_KEY] = {
+            forma_path: entry.to_dict() for forma_path, entry in sorted(self._entries.items())
+        }
+        layer.customLayerData = custom_layer_data
+        self.dirty = False
+
+
+class ManifestStore:
+    """Keeps the manifests of the recently used layers in memory, keyed by usd_path
+
+    A manifest is loaded again when usd_path maps to another layer, or when its layer was reloaded,
+    e.g. after the stage cache picked up an outside change.
+    """
+
+    def __init__(self, max_size: int = 16) -> None:
+        self.max_size = max_size
+        self._manifests = OrderedDict()
+        self._listener = Tf.Notice.RegisterGlobally(Sdf.Notice.LayerDidReloadContent, self._on_layer_reloaded)
+
+    def open(self, usd_path: str, layer: Sdf.Layer) -> StageManifest:
+        cached = self._manifests.get(usd_path)
+        if cached is not None and cached[0] == layer:
+            self._manifests.move_to_end(usd_path)
+            return cached[1]
+
+        manifest = StageManifest.load(layer)
+        self._manifests[usd_path] = (layer, manifest)
+        self._manifests.move_to_end(usd_path)
+        # Unsaved changes of a dropped manifest go to its layer, to be saved with it
+        while len(self._manifests) > self.max_size:
+            _, (dropped_layer, dropped) = self._manifests.popitem(last=False)
+            dropped.write(dropped_layer)
+        return manifest
+
+    def write(self, usd_path: str, layer: Sdf.Layer):
+        """Write the manifest of usd_path to its layer, when it is in memory and changed"""
+        cached = self._manifests.get(usd_path)
+        if cached is not None and cached[0] == layer:
+            cached[1].write(layer)
+
+    def invalidate(self, usd_path: str = None):
+        if usd_path is None:
+            self._manifests.clear()
+        else:
+            self._manifests.pop(usd_path, None)
+
+    def _on_layer_reloaded(self, notice, layer: Sdf.Layer):
+        for usd_path in [path for path, (cached, _) in self._manifests.items() if cached == layer]:
+            del self._manifests[usd_path]
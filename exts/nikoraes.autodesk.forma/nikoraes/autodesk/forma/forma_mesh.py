@@ -0,0 +1,785 @@
+import hashlib
+
+import numpy as np
+from pxr import Gf, Kind, Sdf, Usd, UsdGeom, Vt
+
+NORMALS_NONE = "none"
+NORMALS_FACE = "face"
+NORMALS_VERTEX = "vertex"
+NORMALS_MODES = (NORMALS_NONE, NORMALS_FACE, NORMALS_VERTEX)
+
+# Bumped when a change to the conversion changes the meshes it writes, so meshes cached on disk are converted again
+CONVERTER_VERSION = 1
+
+# Root of the prototypes of instanced meshes, a class so the prototypes themselves are not rendered
+PROTOTYPES_PATH = "/FormaPrototypes"
+# Custom data of a prototype with the key of its geometry
+GEOMETRY_KEY = "formaGeometryKey"
+# Meshes share a prototype when their points match within this distance once moved to the origin
+INSTANCE_TOLERANCE = 1e-3
+# Grid the size of a mesh is snapped to in its geometry key
+_GEOMETRY_KEY_GRID = 1e-2
+
+# Variant set with the levels of detail of a mesh, lod0 is the full mesh and the coarsest one is selected
+LOD_VARIANT_SET = "LOD"
+# At most this many decimated levels of detail are built per mesh
+MAX_LODS = 4
+# Clustering grids tried per level of detail, to get close to its triangle budget
+_LOD_ITERATIONS = 8
+
+_MESH_ATTRIBUTES = (
+    UsdGeom.Tokens.points,
+    UsdGeom.Tokens.faceVertexCounts,
+    UsdGeom.Tokens.faceVertexIndices,
+    UsdGeom.Tokens.extent,
+    UsdGeom.Tokens.normals,
+)
+_TRANSLATE_OP = "xformOp:translate"
+
+
+class MeshData(object):
+    """NumPy arrays describing a mesh, ready to be authored on a stage"""
+
+    def __init__(
+        self,
+        points: np.ndarray,
+        face_vertex_counts: np.ndarray,
+        face_vertex_indices: np.ndarray,
+        extent: np.ndarray = None,
+        normals: np.ndarray = None,
+        normals_interpolation: str = None,
+        translation: np.ndarray = None,
+        geometry_key: str = None,
+        lods: list = None,
+    ) -> None:
+        self.points = points
+        self.face_vertex_counts = face_vertex_counts
+        self.face_vertex_indices = face_vertex_indices
+        # Written when set, normals_interpolation is "uniform" for one normal per face or "vertex"
+        self.extent = extent
+        self.normals = normals
+        self.normals_interpolation = normals_interpolation
+        # Set by center_mesh, for meshes written as instances
+        self.translation = translation
+        self.geometry_key = geometry_key
+        # Set by build_lods, the decimated MeshData of the mesh, from fine to coarse
+        self.lods = lods
+
+    @property
+    def vertex_count(self) -> int:
+        return len(self.points)
+
+    @property
+    def face_count(self) -> int:
+        return len(self.face_vertex_counts)
+
+
+class ConversionOptions(object):
+    """Settings that change how a payload is converted into the mesh arrays to author
+
+    Raises:
+        ValueError: normals is not one of NORMALS_MODES
+    """
+
+    def __init__(
+        self,
+        weld_vertices: bool = False,
+        weld_tolerance: float = 0.0,
+        normals: str = NORMALS_NONE,
+        lod_budgets: tuple = (),
+    ) -> None:
+        self.weld_vertices = weld_vertices
+        self.weld_tolerance = weld_tolerance
+        if normals not in NORMALS_MODES:
+            raise ValueError(f"Normals must be one of {', '.join(NORMALS_MODES)}, got {normals!r}")
+        self.normals = normals
+        # Triangle budgets of the levels of detail to build, none when empty, see build_lods
+        self.lod_budgets = tuple(lod_budgets)
+
+    @property
+    def signature(self) -> str:
+        """Describes the options, a mesh is only unchanged when it was converted with the same signature"""
+        weld = self.weld_tolerance if self.weld_vertices else "off"
+        signature = f"weld={weld} normals={self.normals}"
+        if self.lod_budgets:
+            signature += f" lods={'/'.join(str(budget) for budget in self.lod_budgets)}"
+        return signature
+
+
+class AuthoringOptions(object):
+    """Settings that change how converted meshes are written"""
+
+    def __init__(self, sdf_authoring: bool = True, payload_layout: bool = False, instancing: bool = False) -> None:
+        self.sdf_authoring = sdf_authoring
+        self.payload_layout = payload_layout
+        # Only used with Sdf authoring and without the payload layout
+        self.instancing = instancing
+
+    @property
+    def signature(self) -> str:
+        """Describes the options that change the written prims, unlike the backend used to write them"""
+        signature = f"payload={'on' if self.payload_layout else 'off'}"
+        if self.instancing:
+            signature += " instancing=on"
+        return signature
+
+
+def content_hash(buffer) -> str:
+    """Hash of a mesh payload, to detect meshes that did not change since they were imported"""
+    if isinstance(buffer, np.ndarray):
+        buffer = np.ascontiguousarray(buffer).reshape(-1).view(np.uint8)
+    return hashlib.blake2b(buffer, digest_size=16).hexdigest()
+
+
+def vertices_from_buffer(buffer) -> np.ndarray:
+    """View a raw float32 triangle soup buffer as an (N, 3) vertex array, without copying"""
+    return np.frombuffer(buffer, dtype=np.float32).reshape((-1, 3))
+
+
+def triangle_soup_to_mesh(vertices: np.ndarray) -> MeshData:
+    """Build the topology for a triangle soup, where every triangle has its own three vertices
+
+    A trailing incomplete triangle is dropped.
+    """
+    triangle_count = len(vertices) // 3
+    points = vertices[: triangle_count * 3]
+
+    face_vertex_counts = np.full(triangle_count, 3, dtype=np.int32)
+    face_vertex_indices = np.arange(len(points), dtype=np.int32)
+
+    return MeshData(points, face_vertex_counts, face_vertex_indices)
+
+
+def weld_vertices(mesh_data: MeshData, tolerance: float = 0.0) -> MeshData:
+    """Merge vertices that fall in the same cell of a `tolerance` sized grid into an indexed mesh
+
+    With a tolerance of 0, only bitwise identical positions are merged. Welded vertices keep the position
+    of their first occurrence, in first occurrence order. Triangles that collapse are dropped.
+    """
+    points = np.ascontiguousarray(mesh_data.points, dtype=np.float32)
+    if len(points) == 0:
+        return mesh_data
+
+    if tolerance > 0:
+        grid = np.floor(points / tolerance + 0.5).astype(np.int64)
+    else:
+        # Normalize -0.0 so it welds with 0.0, then compare the bit patterns
+        grid = (points + np.float32(0.0)).view(np.int32).astype(np.int64)
+
+    _, first, inverse = np.unique(_row_keys(grid), return_index=True, return_inverse=True)
+
+    # np.unique sorts by key, renumber the welded vertices in first occurrence order to keep locality
+    order = np.argsort(first)
+    remap = np.empty_like(order)
+    remap[order] = np.arange(len(order))
+
+    welded_points = points[first[order]]
+    face_vertex_indices = remap[inverse.reshape(-1)][mesh_data.face_vertex_indices].astype(np.int32)
+    face_vertex_counts = mesh_data.face_vertex_counts
+
+    if len(face_vertex_counts) and np.all(face_vertex_counts == 3):
+        triangles = face_vertex_indices.reshape((-1, 3))
+        keep = (
+            (triangles[:, 0] != triangles[:, 1])
+            & (triangles[:, 1] != triangles[:, 2])
+            & (triangles[:, 2] != triangles[:, 0])
+        )
+        if not np.all(keep):
+            face_vertex_indices = triangles[keep].reshape(-1)
+            face_vertex_counts = face_vertex_counts[keep]
+
+    return MeshData(welded_points, face_vertex_counts, face_vertex_indices)
+
+
+def compute_normals(mesh_data: MeshData, normals: str) -> MeshData:
+    """Set unit face normals, or angle-weighted vertex normals, on a triangle mesh
+
+    Vertex normals are only smooth across the triangles that share the vertex, so a triangle soup gets
+    the normals of its faces. Meshes with other faces than triangles are returned unchanged.
+    """
+    counts = mesh_data.face_vertex_counts
+    if normals == NORMALS_NONE or len(counts) == 0 or not np.all(counts == 3):
+        return mesh_data
+
+    points = np.asarray(mesh_data.points, dtype=np.float32)
+    triangles = np.asarray(mesh_data.face_vertex_indices).reshape((-1, 3))
+    corners = points[triangles]
+    face_normals = _normalize(np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0]))
+
+    if normals == NORMALS_FACE:
+        return MeshData(
+            mesh_data.points,
+            counts,
+            mesh_data.face_vertex_indices,
+            mesh_data.extent,
+            face_normals,
+            UsdGeom.Tokens.uniform,
+        )
+
+    # Weight the face normal by the angle of the triangle at each of its corners
+    angles = np.empty(triangles.shape, dtype=np.float32)
+    for corner in range(3):
+        to_next = _normalize(corners[:, (corner + 1) % 3] - corners[:, corner])
+        to_previous = _normalize(corners[:, (corner + 2) % 3] - corners[:, corner])
+        angles[:, corner] = np.arccos(np.clip(np.einsum("ij,ij->i", to_next, to_previous), -1.0, 1.0))
+
+    # Sum the weighted normals per vertex, np.bincount is a faster scatter-add than np.add.at
+    vertex_normals = np.empty_like(points)
+    for axis in range(3):
+        vertex_normals[:, axis] = np.bincount(
+            triangles.reshape(-1),
+            weights=(angles * face_normals[:, axis, np.newaxis]).reshape(-1),
+            minlength=len(points),
+        )
+
+    return MeshData(
+        mesh_data.points,
+        counts,
+        mesh_data.face_vertex_indices,
+        mesh_data.extent,
+        _normalize(vertex_normals),
+        UsdGeom.Tokens.vertex,
+    )
+
+
+def prepare_mesh(mesh_data: MeshData, options: ConversionOptions) -> MeshData:
+    """Apply the conversion options to decoded mesh arrays, before authoring"""
+    # Optionally weld the triangle soup into an indexed mesh
+    if options.weld_vertices:
+        mesh_data = weld_vertices(mesh_data, options.weld_tolerance)
+
+    mesh_data = compute_normals(mesh_data, options.normals)
+
+    # Consumers read the bounds from the extent instead of going over the points
+    mesh_data.extent = compute_extent(mesh_data.points)
+
+    if options.lod_budgets:
+        mesh_data.lods = build_lods(mesh_data, options.lod_budgets, options.normals)
+
+    return mesh_data
+
+
+def parse_lod_budgets(text: str) -> tuple:
+    """The triangle budgets of a comma separated list, largest first, without duplicates
+
+    Raises:
+        ValueError: A budget is not a positive integer, or there are more than MAX_LODS
+    """
+    budgets = set()
+    for item in text.split(","):
+        if not item.strip():
+            continue
+        budget = int(item)
+        if budget <= 0:
+            raise ValueError(f"LOD triangle budgets must be positive, got {budget}")
+        budgets.add(budget)
+    if len(budgets) > MAX_LODS:
+        raise ValueError(f"At most {MAX_LODS} LOD triangle budgets are supported, got {len(budgets)}")
+    return tuple(sorted(budgets, reverse=True))
+
+
+def build_lods(mesh_data: MeshData, budgets: tuple, normals: str = NORMALS_NONE) -> list:
+    """Decimate a triangle mesh to the triangle budgets with `simplify_mesh`, from the largest budget down
+
+    Every level is decimated from the previous one. Budgets the mesh already fits in are skipped, so a light mesh
+    gets no levels of detail. The levels get their own normals and extent.
+
+    Returns:
+        list: The levels of detail from fine to coarse, or None when there are none
+    """
+    lods = []
+    level = mesh_data
+    # Clustering a triangle soup goes over every corner, it is faster to cluster its distinct positions
+    if budgets and mesh_data.vertex_count == 3 * mesh_data.face_count and mesh_data.face_count > min(budgets):
+        level = weld_vertices(mesh_data)
+    for budget in sorted(budgets, reverse=True):
+        if level.face_count <= budget:
+            continue
+        simplified = simplify_mesh(level, budget)
+        if simplified is level:
+            break
+        level = compute_normals(simplified, normals)
+        level.extent = compute_extent(level.points)
+        lods.append(level)
+    return lods or None
+
+
+def simplify_mesh(mesh_data: MeshData, max_faces: int) -> MeshData:
+    """Decimate a triangle mesh to at most max_faces triangles by vertex clustering
+
+    Vertices in the same cell of a uniform grid are merged into their mean position, triangles that collapse, or
+    land on the same three cells as another triangle, are dropped. The cell size is bisected until the result
+    is within 10% under the budget. The grid starts at the min corner of the mesh, so meshes that only differ
+    by their translation are decimated the same way. Meshes with other faces than triangles, or that already
+    fit, are returned unchanged.
+    """
+    counts = mesh_data.face_vertex_counts
+    if len(counts) <= max_faces or not np.all(counts == 3):
+        return mesh_data
+
+    points = np.asarray(mesh_data.points, dtype=np.float32)
+    triangles = np.asarray(mesh_data.face_vertex_indices).reshape((-1, 3))
+    extent = compute_extent(points)
+    size = float((extent[1] - extent[0]).max())
+    if size <= 0:
+        return mesh_data
+    local_points = points - extent[0]
+
+    # A surface split in n cells per side keeps about 2 n² triangles
+    low, high = 0.0, size
+    cell = size / np.sqrt(max(max_faces, 1) / 2.0)
+    best = None
+    for _ in range(_LOD_ITERATIONS):
+        clusters, clustered = _cluster_vertices(local_points, triangles, cell)
+        if len(clustered) <= max_faces:
+            best = (clusters, clustered)
+            high = cell
+            if len(clustered) >= 0.9 * max_faces:
+                break
+        else:
+            low = cell
+        cell = np.sqrt(low * high) if low > 0 else high / 2.0
+    if best is None:
+        best = _cluster_vertices(local_points, triangles, high)
+    clusters, clustered = best
+
+    # Every cluster is the mean of its vertices, only the clusters used by a triangle are kept
+    cluster_count = int(clusters.max()) + 1
+    weights = np.bincount(clusters, minlength=cluster_count).astype(np.float64)
+    centers = np.empty((cluster_count, 3), dtype=np.float32)
+    for axis in range(3):
+        centers[:, axis] = np.bincount(clusters, weights=points[:, axis], minlength=cluster_count) / np.maximum(
+            weights, 1.0
+        )
+    used, face_vertex_indices = np.unique(clustered.reshape(-1), return_inverse=True)
+
+    return MeshData(
+        centers[used],
+        np.full(len(clustered), 3, dtype=np.int32),
+        face_vertex_indices.reshape(-1).astype(np.int32),
+    )
+
+
+def _cluster_vertices(points: np.ndarray, triangles: np.ndarray, cell: float):
+    """The cluster of every vertex in a grid of `cell` sized cells, and the (N, 3) triangles between clusters"""
+    _, clusters = np.unique(_row_keys(np.floor(points / cell).astype(np.int64)), return_inverse=True)
+    clusters = clusters.reshape(-1)
+    clustered = clusters[triangles]
+    keep = (
+        (clustered[:, 0] != clustered[:, 1])
+        & (clustered[:, 1] != clustered[:, 2])
+        & (clustered[:, 2] != clustered[:, 0])
+    )
+    clustered = clustered[keep]
+    if len(clustered):
+        # Keep the first of the triangles on the same three clusters, in either winding
+        _, first = np.unique(_row_keys(np.sort(clustered, axis=1).astype(np.int64)), return_index=True)
+        clustered = clustered[np.sort(first)]
+    return clusters, clustered
+
+
+def center_mesh(mesh_data: MeshData) -> MeshData:
+    """Move a mesh to the min corner of its extent, so it can share its geometry with the meshes that only differ
+    by their translation
+
+    The moved mesh has the float64 translation that puts it back, and a geometry key hashing its topology and
+    rounded size. Meshes with the same geometry have the same key, and points within INSTANCE_TOLERANCE,
+    see `matches_prototype`. The points are not part of the key, as float32 world coordinates are not exact.
+    """
+    points = np.asarray(mesh_data.points, dtype=np.float64).reshape((-1, 3))
+    if len(points):
+        translation = np.array([points[:, axis].min() for axis in range(3)])
+    else:
+        translation = np.zeros(3)
+    local_points = (points - translation).astype(np.float32)
+    extent = compute_extent(local_points)
+
+    face_vertex_counts = np.ascontiguousarray(mesh_data.face_vertex_counts, dtype=np.int32)
+    face_vertex_indices = np.ascontiguousarray(mesh_data.face_vertex_indices, dtype=np.int32)
+    geometry_key = hashlib.blake2b(digest_size=16)
+    geometry_key.update(face_vertex_counts.tobytes())
+    geometry_key.update(face_vertex_indices.tobytes())
+    geometry_key.update(np.round(extent[1] / _GEOMETRY_KEY_GRID).astype(np.int64).tobytes())
+    geometry_key.update(str(mesh_data.normals_interpolation).encode())
+
+    # The levels of detail do not change the key, they are decimated the same way for the same geometry
+    lods = None
+    if mesh_data.lods:
+        lods = []
+        for lod in mesh_data.lods:
+            lod_points = (np.asarray(lod.points, dtype=np.float64) - translation).astype(np.float32)
+            lods.append(
+                MeshData(
+                    lod_points,
+                    lod.face_vertex_counts,
+                    lod.face_vertex_indices,
+                    extent=compute_extent(lod_points),
+                    normals=lod.normals,
+                    normals_interpolation=lod.normals_interpolation,
+                )
+            )
+
+    return MeshData(
+        local_points,
+        face_vertex_counts,
+        face_vertex_indices,
+        extent=extent,
+        normals=mesh_data.normals,
+        normals_interpolation=mesh_data.normals_interpolation,
+        translation=translation,
+        geometry_key=geometry_key.hexdigest(),
+        lods=lods,
+    )
+
+
+def matches_prototype(layer: Sdf.Layer, prototype_path: str, mesh_data: MeshData) -> bool:
+    """Check if a mesh moved by `center_mesh` has the points of a prototype, within INSTANCE_TOLERANCE"""
+    mesh_path = Sdf.Path(prototype_path).AppendChild("mesh")
+    points_spec = layer.GetAttributeAtPath(mesh_path.AppendProperty(UsdGeom.Tokens.points))
+    if not points_spec:
+        # The full mesh of a prototype with levels of detail
+        points_spec = layer.GetAttributeAtPath(
+            mesh_path.AppendVariantSelection(LOD_VARIANT_SET, "lod0").AppendProperty(UsdGeom.Tokens.points)
+        )
+    if not points_spec or points_spec.default is None:
+        return False
+    prototype_points = np.asarray(points_spec.default)
+    return prototype_points.shape == mesh_data.points.shape and np.allclose(
+        prototype_points, mesh_data.points, rtol=0.0, atol=INSTANCE_TOLERANCE
+    )
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scale (N, 3) vectors to unit length, zero length vectors stay zero"""
+    lengths = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return (vectors / np.where(lengths > 0, lengths, 1)).astype(np.float32)
+
+
+def compute_extent(points: np.ndarray) -> np.ndarray:
+    """The (2, 3) min and max corners of the points, zeros for an empty mesh"""
+    points = np.asarray(points, dtype=np.float32).reshape((-1, 3))
+    if len(points) == 0:
+        return np.zeros((2, 3), dtype=np.float32)
+    # Reducing one column at a time is much faster than min(axis=0) over interleaved xyz
+    return np.array(
+        [[points[:, axis].min() for axis in range(3)], [points[:, axis].max() for axis in range(3)]],
+        dtype=np.float32,
+    )
+
+
+def _row_keys(grid: np.ndarray) -> np.ndarray:
+    """One sortable key per (x, y, z) row of an int64 grid"""
+    grid = grid - grid.min(axis=0)
+    if grid.max(initial=0) < (1 << 21):
+        # Pack the three coordinates in a single int64
+        return (grid[:, 0] << 42) | (grid[:, 1] << 21) | grid[:, 2]
+
+    grid = np.ascontiguousarray(grid)
+    return grid.view(np.dtype((np.void, grid.dtype.itemsize * 3))).reshape(-1)
+
+
+def author_mesh(stage: Usd.Stage, prim_path: str, mesh_data: MeshData) -> UsdGeom.Mesh:
+    """Define a Mesh prim and set its points, topology and, when the mesh data has them, extent and normals
+
+    The arrays are handed to Vt through the buffer protocol, so no Python object is created per vertex.
+    """
+    mesh_prim = UsdGeom.Mesh.Define(stage, prim_path)
+
+    mesh_prim.CreatePointsAttr(
+        Vt.Vec3fArray.FromNumpy(np.ascontiguousarray(mesh_data.points, dtype=np.float32))
+    )
+    mesh_prim.CreateFaceVertexCountsAttr(
+        Vt.IntArray.FromNumpy(np.ascontiguousarray(mesh_data.face_vertex_counts, dtype=np.int32))
+    )
+    mesh_prim.CreateFaceVertexIndicesAttr(
+        Vt.IntArray.FromNumpy(np.ascontiguousarray(mesh_data.face_vertex_indices, dtype=np.int32))
+    )
+
+    if mesh_data.extent is not None:
+        mesh_prim.CreateExtentAttr(
+            Vt.Vec3fArray.FromNumpy(np.ascontiguousarray(mesh_data.extent, dtype=np.float32))
+        )
+    else:
+        mesh_prim.GetPrim().RemoveProperty(UsdGeom.Tokens.extent)
+
+    if mesh_data.normals is not None:
+        mesh_prim.CreateNormalsAttr(
+            Vt.Vec3fArray.FromNumpy(np.ascontiguousarray(mesh_data.normals, dtype=np.float32))
+        )
+        mesh_prim.SetNormalsInterpolation(mesh_data.normals_interpolation)
+    else:
+        mesh_prim.GetPrim().RemoveProperty(UsdGeom.Tokens.normals)
+
+    return mesh_prim
+
+
+def author_mesh_spec(layer: Sdf.Layer, prim_path: str, mesh_data: MeshData) -> Sdf.PrimSpec:
+    """Write a Mesh prim spec and its attribute defaults straight into a layer
+
+    Like `author_mesh`, the extent and normals are written when the mesh data has them.
+    Unlike `author_mesh`, this only uses the Sdf API, so it can be called for many meshes within one Sdf.ChangeBlock.
+    Ancestor prims are defined as typeless prims, like UsdGeom.Mesh.Define does.
+    A mesh with levels of detail gets a LOD variant set, with the mesh attributes in every variant.
+    """
+    prim_spec = _define_prim_spec(layer, prim_path, "Mesh")
+    clear_payload(prim_spec)
+    clear_instance(prim_spec)
+    clear_lods(prim_spec)
+
+    if not mesh_data.lods:
+        _set_mesh_attributes(prim_spec, mesh_data)
+        return prim_spec
+
+    # Opinions on the prim itself are stronger than the ones in its variants, the attributes only go in the variants
+    for name in _MESH_ATTRIBUTES:
+        _remove_attribute(prim_spec, name)
+    variant_set = Sdf.VariantSetSpec(prim_spec, LOD_VARIANT_SET)
+    levels = [mesh_data] + list(mesh_data.lods)
+    for level, level_data in enumerate(levels):
+        _set_mesh_attributes(Sdf.VariantSpec(variant_set, f"lod{level}").primSpec, level_data)
+    prim_spec.variantSetNameList.prependedItems = [LOD_VARIANT_SET]
+    prim_spec.variantSelections[LOD_VARIANT_SET] = f"lod{len(levels) - 1}"
+
+    return prim_spec
+
+
+def _set_mesh_attributes(prim_spec: Sdf.PrimSpec, mesh_data: MeshData):
+    _set_attribute_default(
+        prim_spec,
+        UsdGeom.Tokens.points,
+        Sdf.ValueTypeNames.Point3fArray,
+        Vt.Vec3fArray.FromNumpy(np.ascontiguousarray(mesh_data.points, dtype=np.float32)),
+    )
+    _set_attribute_default(
+        prim_spec,
+        UsdGeom.Tokens.faceVertexCounts,
+        Sdf.ValueTypeNames.IntArray,
+        Vt.IntArray.FromNumpy(np.ascontiguousarray(mesh_data.face_vertex_counts, dtype=np.int32)),
+    )
+    _set_attribute_default(
+        prim_spec,
+        UsdGeom.Tokens.faceVertexIndices,
+        Sdf.ValueTypeNames.IntArray,
+        Vt.IntArray.FromNumpy(np.ascontiguousarray(mesh_data.face_vertex_indices, dtype=np.int32)),
+    )
+
+    if mesh_data.extent is not None:
+        _set_attribute_default(
+            prim_spec,
+            UsdGeom.Tokens.extent,
+            Sdf.ValueTypeNames.Float3Array,
+            Vt.Vec3fArray.FromNumpy(np.ascontiguousarray(mesh_data.extent, dtype=np.float32)),
+        )
+    else:
+        _remove_attribute(prim_spec, UsdGeom.Tokens.extent)
+
+    if mesh_data.normals is not None:
+        normals_spec = _set_attribute_default(
+            prim_spec,
+            UsdGeom.Tokens.normals,
+            Sdf.ValueTypeNames.Normal3fArray,
+            Vt.Vec3fArray.FromNumpy(np.ascontiguousarray(mesh_data.normals, dtype=np.float32)),
+        )
+        normals_spec.SetInfo(UsdGeom.Tokens.interpolation, mesh_data.normals_interpolation)
+    else:
+        _remove_attribute(prim_spec, UsdGeom.Tokens.normals)
+
+
+def copy_mesh_spec(source_layer: Sdf.Layer, source_path: str, layer: Sdf.Layer, prim_path: str) -> Sdf.PrimSpec:
+    """Write a Mesh prim spec with the mesh attributes of a mesh written by `author_mesh_spec` in another layer
+
+    The Vt arrays are set as they are, without going through NumPy. This is several times faster than
+    Sdf.CopySpec on the attributes. Like `author_mesh_spec`, the rest of the prim spec is kept.
+    """
+    prim_spec = _define_prim_spec(layer, prim_path, "Mesh")
+    clear_payload(prim_spec)
+    clear_instance(prim_spec)
+    clear_lods(prim_spec)
+
+    source_spec = source_layer.GetPrimAtPath(source_path)
+    _copy_mesh_attributes(source_spec, prim_spec)
+    source_variant_set = source_spec.variantSets.get(LOD_VARIANT_SET)
+    if source_variant_set:
+        variant_set = Sdf.VariantSetSpec(prim_spec, LOD_VARIANT_SET)
+        for source_variant in source_variant_set.variantList:
+            _copy_mesh_attributes(source_variant.primSpec, Sdf.VariantSpec(variant_set, source_variant.name).primSpec)
+        prim_spec.variantSetNameList.prependedItems = [LOD_VARIANT_SET]
+        prim_spec.variantSelections[LOD_VARIANT_SET] = source_spec.variantSelections[LOD_VARIANT_SET]
+
+    return prim_spec
+
+
+def _copy_mesh_attributes(source_prim_spec: Sdf.PrimSpec, prim_spec: Sdf.PrimSpec):
+    source_attributes = source_prim_spec.attributes
+    for name in _MESH_ATTRIBUTES:
+        if name not in source_attributes:
+            _remove_attribute(prim_spec, name)
+            continue
+        source_spec = source_attributes[name]
+        attribute_spec = _set_attribute_default(prim_spec, name, source_spec.typeName, source_spec.default)
+        if name == UsdGeom.Tokens.normals:
+            attribute_spec.SetInfo(UsdGeom.Tokens.interpolation, source_spec.GetInfo(UsdGeom.Tokens.interpolation))
+
+
+def author_payload_spec(layer: Sdf.Layer, prim_path: str, asset_path: str, extent: np.ndarray) -> Sdf.PrimSpec:
+    """Write an Xform prim spec that loads its mesh from another layer as a payload
+
+    The prim is a component model with an extentsHint, so its bounds are known while the payload is not loaded.
+    Ancestor prims without a kind become groups, to keep the model hierarchy contiguous.
+    """
+    prim_spec = _define_prim_spec(layer, prim_path, "Xform")
+    prim_spec.kind = Kind.Tokens.component
+    clear_instance(prim_spec)
+    clear_lods(prim_spec)
+
+    # The mesh comes from the payload, drop what an import without payload wrote
+    for name in _MESH_ATTRIBUTES:
+        _remove_attribute(prim_spec, name)
+
+    parent_spec = prim_spec.nameParent
+    while parent_spec and parent_spec.path != Sdf.Path.absoluteRootPath:
+        if not parent_spec.kind:
+            parent_spec.kind = Kind.Tokens.group
+        parent_spec = parent_spec.nameParent
+
+    prim_spec.payloadList.ClearEdits()
+    prim_spec.payloadList.prependedItems = [Sdf.Payload(asset_path)]
+    _set_attribute_default(
+        prim_spec,
+        UsdGeom.Tokens.extentsHint,
+        Sdf.ValueTypeNames.Float3Array,
+        Vt.Vec3fArray.FromNumpy(np.ascontiguousarray(extent, dtype=np.float32)),
+    )
+
+    return prim_spec
+
+
+def author_payload_layer(layer: Sdf.Layer, name: str, mesh_data: MeshData) -> Sdf.PrimSpec:
+    """Replace the content of a layer with an Xform default prim named `name`, holding the mesh as `mesh`
+
+    This is the layer loaded by the payload written by `author_payload_spec`.
+    """
+    layer.Clear()
+    layer.pseudoRoot.SetInfo(UsdGeom.Tokens.upAxis, UsdGeom.Tokens.z)
+    _define_prim_spec(layer, f"/{name}", "Xform")
+    layer.defaultPrim = name
+    return author_mesh_spec(layer, f"/{name}/mesh", mesh_data)
+
+
+def author_prototype_spec(layer: Sdf.Layer, prototype_path: str, mesh_data: MeshData) -> Sdf.PrimSpec:
+    """Write the prototype of instanced meshes, an Xform holding a mesh moved by `center_mesh` as `mesh`,
+    under the PROTOTYPES_PATH class
+    """
+    root_path = Sdf.Path(PROTOTYPES_PATH)
+    if not layer.GetPrimAtPath(root_path):
+        Sdf.PrimSpec(layer.pseudoRoot, root_path.name, Sdf.SpecifierClass)
+    prototype_spec = _define_prim_spec(layer, prototype_path, "Xform")
+    prototype_spec.SetInfoDictionaryValue("customData", GEOMETRY_KEY, mesh_data.geometry_key)
+    author_mesh_spec(layer, f"{prototype_path}/mesh", mesh_data)
+    return prototype_spec
+
+
+def author_instance_spec(
+    layer: Sdf.Layer, prim_path: str, prototype_path: str, translation: np.ndarray
+) -> Sdf.PrimSpec:
+    """Write an instanceable Xform prim spec referencing a prototype written by `author_prototype_spec`,
+    moved by a translation
+    """
+    prim_spec = _define_prim_spec(layer, prim_path, "Xform")
+    clear_payload(prim_spec)
+    clear_lods(prim_spec)
+
+    # The mesh comes from the prototype, drop what an import without instancing wrote
+    for name in _MESH_ATTRIBUTES:
+        _remove_attribute(prim_spec, name)
+
+    prim_spec.instanceable = True
+    prim_spec.referenceList.ClearEdits()
+    prim_spec.referenceList.prependedItems = [Sdf.Reference(primPath=prototype_path)]
+    _set_attribute_default(prim_spec, _TRANSLATE_OP, Sdf.ValueTypeNames.Double3, Gf.Vec3d(*translation.tolist()))
+    _set_attribute_default(
+        prim_spec,
+        UsdGeom.Tokens.xformOpOrder,
+        Sdf.ValueTypeNames.TokenArray,
+        Vt.TokenArray([_TRANSLATE_OP]),
+        Sdf.VariabilityUniform,
+    )
+
+    return prim_spec
+
+
+def clear_instance(prim_spec: Sdf.PrimSpec):
+    """Remove the reference, instanceable flag and transform written by `author_instance_spec`"""
+    prim_spec.referenceList.ClearEdits()
+    prim_spec.ClearInfo("instanceable")
+    _remove_attribute(prim_spec, _TRANSLATE_OP)
+    _remove_attribute(prim_spec, UsdGeom.Tokens.xformOpOrder)
+
+
+def clear_lods(prim_spec: Sdf.PrimSpec):
+    """Remove the LOD variant set written by `author_mesh_spec`"""
+    if LOD_VARIANT_SET not in prim_spec.variantSets:
+        return
+    del prim_spec.variantSets[LOD_VARIANT_SET]
+    prim_spec.variantSetNameList.ClearEdits()
+    if LOD_VARIANT_SET in prim_spec.variantSelections:
+        del prim_spec.variantSelections[LOD_VARIANT_SET]
+
+
+def clear_payload(prim_spec: Sdf.PrimSpec):
+    """Remove the payload, kind and extentsHint written by `author_payload_spec`"""
+    prim_spec.payloadList.ClearEdits()
+    prim_spec.ClearInfo("kind")
+    _remove_attribute(prim_spec, UsdGeom.Tokens.extentsHint)
+
+
+def remove_prim_spec(layer: Sdf.Layer, prim_path: str) -> bool:
+    """Remove a prim spec and its children from a layer
+
+    Returns:
+        bool: False when the layer has no spec at prim_path
+    """
+    prim_spec = layer.GetPrimAtPath(prim_path)
+    if not prim_spec:
+        return False
+    parent_spec = prim_spec.nameParent
+    if parent_spec:
+        del parent_spec.nameChildren[prim_spec.name]
+    else:
+        # A root prim
+        del layer.rootPrims[prim_spec.name]
+    return True
+
+
+def _define_prim_spec(layer: Sdf.Layer, prim_path: str, type_name: str) -> Sdf.PrimSpec:
+    prim_spec = Sdf.CreatePrimInLayer(layer, prim_path)
+    prim_spec.specifier = Sdf.SpecifierDef
+    prim_spec.typeName = type_name
+
+    parent_spec = prim_spec.nameParent
+    while parent_spec and parent_spec.path != Sdf.Path.absoluteRootPath:
+        if parent_spec.specifier == Sdf.SpecifierOver:
+            parent_spec.specifier = Sdf.SpecifierDef
+        parent_spec = parent_spec.nameParent
+
+    return prim_spec
+
+
+def _set_attribute_default(
+    prim_spec: Sdf.PrimSpec,
+    name: str,
+    type_name: Sdf.ValueTypeName,
+    value,
+    variability: Sdf.Variability = Sdf.VariabilityVarying,
+) -> Sdf.AttributeSpec:
+    if name in prim_spec.attributes:
+        attribute_spec = prim_spec.attributes[name]
+    else:
+        attribute_spec = Sdf.AttributeSpec(prim_spec, name, type_name, variability)
+    attribute_spec.default = value
+    return attribute_spec
+
+
+def _remove_attribute(prim_spec: Sdf.PrimSpec, name: str):
+    if name in prim_spec.attributes:
+        prim_spec.RemoveProperty(prim_spec.attributes[name])
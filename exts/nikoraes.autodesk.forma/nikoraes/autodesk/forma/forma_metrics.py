@@ -0,0 +1,151 @@
+import bisect
+import contextlib
+import math
+import threading
+import time
+from typing import Dict, List
+
+# Upper bounds in seconds of the latency histogram buckets
+DEFAULT_BUCKETS = [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
+
+PROMETHEUS_PREFIX = "forma_"
+
+
+class Histogram(object):
+    """Counts observed values in fixed buckets, like a Prometheus histogram"""
+
+    def __init__(self, buckets: List[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = list(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative_counts(self) -> List[int]:
+        """The number of values up to each bucket bound, the last one being +Inf"""
+        cumulative = []
+        total = 0
+        for count in self.counts:
+            total += count
+            cumulative.append(total)
+        return cumulative
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile from the buckets, the upper bound of the bucket holding it
+
+        Values above the last bucket are reported as the last bound.
+        """
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        for bound, total in zip(self.buckets, self.cumulative_counts()):
+            if total >= rank:
+                return bound
+        return self.buckets[-1]
+
+
+class Metrics:
+    """Timing spans and counters of the import pipeline
+
+    Spans are recorded as latency histograms per step, counters add up bytes, vertices, triangles and meshes.
+    Both can be recorded from the worker pool threads.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+
+    def increment(self, name: str, value: float = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, span: str, seconds: float):
+        with self._lock:
+            histogram = self._histograms.get(span)
+            if histogram is None:
+                histogram = self._histograms[span] = Histogram()
+            histogram.observe(seconds)
+
+    @contextlib.contextmanager
+    def span(self, name: str):
+        """Time the code in the with block, also when it raises"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "spans": {
+                    name: {
+                        "count": histogram.count,
+                        "sum": histogram.sum,
+                        "p50": histogram.quantile(0.5),
+                        "p99": histogram.quantile(0.99),
+                        "buckets": [
+                            ["+Inf" if math.isinf(bound) else bound, total]
+                            for bound, total in zip(histogram.buckets + [math.inf], histogram.cumulative_counts())
+                        ],
+                    }
+                    for name, histogram in self._histograms.items()
+                },
+            }
+
+    def to_prometheus(self, gauges: Dict[str, float] = None) -> str:
+        """The metrics in the Prometheus text exposition format, with extra gauges like the cache sizes"""
+        snapshot = self.snapshot()
+        lines = []
+
+        for name, value in sorted(snapshot["counters"].items()):
+            metric = f"{PROMETHEUS_PREFIX}{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+
+        if snapshot["spans"]:
+            metric = f"{PROMETHEUS_PREFIX}span_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            for name, span in sorted(snapshot["spans"].items()):
+                for bound, total in span["buckets"]:
+                    lines.append(f'{metric}_bucket{{span="{name}",le="{bound}"}} {total}')
+                lines.append(f'{metric}_sum{{span="{name}"}} {span["sum"]}')
+                lines.append(f'{metric}_count{{span="{name}"}} {span["count"]}')
+
+        for name, value in sorted((gauges or {}).items()):
+            metric = f"{PROMETHEUS_PREFIX}{name}"
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {value}")
+
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> str:
+        """A short text summary of the spans and counters, for the settings window"""
+        snapshot = self.snapshot()
+        lines = [
+            f"{name}: {span['count']} x, avg {span['sum'] / span['count'] * 1000:.1f} ms, "
+            f"p99 <= {span['p99'] * 1000:.0f} ms"
+            for name, span in sorted(snapshot["spans"].items())
+        ]
+        lines += [f"{name}: {value:g}" for name, value in sorted(snapshot["counters"].items())]
+        return "\n".join(lines) if lines else "No requests yet"
+
+
+g_metrics = Metrics()
+
+
+def get_metrics() -> Metrics:
+    """Get the instance of the pipeline metrics"""
+
+    return g_metrics
@@ -0,0 +1,603 @@
+import asyncio
+import concurrent.futures
+import functools
+import os
+
+import carb
+import omni.client
+from pxr import Sdf, Usd, UsdGeom
+
+from . import forma_constants, forma_mesh, forma_wire_format
+from .forma_crate_cache import CachedMesh, CrateCache, get_cache_key
+from .forma_manifest import ManifestStore, StageManifest
+from .forma_metrics import get_metrics
+from .forma_profile import current_profiler
+from .forma_save import DeferredSaver
+from .utils import mark_file_deleted
+
+
+class ImportPipeline:
+    """The import and delete steps behind the service endpoints, without FastAPI or the Kit UI
+
+    The stage router gives the layer of a usd_path, the saver saves it, and the CPU-bound work runs in
+    the worker pool when there is one. The manifest of every layer records where each Forma element went.
+    Requests to the same usd_path must not run concurrently, the request manager takes care of that for
+    the endpoints. With a crate cache, converted meshes are copied from the cache instead of converting
+    the same payload again.
+    """
+
+    def __init__(
+        self,
+        stage_router,
+        stage_saver: DeferredSaver,
+        worker_pool: concurrent.futures.Executor = None,
+        crate_cache: CrateCache = None,
+    ) -> None:
+        self._stage_router = stage_router
+        self._stage_saver = stage_saver
+        self._worker_pool = worker_pool
+        self._crate_cache = crate_cache
+        self._manifests = ManifestStore()
+
+    async def import_mesh(
+        self,
+        usd_path: str,
+        forma_path: str,
+        payload,
+        compact: bool,
+        options: forma_mesh.ConversionOptions,
+        authoring: forma_mesh.AuthoringOptions,
+        autosave: bool,
+    ) -> dict:
+        """Import one uploaded mesh into the layer of a resolved usd_path
+
+        Raises:
+            ValueError: A compact payload is malformed
+        """
+        with get_metrics().span("hash"):
+            content_hash = await self._run_in_worker(forma_mesh.content_hash, payload)
+
+        # When usd_path is the stage open in Kit, its edit target layer is edited directly
+        # else try to find the layer. If it doesn't exist create it
+        with get_metrics().span("open"):
+            layer = self._open_layer(usd_path)
+
+        # TODO: If the selected USD path is not the current stage path,
+        # we need to add the new USD file to a sublayer of the current stage
+        # As the up axis will be Z, we will need to set this on that layer/stage
+
+        manifest = self._manifests.open(usd_path, layer)
+        prim_path = manifest.prim_path_for(forma_path, get_prim_path(forma_path))
+
+        # Skip meshes that were already imported from the same payload
+        signature = f"{options.signature} {authoring.signature}"
+        if _is_unchanged(layer, prim_path, content_hash, signature):
+            _add_to_manifest(manifest, layer, forma_path, prim_path, content_hash)
+            get_metrics().increment("meshes_unchanged")
+            return {"ok": True, "unchanged": True}
+
+        # Decode, weld and build the arrays off the main loop, only the authoring below runs on it
+        mesh_data = await self._convert(payload, content_hash, compact, options, _uses_instancing(usd_path, authoring))
+
+        # Define a Mesh primitive in the layer and set its points and topology
+        # The arrays go straight from NumPy to Vt, without a Python object per vertex
+        with get_metrics().span("author"):
+            prim_spec = self._author_mesh(usd_path, layer, prim_path, mesh_data, authoring)
+            _set_content_hash(prim_spec, content_hash, signature)
+            previous = _record_import(layer, manifest, forma_path, prim_path, content_hash, mesh_data)
+            _release_prototype(layer, manifest, previous)
+        _count_imported(mesh_data)
+        self._trim_crate_cache()
+
+        # Save the layer to a USD file, now or once the requests to it settle down
+        self._save_layer(usd_path, layer, autosave)
+
+        return {"ok": True}
+
+    async def import_mesh_batch(
+        self,
+        usd_path: str,
+        elements: list,
+        compact: bool,
+        options: forma_mesh.ConversionOptions,
+        authoring: forma_mesh.AuthoringOptions,
+        autosave: bool,
+    ) -> dict:
+        """Import the (forma_path, payload) elements of a batch into the layer of a resolved usd_path
+
+        Raises:
+            ValueError: A compact payload is malformed, nothing is imported
+        """
+        with get_metrics().span("hash"):
+            content_hashes = await asyncio.gather(
+                *[self._run_in_worker(forma_mesh.content_hash, payload) for _, payload in elements]
+            )
+
+        with get_metrics().span("open"):
+            layer = self._open_layer(usd_path)
+
+        # Skip meshes that were already imported from the same payload
+        manifest = self._manifests.open(usd_path, layer)
+        signature = f"{options.signature} {authoring.signature}"
+        changed = []
+        reserved = {}
+        for (forma_path, payload), content_hash in zip(elements, content_hashes):
+            prim_path = manifest.prim_path_for(forma_path, get_prim_path(forma_path), reserved)
+            if _is_unchanged(layer, prim_path, content_hash, signature):
+                _add_to_manifest(manifest, layer, forma_path, prim_path, content_hash)
+            else:
+                changed.append((forma_path, prim_path, payload, content_hash))
+        unchanged = len(elements) - len(changed)
+        get_metrics().increment("meshes_unchanged", unchanged)
+
+        if not changed:
+            return {"ok": True, "imported": 0, "unchanged": unchanged}
+
+        # Convert the meshes in parallel in the worker pool
+        center = _uses_instancing(usd_path, authoring)
+        results = await asyncio.gather(
+            *[
+                self._convert(payload, content_hash, compact, options, center)
+                for _, _, payload, content_hash in changed
+            ],
+            return_exceptions=True,
+        )
+        meshes = []
+        for (forma_path, prim_path, _, content_hash), result in zip(changed, results):
+            if isinstance(result, ValueError):
+                raise ValueError(f"{forma_path}: {result}")
+            if isinstance(result, BaseException):
+                raise result
+            meshes.append((prim_path, result, content_hash))
+
+        with get_metrics().span("author"):
+            self._author_meshes(usd_path, layer, meshes, authoring, signature)
+            # Prototypes are only released once every mesh of the batch uses its new one
+            replaced = [
+                _record_import(layer, manifest, forma_path, prim_path, content_hash, mesh_data)
+                for (forma_path, _, _, _), (prim_path, mesh_data, content_hash) in zip(changed, meshes)
+            ]
+            for entry in replaced:
+                _release_prototype(layer, manifest, entry)
+        for _, mesh_data, _ in meshes:
+            _count_imported(mesh_data)
+        self._trim_crate_cache()
+
+        # Save the layer to a USD file once for the whole batch
+        self._save_layer(usd_path, layer, autosave)
+
+        return {"ok": True, "imported": len(meshes), "unchanged": unchanged}
+
+    async def delete_mesh(self, usd_path: str, forma_path: str, autosave: bool) -> dict:
+        """Remove the mesh of a Forma element from the layer of a resolved usd_path"""
+        # Resolve the same layer as the imports to this usd_path, a missing layer has nothing to delete
+        layer = self._stage_router.open_layer(usd_path, create=False)
+        if layer is None:
+            return {"ok": True}
+
+        self._delete_meshes(usd_path, layer, [forma_path])
+
+        # Save the layer to a USD file, now or once the requests to it settle down
+        self._save_layer(usd_path, layer, autosave)
+
+        return {"ok": True}
+
+    async def delete_meshes(self, usd_path: str, forma_paths: list, prefix: str, autosave: bool) -> dict:
+        """Remove the meshes of a list of Forma elements, and of every element under prefix,
+        from the layer of a resolved usd_path in a single change block and save
+
+        Only elements recorded in the manifest are found by prefix.
+        """
+        targets = list(dict.fromkeys(forma_paths))
+        layer = self._stage_router.open_layer(usd_path, create=False)
+        if layer is None:
+            return {"ok": True, "removed": 0, "not_found": len(targets)}
+        manifest = self._manifests.open(usd_path, layer)
+
+        if prefix:
+            listed = set(targets)
+            targets += [
+                forma_path
+                for forma_path, _ in manifest.items()
+                if is_under_prefix(forma_path, prefix) and forma_path not in listed
+            ]
+
+        removed = self._delete_meshes(usd_path, layer, targets)
+        if removed or manifest.dirty:
+            self._save_layer(usd_path, layer, autosave)
+
+        return {"ok": True, "removed": removed, "not_found": len(targets) - removed}
+
+    async def sync(
+        self,
+        usd_path: str,
+        elements: list,
+        prefix: str,
+        delete_stale: bool,
+        options: forma_mesh.ConversionOptions,
+        authoring: forma_mesh.AuthoringOptions,
+        autosave: bool,
+    ) -> dict:
+        """Compare the (forma_path, content_hash) elements of a Forma site with the layer of a resolved usd_path
+
+        Returns the elements to upload, the ones that are missing or changed, and with delete_stale deletes
+        the elements of the layer under prefix that are no longer in the site, all in one save.
+
+        Raises:
+            ValueError: delete_stale without a prefix, a partial site would delete every other element
+        """
+        if delete_stale and not prefix:
+            raise ValueError("delete_stale requires a prefix, the Forma path the site is synced under")
+
+        # Every element of a site is uploaded to a missing layer, which is created by the first import
+        layer = self._stage_router.open_layer(usd_path, create=False)
+        if layer is None:
+            return {"ok": True, "upload": [forma_path for forma_path, _ in elements], "deleted": []}
+        manifest = self._manifests.open(usd_path, layer)
+
+        # An element is up to date when its prim was imported from the same payload with the same settings
+        signature = f"{options.signature} {authoring.signature}"
+        upload = []
+        for forma_path, content_hash in elements:
+            prim_path = manifest.find_prim_path(forma_path, get_prim_path(forma_path))
+            if prim_path is not None and _is_unchanged(layer, prim_path, content_hash, signature):
+                _add_to_manifest(manifest, layer, forma_path, prim_path, content_hash)
+            else:
+                upload.append(forma_path)
+
+        # Only elements recorded in the manifest can be found stale
+        deleted = []
+        if delete_stale:
+            site = {forma_path for forma_path, _ in elements}
+            deleted = [
+                forma_path
+                for forma_path, _ in manifest.items()
+                if is_under_prefix(forma_path, prefix) and forma_path not in site
+            ]
+            self._delete_meshes(usd_path, layer, deleted)
+
+        if deleted or manifest.dirty:
+            self._save_layer(usd_path, layer, autosave)
+
+        return {"ok": True, "upload": upload, "deleted": deleted}
+
+    def _delete_meshes(self, usd_path: str, layer: Sdf.Layer, forma_paths: list) -> int:
+        """Remove the meshes of Forma elements from the layer in a single change block
+
+        Returns:
+            int: The number of prims removed, elements that are not in the layer are skipped
+        """
+        manifest = self._manifests.open(usd_path, layer)
+        removed = 0
+        with Sdf.ChangeBlock():
+            for forma_path in forma_paths:
+                prim_path = manifest.find_prim_path(forma_path, get_prim_path(forma_path))
+                _release_prototype(layer, manifest, manifest.remove(forma_path))
+                if prim_path is None:
+                    continue
+                _drop_payload(usd_path, layer, prim_path)
+                if forma_mesh.remove_prim_spec(layer, prim_path):
+                    removed += 1
+        if removed:
+            get_metrics().increment("meshes_deleted", removed)
+        return removed
+
+    def _open_layer(self, usd_path: str) -> Sdf.Layer:
+        """Get the layer to write to for a resolved usd_path, created when missing, with Z as the up axis"""
+        # Layers are kept open between requests, so a sync does not reopen the same file for every element
+        layer = self._stage_router.open_layer(usd_path)
+
+        if layer.pseudoRoot.GetInfo(UsdGeom.Tokens.upAxis) != UsdGeom.Tokens.z:
+            layer.pseudoRoot.SetInfo(UsdGeom.Tokens.upAxis, UsdGeom.Tokens.z)
+
+        return layer
+
+    def _save_layer(self, usd_path: str, layer: Sdf.Layer, autosave: bool):
+        """Save the layer now when autosave is on, otherwise leave it to the deferred saver
+
+        The manifest is written to the layer right before it is saved, not on every change.
+        """
+        write_manifest = functools.partial(self._manifests.write, usd_path, layer)
+        if autosave:
+            self._stage_saver.save(usd_path, layer, write_manifest)
+        else:
+            self._stage_saver.mark_dirty(usd_path, layer, write_manifest)
+
+    def _author_mesh(
+        self,
+        usd_path: str,
+        layer: Sdf.Layer,
+        prim_path: str,
+        mesh_data: forma_mesh.MeshData,
+        authoring: forma_mesh.AuthoringOptions,
+    ) -> Sdf.PrimSpec:
+        """Write a mesh into the layer, straight as Sdf specs, through UsdGeom on the composed stage,
+        or to its own file referenced as a payload. Meshes moved by center_mesh are written as instances.
+        """
+        if mesh_data.translation is not None:
+            _drop_payload(usd_path, layer, prim_path)
+            with Sdf.ChangeBlock():
+                return self._author_instance(usd_path, layer, prim_path, mesh_data)
+
+        # The payload files are next to usd_path, a stage that was never saved keeps its meshes
+        if authoring.payload_layout and usd_path:
+            asset_path = _write_payload_layer(usd_path, prim_path, mesh_data)
+            with Sdf.ChangeBlock():
+                return forma_mesh.author_payload_spec(layer, prim_path, asset_path, mesh_data.extent)
+
+        _drop_payload(usd_path, layer, prim_path)
+        # A cached mesh is copied as Sdf specs, also without Sdf authoring, there is nothing to convert.
+        # The LOD variant set is only written with the Sdf API.
+        if authoring.sdf_authoring or isinstance(mesh_data, CachedMesh) or mesh_data.lods:
+            with Sdf.ChangeBlock():
+                return _author_mesh_spec(layer, prim_path, mesh_data)
+
+        # The UsdGeom path composes the stage, for schema features the Sdf path doesn't cover
+        prim_spec = layer.GetPrimAtPath(prim_path)
+        if prim_spec:
+            forma_mesh.clear_instance(prim_spec)
+            forma_mesh.clear_lods(prim_spec)
+        stage = self._stage_router.open(usd_path)
+        with Usd.EditContext(stage, layer):
+            forma_mesh.author_mesh(stage, prim_path, mesh_data)
+        return layer.GetPrimAtPath(prim_path)
+
+    def _author_meshes(
+        self, usd_path: str, layer: Sdf.Layer, meshes: list, authoring: forma_mesh.AuthoringOptions, signature: str
+    ):
+        """Write the (prim_path, mesh_data, content_hash) meshes of a batch into the layer"""
+        # Author every mesh in a single change block, so a stage on the layer only recomposes once
+        if authoring.payload_layout and usd_path:
+            # Every mesh gets its own file first, the payloads are then added in a single change block
+            asset_paths = [
+                _write_payload_layer(usd_path, prim_path, mesh_data) for prim_path, mesh_data, _ in meshes
+            ]
+            with Sdf.ChangeBlock():
+                for (prim_path, mesh_data, content_hash), asset_path in zip(meshes, asset_paths):
+                    prim_spec = forma_mesh.author_payload_spec(layer, prim_path, asset_path, mesh_data.extent)
+                    _set_content_hash(prim_spec, content_hash, signature)
+        elif authoring.sdf_authoring:
+            for prim_path, _, _ in meshes:
+                _drop_payload(usd_path, layer, prim_path)
+            with Sdf.ChangeBlock():
+                for prim_path, mesh_data, content_hash in meshes:
+                    if mesh_data.translation is not None:
+                        prim_spec = self._author_instance(usd_path, layer, prim_path, mesh_data)
+                    else:
+                        prim_spec = _author_mesh_spec(layer, prim_path, mesh_data)
+                    _set_content_hash(prim_spec, content_hash, signature)
+        else:
+            for prim_path, mesh_data, content_hash in meshes:
+                prim_spec = self._author_mesh(usd_path, layer, prim_path, mesh_data, authoring)
+                _set_content_hash(prim_spec, content_hash, signature)
+
+    def _author_instance(
+        self, usd_path: str, layer: Sdf.Layer, prim_path: str, mesh_data: forma_mesh.MeshData
+    ) -> Sdf.PrimSpec:
+        """Write a mesh moved by center_mesh as an instance of the prototype with the same geometry,
+        writing the prototype first when there is none yet
+        """
+        manifest = self._manifests.open(usd_path, layer)
+        prototype_path = next(
+            (
+                path
+                for path in manifest.prototypes(mesh_data.geometry_key)
+                if forma_mesh.matches_prototype(layer, path, mesh_data)
+            ),
+            None,
+        )
+        if prototype_path is None:
+            prototype_path = manifest.add_prototype(mesh_data.geometry_key)
+            forma_mesh.author_prototype_spec(layer, prototype_path, mesh_data)
+            get_metrics().increment("prototypes_created")
+        return forma_mesh.author_instance_spec(layer, prim_path, prototype_path, mesh_data.translation)
+
+    async def _convert(
+        self, payload, content_hash: str, compact: bool, options: forma_mesh.ConversionOptions, center: bool
+    ):
+        """Convert a payload in the worker pool, or find the converted mesh in the crate cache
+
+        Returns:
+            MeshData, or CachedMesh on a cache hit. Instanced meshes are not cached, they need their points
+            to be matched with the prototypes.
+
+        Raises:
+            ValueError: A compact payload is malformed
+        """
+        if self._crate_cache is None or center:
+            return await self._run_in_worker(convert_payload, payload, compact, options, center)
+
+        key = get_cache_key(content_hash, compact, options)
+        with get_metrics().span("cache"):
+            cached = self._crate_cache.get(key)
+        if cached is not None:
+            return cached
+        return await self._run_in_worker(_convert_and_cache, self._crate_cache, key, payload, compact, options)
+
+    def _trim_crate_cache(self):
+        if self._crate_cache is not None:
+            self._crate_cache.trim()
+
+    async def _run_in_worker(self, fn, *args):
+        """Run CPU-bound work in the worker pool, so it doesn't block the Kit main loop
+
+        Without a worker pool, the work runs inline.
+        """
+        if self._worker_pool is None:
+            return fn(*args)
+        profiler = current_profiler()
+        if profiler is not None:
+            fn = profiler.wrap(fn)
+        return await asyncio.get_event_loop().run_in_executor(self._worker_pool, functools.partial(fn, *args))
+
+
+def get_prim_path(forma_path: str) -> str:
+    """The default path of the prim holding the mesh of a Forma element, see StageManifest.prim_path_for"""
+    return f"/World/_{forma_path.split('/')[-1]}"
+
+
+def is_under_prefix(forma_path: str, prefix: str) -> bool:
+    """Check if a Forma path is prefix itself or below it, comparing whole path segments
+
+    "proj/building1" is under "proj/building1" and "proj/building1/", but "proj/building10" is not.
+    """
+    return forma_path == prefix or forma_path.startswith(prefix.rstrip("/") + "/")
+
+
+def convert_payload(
+    payload, compact: bool, options: forma_mesh.ConversionOptions, center: bool = False
+) -> forma_mesh.MeshData:
+    """Decode and prepare an uploaded mesh, this runs in the worker pool
+
+    A centered mesh is moved to the origin, to be written as an instance at its translation.
+
+    Raises:
+        ValueError: A compact payload is malformed
+    """
+    with get_metrics().span("decode"):
+        if compact:
+            mesh_data = forma_wire_format.decode_mesh(payload)
+        else:
+            mesh_data = forma_mesh.triangle_soup_to_mesh(payload)
+
+    with get_metrics().span("convert"):
+        mesh_data = forma_mesh.prepare_mesh(mesh_data, options)
+        if center:
+            mesh_data = forma_mesh.center_mesh(mesh_data)
+        return mesh_data
+
+
+def _convert_and_cache(
+    crate_cache: CrateCache, key: str, payload, compact: bool, options: forma_mesh.ConversionOptions
+) -> forma_mesh.MeshData:
+    """Convert a payload and write the converted mesh to the crate cache, this runs in the worker pool"""
+    mesh_data = convert_payload(payload, compact, options)
+    with get_metrics().span("cache"):
+        crate_cache.put(key, mesh_data)
+    return mesh_data
+
+
+def _author_mesh_spec(layer: Sdf.Layer, prim_path: str, mesh_data) -> Sdf.PrimSpec:
+    """Write a converted mesh as Sdf specs, copying the specs of a cached mesh"""
+    if isinstance(mesh_data, CachedMesh):
+        return forma_mesh.copy_mesh_spec(mesh_data.layer, mesh_data.mesh_path, layer, prim_path)
+    return forma_mesh.author_mesh_spec(layer, prim_path, mesh_data)
+
+
+def _uses_instancing(usd_path: str, authoring: forma_mesh.AuthoringOptions) -> bool:
+    """Instances are written with Sdf authoring, and not in the payload layout"""
+    return authoring.instancing and authoring.sdf_authoring and not (authoring.payload_layout and usd_path)
+
+
+def _count_imported(mesh_data: forma_mesh.MeshData):
+    metrics = get_metrics()
+    metrics.increment("meshes_imported")
+    metrics.increment("vertices_imported", mesh_data.vertex_count)
+    metrics.increment("faces_imported", mesh_data.face_count)
+
+
+def _is_unchanged(layer: Sdf.Layer, prim_path: str, content_hash: str, conversion: str) -> bool:
+    """Check if the prim was imported from the same payload with the same settings"""
+    prim_spec = layer.GetPrimAtPath(prim_path)
+    if not prim_spec:
+        return False
+    custom_data = prim_spec.customData
+    return (
+        custom_data.get(forma_constants.CustomData.CONTENT_HASH) == content_hash
+        and custom_data.get(forma_constants.CustomData.CONVERSION) == conversion
+    )
+
+
+def _add_to_manifest(manifest: StageManifest, layer: Sdf.Layer, forma_path: str, prim_path: str, content_hash: str):
+    """Record an unchanged mesh imported before the stage had a manifest"""
+    if forma_path in manifest:
+        return
+    # The vertex count of a mesh in the payload layout is in its own file, it is left out
+    points = layer.GetAttributeAtPath(Sdf.Path(prim_path).AppendProperty(UsdGeom.Tokens.points))
+    vertices = points.default if points else None
+    manifest.update(forma_path, prim_path, content_hash, len(vertices) if vertices is not None else 0)
+
+
+def _record_import(
+    layer: Sdf.Layer,
+    manifest: StageManifest,
+    forma_path: str,
+    prim_path: str,
+    content_hash: str,
+    mesh_data: forma_mesh.MeshData,
+):
+    """Record an imported mesh in the manifest, with the prototype of an instance
+
+    Returns:
+        ManifestEntry: The entry it replaces, to release its prototype with `_release_prototype`
+    """
+    prim_spec = layer.GetPrimAtPath(prim_path)
+    references = prim_spec.referenceList.prependedItems if prim_spec.instanceable else []
+    prototype_path = str(references[0].primPath) if references else ""
+    return manifest.update(forma_path, prim_path, content_hash, mesh_data.vertex_count, prototype_path)
+
+
+def _release_prototype(layer: Sdf.Layer, manifest: StageManifest, entry):
+    """Remove the prototype of a replaced or deleted instance, once no element uses it"""
+    if entry is None or not entry.prototype or manifest.prototype_users(entry.prototype) > 0:
+        return
+    manifest.remove_prototype(entry.prototype)
+    forma_mesh.remove_prim_spec(layer, entry.prototype)
+
+
+def _set_content_hash(prim_spec: Sdf.PrimSpec, content_hash: str, conversion: str):
+    prim_spec.SetInfoDictionaryValue("customData", forma_constants.CustomData.CONTENT_HASH, content_hash)
+    prim_spec.SetInfoDictionaryValue("customData", forma_constants.CustomData.CONVERSION, conversion)
+
+
+def _get_payload_paths(usd_path: str, prim_path: str):
+    """The asset path relative to usd_path, and the full path, of the file holding a mesh in the payload layout"""
+    name = Sdf.Path(prim_path).name
+    # usd_path is normalized, with forward slashes
+    root = os.path.splitext(usd_path)[0]
+    folder = f"{root.split('/')[-1]}_payloads"
+    return f"./{folder}/{name}.usdc", f"{root}_payloads/{name}.usdc"
+
+
+def _write_payload_layer(usd_path: str, prim_path: str, mesh_data: forma_mesh.MeshData) -> str:
+    """Write a mesh to its own file for the payload layout, replacing the previous version
+
+    Returns:
+        str: The asset path to add as payload to the prim in the usd_path layer
+    """
+    asset_path, payload_path = _get_payload_paths(usd_path, prim_path)
+    name = Sdf.Path(prim_path).name
+
+    # A cached mesh already is a payload layer, it is copied, and reloaded when a stage loaded the payload
+    if isinstance(mesh_data, CachedMesh):
+        result = omni.client.copy(mesh_data.path, payload_path, behavior=omni.client.CopyBehavior.OVERWRITE)
+        if result != omni.client.Result.OK:
+            raise RuntimeError(f"Failed to copy {mesh_data.path} to {payload_path}: {result}")
+        payload_layer = Sdf.Layer.Find(payload_path)
+        if payload_layer:
+            payload_layer.Reload(force=True)
+        return asset_path
+
+    # The layer is edited in place when it is open, so a stage that loaded the payload sees the new mesh
+    payload_layer = Sdf.Layer.FindOrOpen(payload_path) or Sdf.Layer.CreateNew(payload_path)
+    with Sdf.ChangeBlock():
+        forma_mesh.author_payload_layer(payload_layer, name, mesh_data)
+    payload_layer.Save()
+
+    return asset_path
+
+
+def _drop_payload(usd_path: str, layer: Sdf.Layer, prim_path: str):
+    """Remove the payload of a prim written in the payload layout, and delete its file"""
+    prim_spec = layer.GetPrimAtPath(prim_path)
+    if not usd_path or not prim_spec or not prim_spec.hasPayloads:
+        return
+
+    asset_path, payload_path = _get_payload_paths(usd_path, prim_path)
+    if any(payload.assetPath == asset_path for payload in prim_spec.payloadList.prependedItems):
+        result = omni.client.delete(payload_path)
+        if result in (omni.client.Result.OK, omni.client.Result.ERROR_NOT_FOUND):
+            mark_file_deleted(payload_path)
+        else:
+            carb.log_warn(f"Failed to delete {payload_path}: {result}")
+    forma_mesh.clear_payload(prim_spec)
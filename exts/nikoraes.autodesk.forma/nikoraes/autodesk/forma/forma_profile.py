@@ -0,0 +1,128 @@
+import contextvars
+import cProfile
+import io
+import os
+import pstats
+import tempfile
+import threading
+import time
+import uuid
+
+import carb
+
+# Default folder of the profiles, when the profileFolder setting is empty
+DEFAULT_FOLDER = os.path.join(tempfile.gettempdir(), "forma_profiles")
+
+# The profiler of the request being handled, to profile its work in the worker pool threads as well
+_current_profiler = contextvars.ContextVar("forma_profiler", default=None)
+
+# cProfile profiles the whole Kit main thread, so only one request is profiled at a time
+_active_lock = threading.Lock()
+
+
+def current_profiler():
+    """The profiler of the request being handled, None when it isn't profiled"""
+    return _current_profiler.get()
+
+
+class RequestProfiler:
+    """Profiles one request with cProfile, writing a .prof file and a summary of the hot functions
+
+    Used as a context manager around the handler. Everything running on the Kit main thread in the meantime
+    is profiled, work handed to the worker pool is profiled per call and merged in the same profile.
+    Open a .prof file with `python -m pstats` or snakeviz.
+    """
+
+    def __init__(self, name: str, folder: str = "", top_functions: int = 30) -> None:
+        self.name = name
+        self.folder = folder or DEFAULT_FOLDER
+        self.top_functions = top_functions
+        self.path = None
+        self._profile = cProfile.Profile()
+        self._worker_profiles = []
+        self._worker_lock = threading.Lock()
+        self._active = False
+        self._token = None
+        self._start = 0.0
+
+    def __enter__(self):
+        # A request arriving while another one is profiled runs as usual
+        self._active = _active_lock.acquire(blocking=False)
+        if not self._active:
+            carb.log_warn(f"Another request is being profiled, {self.name} runs without profiling")
+            return self
+
+        self._token = _current_profiler.set(self)
+        self._start = time.perf_counter()
+        self._profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if not self._active:
+            return False
+
+        self._profile.disable()
+        seconds = time.perf_counter() - self._start
+        _current_profiler.reset(self._token)
+        try:
+            self.path = self.save(seconds)
+            carb.log_info(f"Profile of {self.name} written to {self.path}")
+        except OSError as e:
+            carb.log_error(f"Failed to write the profile of {self.name}: {e}")
+        finally:
+            _active_lock.release()
+        return False
+
+    def bind(self, work):
+        """Make this the current profiler while the work runs, for work awaited in another task"""
+
+        async def run():
+            token = _current_profiler.set(self)
+            try:
+                return await work()
+            finally:
+                _current_profiler.reset(token)
+
+        return run
+
+    def wrap(self, fn):
+        """Profile a function called in a worker pool thread"""
+
+        def run(*args, **kwargs):
+            profile = cProfile.Profile()
+            profile.enable()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                profile.disable()
+                with self._worker_lock:
+                    self._worker_profiles.append(profile)
+
+        return run
+
+    def stats(self) -> pstats.Stats:
+        """The profile of the main thread, merged with the worker pool calls"""
+        stats = pstats.Stats(self._profile)
+        with self._worker_lock:
+            for profile in self._worker_profiles:
+                stats.add(profile)
+        return stats
+
+    def save(self, seconds: float) -> str:
+        """Write <name>.prof and a <name>.txt summary of the hot functions, returning the .prof path"""
+        os.makedirs(self.folder, exist_ok=True)
+        base = os.path.join(self.folder, f"{self.name}_{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}")
+
+        stats = self.stats()
+        stats.dump_stats(base + ".prof")
+
+        summary = io.StringIO()
+        summary.write(f"{self.name}: {seconds * 1000:.1f} ms wall time, {len(self._worker_profiles)} worker calls\n")
+        stats.stream = summary
+        for sort, label in ((pstats.SortKey.CUMULATIVE, "cumulative"), (pstats.SortKey.TIME, "own")):
+            summary.write(f"\nTop {self.top_functions} functions by {label} time\n")
+            stats.sort_stats(sort).print_stats(self.top_functions)
+        with open(base + ".txt", "w") as f:
+            f.write(summary.getvalue())
+
+        return base + ".prof"
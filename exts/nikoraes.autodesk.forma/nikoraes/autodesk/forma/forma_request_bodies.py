@@ -12,7 +12,8 @@ class FormaRequestBody(pydantic.BaseModel):
     """Data model for the callbacks to adhere to"""
 
     protocol_version: str = pydantic.Field(
-        g_forma_protocol_version, title="Protocol version"
+        g_forma_protocol_version,
+        title="Protocol version, 2.0 and later send compact mesh payloads",
     )
     extension_version: str = pydantic.Field("0.0", title="Extension version")
     forma_path: str = pydantic.Field("", title="Forma Path")
@@ -20,6 +21,7 @@ class FormaRequestBody(pydantic.BaseModel):
         "", title="Nucleus folder where resulting USD will be saved"
     )  # default value received from connector should be omniverse://localhost/Projects/Forma
     autosave_stage: bool = pydantic.Field(True, title="Autosave Stage")
+    profile: bool = pydantic.Field(False, title="Profile this request, see the profileFolder setting")
 
     def __str__(self) -> str:
         return (
@@ -30,6 +32,52 @@ class FormaRequestBody(pydantic.BaseModel):
         )
 
 
+class FormaBatchElement(pydantic.BaseModel):
+    """One mesh of a batch import, as a byte range of the uploaded buffer"""
+
+    forma_path: str = pydantic.Field(..., title="Forma Path")
+    offset: int = pydantic.Field(0, ge=0, title="Byte offset of the mesh in the buffer")
+    length: int = pydantic.Field(..., gt=0, title="Byte length of the mesh in the buffer")
+
+
+class FormaBatchManifest(pydantic.BaseModel):
+    """Data model for the manifest of a batch import"""
+
+    elements: List[FormaBatchElement] = pydantic.Field(
+        ..., title="The meshes in the uploaded buffer"
+    )
+
+
+class FormaDeleteRequestBody(FormaRequestBody):
+    """Data model to delete one element, a list of elements or every element under a Forma path"""
+
+    forma_paths: List[str] = pydantic.Field([], title="Forma Paths, deleted along with forma_path")
+    prefix: str = pydantic.Field("", title="Delete every element under this Forma path")
+
+
+class FormaSyncElement(pydantic.BaseModel):
+    """An element of the Forma site, with the hash of the mesh it would upload"""
+
+    forma_path: str = pydantic.Field(..., title="Forma Path")
+    content_hash: str = pydantic.Field(
+        ..., title="BLAKE2b hash with a 16 byte digest, in hex, of the uploaded mesh file"
+    )
+
+
+class FormaSyncRequestBody(FormaRequestBody):
+    """Data model to negotiate a sync, listing every element of the Forma site"""
+
+    elements: List[FormaSyncElement] = pydantic.Field(
+        [], title="The elements of the Forma site"
+    )
+    prefix: str = pydantic.Field(
+        "", title="Only elements of the stage under this Forma path are deleted when missing from the site"
+    )
+    delete_stale: bool = pydantic.Field(
+        False, title="Delete the elements of the stage under prefix missing from the site, requires a prefix"
+    )
+
+
 class FormaResponseBody(pydantic.BaseModel):
     """Data model for the callbacks to adhere to"""
 
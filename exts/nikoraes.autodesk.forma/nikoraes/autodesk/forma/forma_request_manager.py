@@ -0,0 +1,151 @@
+import asyncio
+import contextvars
+from collections import deque
+from typing import Awaitable, Callable
+
+IMPORT = "import"
+DELETE = "delete"
+BATCH = "batch"
+SYNC = "sync"
+FLUSH = "flush"
+
+SUPERSEDED_RESULT = {"ok": True, "superseded": True}
+
+
+class QueueFullError(Exception):
+    """Raised when a request is submitted while the queue is full"""
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(f"Too many pending requests, retry after {retry_after} seconds")
+        self.retry_after = retry_after
+
+
+class _Operation(object):
+    def __init__(self, kind: str, forma_path: str, work: Callable[[], Awaitable]) -> None:
+        self.kind = kind
+        self.forma_path = forma_path
+        self.work = work
+        self.future = asyncio.get_event_loop().create_future()
+
+
+class RequestManager:
+    """Runs the requests of each usd_path one at a time, in order, with a bound on the pending requests
+
+    Pending requests for the same forma_path are coalesced: a newer import or delete replaces a pending import,
+    and a newer delete replaces a pending delete. The replaced request completes with `SUPERSEDED_RESULT`.
+    A delete that replaces an import still runs, since an earlier version of the mesh may be on the stage.
+    """
+
+    def __init__(
+        self,
+        max_pending: int,
+        retry_after: float,
+        on_busy: Callable[[], None] = None,
+        on_idle: Callable[[], None] = None,
+    ) -> None:
+        self.max_pending = max_pending
+        self.retry_after = retry_after
+        self._on_busy = on_busy
+        self._on_idle = on_idle
+
+        self._lanes = {}
+        self._tasks = {}
+        self._pending = 0
+        self._running = 0
+
+        self.completed = 0
+        self.superseded = 0
+        self.rejected = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    @property
+    def busy(self) -> bool:
+        return self._pending + self._running > 0
+
+    async def submit(self, usd_path: str, kind: str, forma_path: str, work: Callable[[], Awaitable]):
+        """Queue work for usd_path and wait for its result
+
+        Args:
+            usd_path (str): Requests with the same usd_path run one at a time, in order
+            kind (str): IMPORT, DELETE, BATCH, SYNC or FLUSH
+            forma_path (str): The element the request is about, None for requests that are never coalesced
+            work (Callable[[], Awaitable]): Called when it is the request's turn, its result is returned
+
+        Raises:
+            QueueFullError: max_pending requests are already waiting
+        """
+        lane = self._lanes.get(usd_path)
+        if lane is not None and forma_path:
+            for operation in [op for op in lane if op.forma_path == forma_path]:
+                if operation.kind == IMPORT or operation.kind == kind == DELETE:
+                    lane.remove(operation)
+                    self._pending -= 1
+                    self.superseded += 1
+                    operation.future.set_result(SUPERSEDED_RESULT)
+
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            raise QueueFullError(self.retry_after)
+
+        was_busy = self.busy
+        operation = _Operation(kind, forma_path, work)
+        self._lanes.setdefault(usd_path, deque()).append(operation)
+        self._pending += 1
+        if not was_busy and self._on_busy is not None:
+            self._on_busy()
+
+        if usd_path not in self._tasks:
+            # The lane outlives this request, so it must not inherit its context, e.g. its profiler
+            self._tasks[usd_path] = contextvars.Context().run(asyncio.ensure_future, self._run_lane(usd_path))
+
+        return await operation.future
+
+    def stats(self) -> dict:
+        return {
+            "pending": self._pending,
+            "running": self._running,
+            "completed": self.completed,
+            "superseded": self.superseded,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self):
+        """Cancel the pending requests and stop the lanes"""
+        for lane in self._lanes.values():
+            for operation in lane:
+                operation.future.cancel()
+            lane.clear()
+        for task in self._tasks.values():
+            task.cancel()
+        self._lanes.clear()
+        self._tasks.clear()
+        self._pending = 0
+
+    async def _run_lane(self, usd_path: str):
+        lane = self._lanes[usd_path]
+        try:
+            while lane:
+                operation = lane.popleft()
+                self._pending -= 1
+                self._running += 1
+                try:
+                    result = await operation.work()
+                except Exception as e:
+                    if not operation.future.done():
+                        operation.future.set_exception(e)
+                else:
+                    if not operation.future.done():
+                        operation.future.set_result(result)
+                finally:
+                    self._running -= 1
+                    self.completed += 1
+
+                if not self.busy and self._on_idle is not None:
+                    self._on_idle()
+        finally:
+            self._tasks.pop(usd_path, None)
+            if not lane:
+                self._lanes.pop(usd_path, None)
@@ -0,0 +1,88 @@
+import asyncio
+from typing import Callable, List
+
+import carb
+from pxr import Sdf
+
+from .forma_metrics import get_metrics
+
+
+class _PendingSave(object):
+    def __init__(self, layer: Sdf.Layer, first_dirty: float) -> None:
+        self.layer = layer
+        self.first_dirty = first_dirty
+        self.handle = None
+        self.before_save = None
+
+
+class DeferredSaver:
+    """Saves layers once they have been quiet for a while, instead of after every request
+
+    A layer marked dirty is saved `quiet_period` seconds after its last change, and at the latest
+    `max_delay` seconds after its first unsaved change, so a long burst of requests still gets saved.
+    """
+
+    def __init__(self, quiet_period: float, max_delay: float, on_saved: Callable[[str], None] = None) -> None:
+        self.quiet_period = quiet_period
+        self.max_delay = max_delay
+        self._on_saved = on_saved
+        self._pending = {}
+
+    def save(self, usd_path: str, layer: Sdf.Layer, before_save: Callable[[], None] = None):
+        """Save the layer now, dropping any deferred save of it
+
+        before_save is called right before the layer is saved, e.g. to write data kept in memory into the layer.
+        """
+        pending = self._pending.pop(usd_path, None)
+        if pending is not None:
+            pending.handle.cancel()
+        self._save(usd_path, layer, before_save)
+
+    def mark_dirty(self, usd_path: str, layer: Sdf.Layer, before_save: Callable[[], None] = None):
+        """Schedule a deferred save of the layer, calling before_save right before it is saved"""
+        loop = asyncio.get_event_loop()
+        now = loop.time()
+
+        pending = self._pending.get(usd_path)
+        if pending is None:
+            pending = _PendingSave(layer, now)
+            self._pending[usd_path] = pending
+        else:
+            pending.handle.cancel()
+            pending.layer = layer
+        pending.before_save = before_save
+
+        delay = min(self.quiet_period, max(0.0, pending.first_dirty + self.max_delay - now))
+        pending.handle = loop.call_later(delay, self.flush, usd_path)
+
+    def is_dirty(self, usd_path: str) -> bool:
+        return usd_path in self._pending
+
+    def flush(self, usd_path: str = None) -> List[str]:
+        """Save the pending layer of usd_path, or every pending layer when no path is given
+
+        Returns:
+            List[str]: The paths that were saved
+        """
+        usd_paths = list(self._pending) if usd_path is None else [usd_path]
+
+        saved = []
+        for path in usd_paths:
+            pending = self._pending.pop(path, None)
+            if pending is None:
+                continue
+            pending.handle.cancel()
+            try:
+                self._save(path, pending.layer, pending.before_save)
+                saved.append(path)
+            except Exception as e:
+                carb.log_error(f"Failed to save {path}: {e}")
+        return saved
+
+    def _save(self, usd_path: str, layer: Sdf.Layer, before_save: Callable[[], None] = None):
+        with get_metrics().span("save"):
+            if before_save is not None:
+                before_save()
+            layer.Save()
+        if self._on_saved is not None:
+            self._on_saved(usd_path)
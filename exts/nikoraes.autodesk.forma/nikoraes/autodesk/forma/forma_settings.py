@@ -10,11 +10,220 @@ class FormaSettings:
         self._settings = carb.settings.get_settings()
         self._settingsPath = "/persistent/exts/nikoraes.autodesk.importer/"
 
+        self._settings.set_default_bool(self.weld_vertices_path, False)
+        self._settings.set_default_float(self.weld_tolerance_path, 0.0)
+        self._settings.set_default_string(self.normals_path, "none")
+        self._settings.set_default_int(self.upload_chunk_size_path, 4 * 1024 * 1024)
+        self._settings.set_default_int(self.upload_spool_threshold_path, 256 * 1024 * 1024)
+        self._settings.set_default_int(self.stage_cache_size_path, 8)
+        self._settings.set_default_float(self.stage_cache_idle_timeout_path, 300.0)
+        self._settings.set_default_float(self.listing_cache_ttl_path, 30.0)
+        self._settings.set_default_float(self.save_quiet_period_path, 2.0)
+        self._settings.set_default_float(self.save_max_delay_path, 10.0)
+        self._settings.set_default_int(self.worker_count_path, 2)
+        self._settings.set_default_int(self.request_queue_size_path, 256)
+        self._settings.set_default_float(self.request_retry_after_path, 1.0)
+        self._settings.set_default_bool(self.sdf_authoring_path, True)
+        self._settings.set_default_string(self.mesh_layout_path, "monolithic")
+        self._settings.set_default_bool(self.instancing_path, False)
+        self._settings.set_default_bool(self.lods_path, False)
+        self._settings.set_default_string(self.lod_budgets_path, "50000,10000,2000")
+        self._settings.set_default_bool(self.crate_cache_path, False)
+        self._settings.set_default_string(self.crate_cache_folder_path, "")
+        self._settings.set_default_int(self.crate_cache_size_path, 1024 * 1024 * 1024)
+        self._settings.set_default_bool(self.show_metrics_path, False)
+        self._settings.set_default_bool(self.profile_requests_path, False)
+        self._settings.set_default_string(self.profile_folder_path, "")
+        self._settings.set_default_int(self.profile_top_functions_path, 30)
+        self._settings.set_default_float(self.file_browser_timeout_path, 300.0)
+
+    @property
+    def weld_vertices_path(self) -> str:
+        return self._settingsPath + "weldVertices"
+
+    @property
+    def weld_tolerance_path(self) -> str:
+        return self._settingsPath + "weldTolerance"
+
+    @property
+    def normals_path(self) -> str:
+        return self._settingsPath + "normals"
+
+    @property
+    def upload_chunk_size_path(self) -> str:
+        return self._settingsPath + "uploadChunkSize"
+
+    @property
+    def upload_spool_threshold_path(self) -> str:
+        return self._settingsPath + "uploadSpoolThreshold"
+
+    @property
+    def stage_cache_size_path(self) -> str:
+        return self._settingsPath + "stageCacheSize"
+
+    @property
+    def stage_cache_idle_timeout_path(self) -> str:
+        return self._settingsPath + "stageCacheIdleTimeout"
+
+    @property
+    def listing_cache_ttl_path(self) -> str:
+        return self._settingsPath + "listingCacheTtl"
+
+    @property
+    def save_quiet_period_path(self) -> str:
+        return self._settingsPath + "saveQuietPeriod"
+
+    @property
+    def save_max_delay_path(self) -> str:
+        return self._settingsPath + "saveMaxDelay"
+
+    @property
+    def worker_count_path(self) -> str:
+        return self._settingsPath + "workerCount"
+
+    @property
+    def request_queue_size_path(self) -> str:
+        return self._settingsPath + "requestQueueSize"
+
+    @property
+    def request_retry_after_path(self) -> str:
+        return self._settingsPath + "requestRetryAfter"
+
+    @property
+    def sdf_authoring_path(self) -> str:
+        return self._settingsPath + "sdfAuthoring"
+
+    @property
+    def mesh_layout_path(self) -> str:
+        return self._settingsPath + "meshLayout"
+
+    @property
+    def instancing_path(self) -> str:
+        return self._settingsPath + "instancing"
+
+    @property
+    def lods_path(self) -> str:
+        return self._settingsPath + "lods"
+
+    @property
+    def lod_budgets_path(self) -> str:
+        return self._settingsPath + "lodBudgets"
+
+    @property
+    def crate_cache_path(self) -> str:
+        return self._settingsPath + "crateCache"
+
+    @property
+    def crate_cache_folder_path(self) -> str:
+        return self._settingsPath + "crateCacheFolder"
+
+    @property
+    def crate_cache_size_path(self) -> str:
+        return self._settingsPath + "crateCacheSize"
+
+    @property
+    def show_metrics_path(self) -> str:
+        return self._settingsPath + "showMetrics"
+
+    @property
+    def profile_requests_path(self) -> str:
+        return self._settingsPath + "profileRequests"
+
+    @property
+    def profile_folder_path(self) -> str:
+        return self._settingsPath + "profileFolder"
+
+    @property
+    def profile_top_functions_path(self) -> str:
+        return self._settingsPath + "profileTopFunctions"
+
+    @property
+    def file_browser_timeout_path(self) -> str:
+        return self._settingsPath + "fileBrowserTimeout"
+
     def get_kit_services_transport_port(self) -> int:
         return self._settings.get_as_int("exts/omni.services.transport.server.http/port")
 
+    def get_weld_vertices(self) -> bool:
+        return self._settings.get_as_bool(self.weld_vertices_path)
+
+    def get_weld_tolerance(self) -> float:
+        return self._settings.get_as_float(self.weld_tolerance_path)
+
+    def get_normals(self) -> str:
+        return self._settings.get_as_string(self.normals_path)
+
+    def get_upload_chunk_size(self) -> int:
+        return self._settings.get_as_int(self.upload_chunk_size_path)
+
+    def get_upload_spool_threshold(self) -> int:
+        return self._settings.get_as_int(self.upload_spool_threshold_path)
+
+    def get_stage_cache_size(self) -> int:
+        return self._settings.get_as_int(self.stage_cache_size_path)
+
+    def get_stage_cache_idle_timeout(self) -> float:
+        return self._settings.get_as_float(self.stage_cache_idle_timeout_path)
+
+    def get_listing_cache_ttl(self) -> float:
+        return self._settings.get_as_float(self.listing_cache_ttl_path)
+
+    def get_save_quiet_period(self) -> float:
+        return self._settings.get_as_float(self.save_quiet_period_path)
+
+    def get_save_max_delay(self) -> float:
+        return self._settings.get_as_float(self.save_max_delay_path)
+
+    def get_worker_count(self) -> int:
+        return self._settings.get_as_int(self.worker_count_path)
+
+    def get_request_queue_size(self) -> int:
+        return self._settings.get_as_int(self.request_queue_size_path)
+
+    def get_request_retry_after(self) -> float:
+        return self._settings.get_as_float(self.request_retry_after_path)
+
+    def get_sdf_authoring(self) -> bool:
+        return self._settings.get_as_bool(self.sdf_authoring_path)
+
+    def get_mesh_layout(self) -> str:
+        return self._settings.get_as_string(self.mesh_layout_path)
+
+    def get_instancing(self) -> bool:
+        return self._settings.get_as_bool(self.instancing_path)
+
+    def get_lods(self) -> bool:
+        return self._settings.get_as_bool(self.lods_path)
+
+    def get_lod_budgets(self) -> str:
+        return self._settings.get_as_string(self.lod_budgets_path)
+
+    def get_crate_cache(self) -> bool:
+        return self._settings.get_as_bool(self.crate_cache_path)
+
+    def get_crate_cache_folder(self) -> str:
+        return self._settings.get_as_string(self.crate_cache_folder_path)
+
+    def get_crate_cache_size(self) -> int:
+        return self._settings.get_as_int(self.crate_cache_size_path)
+
+    def get_show_metrics(self) -> bool:
+        return self._settings.get_as_bool(self.show_metrics_path)
+
+    def get_profile_requests(self) -> bool:
+        return self._settings.get_as_bool(self.profile_requests_path)
+
+    def get_profile_folder(self) -> str:
+        return self._settings.get_as_string(self.profile_folder_path)
+
+    def get_profile_top_functions(self) -> int:
+        return self._settings.get_as_int(self.profile_top_functions_path)
+
+    def get_file_browser_timeout(self) -> float:
+        return self._settings.get_as_float(self.file_browser_timeout_path)
+
     def get(self, path):
         return self._settings.get(path)
 
     def set(self, path, value):
-        return self._settings.set(path, value)
\ No newline at end of file
+        return self._settings.set(path, value)
@@ -2,6 +2,7 @@ import asyncio
 import omni.kit.ui
 import omni.ui as ui
 from omni.kit.widget.settings import create_setting_widget, SettingType
+from .forma_metrics import get_metrics
 from .forma_settings import FormaSettings
 from .file_picker_dialog import FilePickerDialogWrapper
 
@@ -32,6 +33,7 @@ class FormaSettingsWindow:
 
         self._busy_state_track = None
         self._busy_state_label = None
+        self._metrics_label = None
 
         self._ping_pong_rectangle = None
         self._spacer_left = None
@@ -41,6 +43,8 @@ class FormaSettingsWindow:
             with ui.CollapsableFrame("Forma Settings - v" + plugin_ver):
                 with ui.VStack(spacing=self.section_v_spacing):
                     self._build_settings()
+                    if self._settings.get_show_metrics():
+                        self._build_metrics()
 
         self._window.set_visibility_changed_fn(self._on_visibility_changed)
 
@@ -67,6 +71,7 @@ class FormaSettingsWindow:
         self._set_state_busy() if self._busy else self._set_state_idle()
 
     def _set_state_idle(self):
+        self._update_metrics()
         self._ping_pong_rectangle.visible = False
         self._busy_state_track.visible = True
         self._busy_state_label.text = "Idle..."
@@ -184,6 +189,53 @@ class FormaSettingsWindow:
         )
         ui.Line(name="Default", height=20, style={"color": ui.color("#454545")})
 
+        self._add_setting(
+            SettingType.BOOL,
+            "Weld Vertices",
+            self._settings.weld_vertices_path,
+            tooltip="Merge the shared corners of imported triangles into an indexed mesh",
+        )
+        self._add_setting(
+            SettingType.FLOAT,
+            "Weld Tolerance",
+            self._settings.weld_tolerance_path,
+            range_from=0,
+            range_to=1,
+            speed=0.001,
+            tooltip="Vertices closer than this distance are merged, 0 only merges identical positions",
+        )
+        self._add_setting(
+            SettingType.STRING,
+            "Normals",
+            self._settings.normals_path,
+            tooltip="Normals written with imported meshes: none, face, or vertex to smooth them over welded vertices",
+        )
+        self._add_setting(
+            SettingType.BOOL,
+            "Instancing",
+            self._settings.instancing_path,
+            tooltip="Write meshes with the same geometry once, as a prototype, and the elements as instances of it",
+        )
+        self._add_setting(
+            SettingType.BOOL,
+            "LODs",
+            self._settings.lods_path,
+            tooltip="Build decimated levels of detail of heavy meshes, in a LOD variant set with the coarsest selected",
+        )
+        self._add_setting(
+            SettingType.STRING,
+            "LOD Budgets",
+            self._settings.lod_budgets_path,
+            tooltip="Comma separated triangle budgets of the levels of detail, at most 4",
+        )
+        self._add_setting(
+            SettingType.BOOL,
+            "Crate Cache",
+            self._settings.crate_cache_path,
+            tooltip="Keep converted meshes on disk, so the same payload is copied instead of converted again",
+        )
+        ui.Line(name="Default", height=20, style={"color": ui.color("#454545")})
+
         with ui.ZStack(
             height=24,
             tooltip="Shows extension state to let you know when data is being updated and uploaded to Nucleus",
@@ -217,6 +269,20 @@ class FormaSettingsWindow:
 
         ui.Spacer()
 
+    def _build_metrics(self):
+        with ui.CollapsableFrame("Metrics", collapsed=True):
+            self._metrics_label = ui.Label(
+                get_metrics().summary(),
+                word_wrap=True,
+                alignment=ui.Alignment.LEFT_TOP,
+                style={"color": ui.color("#CCCCCC")},
+            )
+
+    def _update_metrics(self):
+        # Refreshed whenever the requests settle down, so it costs nothing while importing
+        if self._metrics_label is not None:
+            self._metrics_label.text = get_metrics().summary()
+
     def __del__(self):
         pass
 
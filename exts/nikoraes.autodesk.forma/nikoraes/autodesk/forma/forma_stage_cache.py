@@ -0,0 +1,159 @@
+import time
+from collections import OrderedDict
+
+import carb
+import omni.client
+from pxr import Sdf, Usd
+
+from .utils import invalidate_listing_cache, mark_file_created, mark_file_deleted, nucleus_file_exists
+
+
+class _CacheEntry(object):
+    def __init__(self, layer: Sdf.Layer, stamp) -> None:
+        self.layer = layer
+        self.stage = None
+        self.stamp = stamp
+        self.last_used = time.monotonic()
+
+
+class StageCache:
+    """Keeps the stages opened by the connector, keyed by usd_path, with LRU eviction
+
+    A cached stage is reloaded when its file changed on disk or on Nucleus since it was opened or last saved,
+    unless it has unsaved edits, which are kept and overwrite the outside change when saved. It is dropped when
+    it was not used for `idle_timeout` seconds. The root layer can be used on its own, the stage is only composed
+    the first time it is asked for.
+    """
+
+    def __init__(self, max_size: int, idle_timeout: float) -> None:
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self._entries = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.evictions = 0
+
+    def open(self, usd_path: str) -> Usd.Stage:
+        """Get the stage for usd_path, opening or creating it when it is not cached"""
+        entry = self._get_entry(usd_path)
+        if entry.stage is None:
+            entry.stage = Usd.Stage.Open(entry.layer)
+        return entry.stage
+
+    def open_layer(self, usd_path: str, create: bool = True) -> Sdf.Layer:
+        """Get the root layer of usd_path without composing a stage, opening it when it is not cached
+
+        A missing layer is created, or None is returned when create is False.
+        """
+        entry = self._get_entry(usd_path, create)
+        return entry.layer if entry is not None else None
+
+    def _get_entry(self, usd_path: str, create: bool = True) -> _CacheEntry:
+        if not usd_path:
+            raise ValueError("No usd_path was given and no stage is open in Kit")
+        self._evict_idle()
+
+        entry = self._entries.get(usd_path)
+        if entry is not None:
+            stamp = _file_stamp(usd_path)
+            if stamp is None:
+                # The file was deleted, start over with a new layer
+                del self._entries[usd_path]
+                mark_file_deleted(usd_path)
+            else:
+                if stamp != entry.stamp and entry.layer.dirty:
+                    # Reloading would discard edits waiting for a deferred save
+                    carb.log_warn(f"Stage {usd_path} changed outside of the connector while it has unsaved edits")
+                    entry.stamp = stamp
+                    self.hits += 1
+                elif stamp != entry.stamp:
+                    carb.log_info(f"Reloading changed stage {usd_path}")
+                    entry.layer.Reload()
+                    entry.stamp = stamp
+                    self.reloads += 1
+                else:
+                    self.hits += 1
+                entry.last_used = time.monotonic()
+                self._entries.move_to_end(usd_path)
+                return entry
+
+        layer = None
+        if nucleus_file_exists(usd_path):
+            # Open the existing layer
+            layer = Sdf.Layer.FindOrOpen(usd_path)
+            if layer is None:
+                if _file_stamp(usd_path) is not None:
+                    raise ValueError(f"Stage {usd_path} exists but could not be opened")
+                # The listing cache still knew a file that was deleted outside of the connector
+                mark_file_deleted(usd_path)
+
+        if layer is None:
+            if not create:
+                return None
+            layer = _create_layer(usd_path)
+            mark_file_created(usd_path)
+
+        self.misses += 1
+
+        entry = _CacheEntry(layer, _file_stamp(usd_path))
+        if self.max_size > 0:
+            self._entries[usd_path] = entry
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        return entry
+
+    def mark_saved(self, usd_path: str):
+        """Record that the connector itself saved usd_path, so the new file is not seen as an outside change"""
+        entry = self._entries.get(usd_path)
+        if entry is not None:
+            entry.stamp = _file_stamp(usd_path)
+
+    def invalidate(self, usd_path: str = None):
+        """Drop usd_path from the cache, or every stage when no path is given, along with the listing cache
+        of its folder, so the next open looks at the file again"""
+        if usd_path is None:
+            self._entries.clear()
+            invalidate_listing_cache()
+        else:
+            self._entries.pop(usd_path, None)
+            invalidate_listing_cache(usd_path.rpartition("/")[0])
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "reloads": self.reloads,
+            "evictions": self.evictions,
+        }
+
+    def _evict_idle(self):
+        if self.idle_timeout <= 0:
+            return
+        deadline = time.monotonic() - self.idle_timeout
+        for usd_path in [path for path, entry in self._entries.items() if entry.last_used < deadline]:
+            del self._entries[usd_path]
+            self.evictions += 1
+
+
+def _create_layer(usd_path: str) -> Sdf.Layer:
+    """Create a new empty layer, reusing the layer still open for a file that was deleted"""
+    layer = Sdf.Layer.Find(usd_path)
+    if layer is None:
+        return Sdf.Layer.CreateNew(usd_path)
+    layer.Clear()
+    layer.Save()
+    return layer
+
+
+def _file_stamp(usd_path: str):
+    """Modification time and size of usd_path, or None when it does not exist"""
+    result, entry = omni.client.stat(usd_path)
+    if result != omni.client.Result.OK:
+        return None
+    return (entry.modified_time, entry.size)
@@ -0,0 +1,56 @@
+import omni.client
+import omni.usd
+from pxr import Sdf, Usd
+
+from .forma_stage_cache import StageCache
+
+
+class StageRouter:
+    """Decides which stage a request writes to
+
+    Every request for the same layer resolves to the same key, which is also its lane in the request manager,
+    so writes to one stage run one at a time while different stages are written in parallel.
+    The stage open in Kit is used as is, so its edits show up live; other stages come from the stage cache.
+    """
+
+    def __init__(self, stage_cache: StageCache) -> None:
+        self._stage_cache = stage_cache
+
+    def resolve(self, usd_path: str) -> str:
+        """The key of the stage for usd_path, the stage open in Kit when usd_path is empty
+
+        The key is empty when usd_path is empty and no stage is open in Kit.
+        """
+        if not usd_path:
+            return self._context_stage_url()
+        return omni.client.normalize_url(usd_path)
+
+    def open(self, key: str) -> Usd.Stage:
+        """Get the stage for a key returned by `resolve`
+
+        Raises:
+            ValueError: The key is empty, no usd_path was given while no stage is open in Kit
+        """
+        if key and key == self._context_stage_url():
+            stage = omni.usd.get_context().get_stage()
+            if stage:
+                return stage
+        return self._stage_cache.open(key)
+
+    def open_layer(self, key: str, create: bool = True) -> Sdf.Layer:
+        """Get the layer to write to for a key returned by `resolve`, without composing a stage when it is not open
+
+        A missing layer is created, or None is returned when create is False.
+
+        Raises:
+            ValueError: The key is empty, no usd_path was given while no stage is open in Kit
+        """
+        if key and key == self._context_stage_url():
+            stage = omni.usd.get_context().get_stage()
+            if stage:
+                return stage.GetEditTarget().GetLayer()
+        return self._stage_cache.open_layer(key, create)
+
+    def _context_stage_url(self) -> str:
+        url = omni.usd.get_context().get_stage_url()
+        return omni.client.normalize_url(url) if url else ""
@@ -0,0 +1,88 @@
+import os
+import tempfile
+
+import numpy as np
+
+# A float32 triangle is 3 vertices of 3 coordinates
+VERTEX_SIZE = 3 * 4
+TRIANGLE_SIZE = 3 * VERTEX_SIZE
+
+
+async def read_upload_vertices(file, chunk_size: int, spool_threshold: int) -> np.ndarray:
+    """Read a float32 triangle soup upload into an (N, 3) vertex array, one chunk at a time
+
+    The array is allocated once for the whole payload, so the upload is never held twice in memory.
+    Payloads larger than `spool_threshold` bytes go to a memory-mapped temporary file instead of RAM.
+    Trailing bytes that do not make up a whole vertex are ignored.
+
+    Args:
+        file (UploadFile): The uploaded mesh
+        chunk_size (int): Bytes per read, rounded down to whole triangles
+        spool_threshold (int): Payload size above which the array is memory-mapped, 0 to never memory-map
+    """
+    size = _upload_size(file)
+    vertex_count = size // VERTEX_SIZE
+    chunk_size = max(TRIANGLE_SIZE, chunk_size - chunk_size % TRIANGLE_SIZE)
+
+    if spool_threshold and size > spool_threshold:
+        # The temporary file is removed as soon as the memory map is released
+        vertices = np.memmap(tempfile.TemporaryFile(), dtype=np.float32, mode="w+", shape=(vertex_count, 3))
+    else:
+        vertices = np.empty((vertex_count, 3), dtype=np.float32)
+
+    buffer = vertices.reshape(-1).view(np.uint8)
+    offset = 0
+    while offset < len(buffer):
+        chunk = await file.read(min(chunk_size, len(buffer) - offset))
+        if not chunk:
+            break
+        buffer[offset : offset + len(chunk)] = np.frombuffer(chunk, dtype=np.uint8)
+        offset += len(chunk)
+
+    return vertices[: offset // VERTEX_SIZE]
+
+
+def slice_batch(buffer, compact: bool, elements: list) -> list:
+    """Cut the payload of every element of a batch out of the uploaded buffer, without copying
+
+    Args:
+        buffer: The compact payload bytes, or the (N, 3) vertex array of a raw float32 upload
+        compact (bool): True for compact payloads, sliced by bytes, False for float32 vertices
+        elements (list): (forma_path, offset, length) byte ranges of the meshes in the buffer
+
+    Returns:
+        The (forma_path, payload) pairs of the elements, in order
+
+    Raises:
+        ValueError: A byte range is empty, out of the buffer, or splits a float32 vertex
+    """
+    if compact:
+        buffer = memoryview(buffer)
+        buffer_size = len(buffer)
+    else:
+        buffer_size = len(buffer) * VERTEX_SIZE
+
+    payloads = []
+    for forma_path, offset, length in elements:
+        in_range = offset >= 0 and length > 0 and offset + length <= buffer_size
+        # Raw float32 ranges must hold whole vertices
+        aligned = compact or (offset % VERTEX_SIZE == 0 and length % VERTEX_SIZE == 0)
+        if not in_range or not aligned:
+            raise ValueError(f"Invalid byte range for {forma_path}")
+
+        if compact:
+            payloads.append((forma_path, buffer[offset : offset + length]))
+        else:
+            start = offset // VERTEX_SIZE
+            payloads.append((forma_path, buffer[start : start + length // VERTEX_SIZE]))
+    return payloads
+
+
+def _upload_size(file) -> int:
+    """Size in bytes of an UploadFile, from its spooled file"""
+    spooled = file.file
+    position = spooled.tell()
+    spooled.seek(0, os.SEEK_END)
+    size = spooled.tell() - position
+    spooled.seek(position)
+    return size
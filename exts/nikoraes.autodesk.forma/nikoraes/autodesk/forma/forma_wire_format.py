@@ -0,0 +1,203 @@
+"""Compact binary mesh payloads, used by connectors that send protocol_version 2.0 or later
+
+A payload is a fixed little-endian header followed by a body, optionally compressed:
+
+    magic           4s      b"FMSH"
+    version         u8      1
+    flags           u8      FLAG_INDEXED when the body holds triangle indices
+    position_type   u8      POSITION_FLOAT32, POSITION_INT16 or POSITION_INT32
+    compression     u8      COMPRESSION_NONE, COMPRESSION_DEFLATE or COMPRESSION_ZSTD
+    vertex_count    u32
+    index_count     u32     0 for a triangle soup
+    origin          3 f64
+    scale           3 f64
+
+The body holds vertex_count * 3 positions, then index_count u32 indices. A stored position q
+decodes to origin + q * scale. Legacy connectors send a raw float32 triangle soup instead.
+"""
+import struct
+import zlib
+
+import numpy as np
+
+from .forma_mesh import MeshData, triangle_soup_to_mesh
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+PROTOCOL_VERSION = "2.0"
+
+MAGIC = b"FMSH"
+FORMAT_VERSION = 1
+
+FLAG_INDEXED = 1
+
+POSITION_FLOAT32 = 0
+POSITION_INT16 = 1
+POSITION_INT32 = 2
+
+COMPRESSION_NONE = 0
+COMPRESSION_DEFLATE = 1
+COMPRESSION_ZSTD = 2
+
+_HEADER = struct.Struct("<4sBBBBII3d3d")
+_POSITION_DTYPES = {
+    POSITION_FLOAT32: np.dtype("<f4"),
+    POSITION_INT16: np.dtype("<i2"),
+    POSITION_INT32: np.dtype("<i4"),
+}
+_INDEX_DTYPE = np.dtype("<u4")
+
+
+def is_compact(protocol_version: str) -> bool:
+    """Check if a connector with this protocol version sends compact payloads"""
+    try:
+        return int(protocol_version.split(".")[0]) >= int(PROTOCOL_VERSION.split(".")[0])
+    except ValueError:
+        return False
+
+
+def decode_mesh(payload) -> MeshData:
+    """Decode a compact payload into mesh arrays
+
+    Raises:
+        ValueError: The payload is malformed or uses a compression that is not available
+    """
+    payload = memoryview(payload)
+    if len(payload) < _HEADER.size:
+        raise ValueError("Mesh payload is shorter than its header")
+
+    (
+        magic,
+        version,
+        flags,
+        position_type,
+        compression,
+        vertex_count,
+        index_count,
+        ox,
+        oy,
+        oz,
+        sx,
+        sy,
+        sz,
+    ) = _HEADER.unpack_from(payload)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError("Mesh payload has an unknown format")
+    if position_type not in _POSITION_DTYPES:
+        raise ValueError(f"Mesh payload has an unknown position type {position_type}")
+
+    position_dtype = _POSITION_DTYPES[position_type]
+    positions_size = vertex_count * 3 * position_dtype.itemsize
+    body_size = positions_size + index_count * _INDEX_DTYPE.itemsize
+    body = _decompress(payload[_HEADER.size :], compression, body_size)
+    if len(body) != body_size:
+        raise ValueError("Mesh payload size does not match its header")
+
+    positions = np.frombuffer(body, dtype=position_dtype, count=vertex_count * 3).reshape((-1, 3))
+    if position_type == POSITION_FLOAT32 and (ox, oy, oz) == (0, 0, 0) and (sx, sy, sz) == (1, 1, 1):
+        points = positions.astype(np.float32)
+    else:
+        points = (positions * np.array([sx, sy, sz]) + np.array([ox, oy, oz])).astype(np.float32)
+
+    if not flags & FLAG_INDEXED:
+        return triangle_soup_to_mesh(points)
+
+    indices = np.frombuffer(body, dtype=_INDEX_DTYPE, count=index_count, offset=positions_size)
+    if index_count % 3:
+        raise ValueError("Mesh payload index count is not a multiple of 3")
+    if index_count and indices.max() >= vertex_count:
+        raise ValueError("Mesh payload has indices out of range")
+
+    face_vertex_counts = np.full(index_count // 3, 3, dtype=np.int32)
+    return MeshData(points, face_vertex_counts, indices.astype(np.int32))
+
+
+def encode_mesh(
+    points: np.ndarray,
+    indices: np.ndarray = None,
+    position_type: int = POSITION_INT16,
+    compression: int = COMPRESSION_DEFLATE,
+) -> bytes:
+    """Encode mesh arrays into a compact payload, the inverse of `decode_mesh`
+
+    Quantized positions are stored relative to the center of the bounding box, scaled to the full integer range.
+    """
+    points = np.asarray(points, dtype=np.float64).reshape((-1, 3))
+
+    if position_type == POSITION_FLOAT32 or len(points) == 0:
+        origin = np.zeros(3)
+        scale = np.ones(3)
+        positions = points.astype(np.float32)
+    else:
+        dtype = _POSITION_DTYPES[position_type]
+        limit = np.iinfo(dtype).max
+        low = points.min(axis=0)
+        high = points.max(axis=0)
+        origin = (low + high) / 2
+        scale = (high - low) / 2 / limit
+        scale[scale == 0] = 1.0
+        positions = np.round((points - origin) / scale).astype(dtype)
+
+    flags = 0
+    body = positions.astype(_POSITION_DTYPES[position_type]).tobytes()
+    index_count = 0
+    if indices is not None:
+        flags |= FLAG_INDEXED
+        indices = np.asarray(indices, dtype=_INDEX_DTYPE).reshape(-1)
+        index_count = len(indices)
+        body += indices.tobytes()
+
+    header = _HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        flags,
+        position_type,
+        compression,
+        len(points),
+        index_count,
+        *origin,
+        *scale,
+    )
+    return header + _compress(body, compression)
+
+
+def _decompress(body: memoryview, compression: int, size: int):
+    if compression == COMPRESSION_NONE:
+        return body
+    if compression == COMPRESSION_DEFLATE:
+        # Inflating is bounded by the size in the header, so a small payload can't expand into a huge buffer
+        inflater = zlib.decompressobj()
+        try:
+            inflated = inflater.decompress(body, size + 1)
+        except zlib.error as e:
+            raise ValueError(f"Mesh payload could not be inflated: {e}")
+        if len(inflated) != size or not inflater.eof or inflater.unconsumed_tail or inflater.unused_data:
+            raise ValueError("Mesh payload size does not match its header")
+        return inflated
+    if compression == COMPRESSION_ZSTD:
+        if zstandard is None:
+            raise ValueError("Mesh payload is zstd compressed, but zstandard is not installed")
+        try:
+            # max_output_size only bounds frames without a content size, a declared size is checked first
+            content_size = zstandard.frame_content_size(body)
+            if content_size not in (-1, size):
+                raise ValueError("Mesh payload size does not match its header")
+            return zstandard.ZstdDecompressor().decompress(body, max_output_size=size)
+        except zstandard.ZstdError as e:
+            raise ValueError(f"Mesh payload could not be decompressed: {e}")
+    raise ValueError(f"Mesh payload has an unknown compression {compression}")
+
+
+def _compress(body: bytes, compression: int) -> bytes:
+    if compression == COMPRESSION_NONE:
+        return body
+    if compression == COMPRESSION_DEFLATE:
+        return zlib.compress(body)
+    if compression == COMPRESSION_ZSTD:
+        if zstandard is None:
+            raise ValueError("zstandard is not installed")
+        return zstandard.ZstdCompressor().compress(body)
+    raise ValueError(f"Unknown compression {compression}")
@@ -1 +1,15 @@
-from .test_hello_world import *
\ No newline at end of file
+from .test_hello_world import *
+from .test_forma_mesh import *
+from .test_utils import *
+from .test_forma_save import *
+from .test_forma_wire_format import *
+from .test_forma_request_manager import *
+from .test_forma_metrics import *
+from .test_forma_pipeline import *
+from .test_forma_profile import *
+from .test_file_picker_dialog import *
+from .test_forma_manifest import *
+from .test_forma_crate_cache import *
+from .test_forma_upload import *
+from .test_forma_stage_cache import *
+from .test_forma_stage_router import *
@@ -0,0 +1,40 @@
+import asyncio
+
+import omni.kit.test
+
+from nikoraes.autodesk.forma.file_picker_dialog import FilePickerDialogPool
+
+USD_FILTER = ["USD Files (*.usd, *.usda, *.usdc, *.usdz)"]
+USD_EXTENSIONS = [".usd", ".usda", ".usdc", ".usdz"]
+
+
+class TestFilePickerDialog(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._pool = FilePickerDialogPool(max_idle=1)
+
+    async def tearDown(self):
+        self._pool.destroy()
+
+    async def test_pick(self):
+        dialog_wrapper = self._pool.acquire("Pick", USD_FILTER, USD_EXTENSIONS, "Select")
+        pick = asyncio.ensure_future(dialog_wrapper.pick("omniverse://localhost/"))
+        await asyncio.sleep(0)
+
+        # The apply handler completes the request right away
+        dialog_wrapper._on_click_open(dialog_wrapper.dialog, "site.usd", "omniverse://localhost/Projects/")
+        self.assertEqual(await pick, "omniverse://localhost/Projects/site.usd")
+
+        # Dialogs with the same options are reused once released
+        self._pool.release(dialog_wrapper)
+        self.assertIs(self._pool.acquire("Pick", USD_FILTER, USD_EXTENSIONS, "Select"), dialog_wrapper)
+        self.assertIsNot(self._pool.acquire("Pick", USD_FILTER, USD_EXTENSIONS, "Select"), dialog_wrapper)
+
+    async def test_cancel_and_timeout(self):
+        dialog_wrapper = self._pool.acquire("Pick", USD_FILTER, USD_EXTENSIONS, "Select")
+        pick = asyncio.ensure_future(dialog_wrapper.pick("omniverse://localhost/"))
+        await asyncio.sleep(0)
+        dialog_wrapper._on_click_cancel(dialog_wrapper.dialog, "", "")
+        self.assertEqual(await pick, "")
+
+        with self.assertRaises(asyncio.TimeoutError):
+            await dialog_wrapper.pick("omniverse://localhost/", timeout=0.01)
@@ -0,0 +1,67 @@
+import os
+import tempfile
+
+import numpy as np
+import omni.kit.test
+from pxr import Sdf
+
+from nikoraes.autodesk.forma import forma_mesh
+from nikoraes.autodesk.forma.forma_crate_cache import CrateCache, get_cache_key
+
+
+class TestCrateCache(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._folder = tempfile.TemporaryDirectory()
+
+    async def tearDown(self):
+        self._folder.cleanup()
+
+    def _mesh(self, seed: int) -> forma_mesh.MeshData:
+        vertices = np.random.default_rng(seed).random((9, 3), dtype=np.float32)
+        options = forma_mesh.ConversionOptions(normals="vertex")
+        return forma_mesh.prepare_mesh(forma_mesh.triangle_soup_to_mesh(vertices), options)
+
+    async def test_cache_key(self):
+        options = forma_mesh.ConversionOptions()
+        key = get_cache_key("hash", False, options)
+        self.assertEqual(key, get_cache_key("hash", False, forma_mesh.ConversionOptions()))
+        self.assertNotEqual(key, get_cache_key("hash", True, options))
+        self.assertNotEqual(key, get_cache_key("hash", False, forma_mesh.ConversionOptions(normals="vertex")))
+
+    async def test_put_and_get(self):
+        cache = CrateCache(self._folder.name)
+        mesh_data = self._mesh(0)
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", mesh_data)
+
+        cached = cache.get("a")
+        self.assertEqual((cached.vertex_count, cached.face_count), (9, 3))
+        self.assertTrue(np.allclose(cached.extent, mesh_data.extent))
+
+        # The cached mesh copies to the same specs as the converted mesh
+        layer = Sdf.Layer.CreateAnonymous()
+        forma_mesh.copy_mesh_spec(cached.layer, cached.mesh_path, layer, "/World/_a")
+        expected = Sdf.Layer.CreateAnonymous()
+        forma_mesh.author_mesh_spec(expected, "/World/_a", mesh_data)
+        self.assertEqual(layer.ExportToString(), expected.ExportToString())
+
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["hit_rate"]), (1, 1, 0.5))
+        self.assertEqual(stats["bytes_saved"], os.path.getsize(cached.path))
+
+        # The layers on disk are found again by the next cache
+        self.assertIsNotNone(CrateCache(self._folder.name).get("a"))
+
+    async def test_trim(self):
+        cache = CrateCache(self._folder.name)
+        for key in ["a", "b", "c"]:
+            cache.put(key, self._mesh(0))
+        cache.get("a")
+        cache.max_size = cache.stats()["bytes"] - 1
+
+        # The least recently used layer goes first
+        cache.trim()
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertFalse(os.path.exists(cache.get_path("b")))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("c"))
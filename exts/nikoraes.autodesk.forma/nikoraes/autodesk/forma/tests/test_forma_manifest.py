@@ -0,0 +1,52 @@
+import os
+import tempfile
+
+import omni.kit.test
+from pxr import Sdf
+
+from nikoraes.autodesk.forma.forma_manifest import MANIFEST_KEY, ManifestStore, StageManifest
+
+
+class TestFormaManifest(omni.kit.test.AsyncTestCase):
+    async def test_prim_path_collisions(self):
+        manifest = StageManifest()
+        reserved = {}
+        self.assertEqual(manifest.prim_path_for("site/a/wall", "/World/_wall", reserved), "/World/_wall")
+        # Another element ending in the same segment gets its own prim
+        self.assertEqual(manifest.prim_path_for("site/b/wall", "/World/_wall", reserved), "/World/_wall_2")
+        manifest.update("site/b/wall", "/World/_wall_2", "hash", 9)
+        self.assertEqual(manifest.prim_path_for("site/b/wall", "/World/_wall"), "/World/_wall_2")
+        self.assertIsNone(manifest.find_prim_path("site/c/wall", "/World/_wall_2"))
+
+        # A prim path is only taken once its element is imported
+        self.assertEqual(manifest.prim_path_for("site/c/wall", "/World/_wall"), "/World/_wall")
+
+        # Elements imported before there was a manifest keep their prim
+        self.assertEqual(manifest.find_prim_path("site/roof", "/World/_roof"), "/World/_roof")
+
+    async def test_write_and_load(self):
+        layer = Sdf.Layer.CreateAnonymous()
+        manifest = StageManifest()
+        manifest.update("site/a", "/World/_a", "hash", 9)
+        manifest.write(layer)
+        self.assertFalse(manifest.dirty)
+        self.assertEqual(layer.customLayerData[MANIFEST_KEY]["site/a"]["vertexCount"], 9)
+
+        loaded = StageManifest.load(layer)
+        self.assertEqual(loaded.get("site/a").prim_path, "/World/_a")
+        self.assertEqual(loaded.remove("site/a").content_hash, "hash")
+        self.assertIsNone(loaded.remove("site/a"))
+
+    async def test_store_reload(self):
+        with tempfile.TemporaryDirectory() as folder:
+            usd_path = os.path.join(folder, "site.usda")
+            layer = Sdf.Layer.CreateNew(usd_path)
+            layer.Save()
+            store = ManifestStore()
+            manifest = store.open(usd_path, layer)
+            manifest.update("site/a", "/World/_a", "hash", 9)
+            self.assertIs(store.open(usd_path, layer), manifest)
+
+            # A manifest is loaded again once its layer is reloaded
+            layer.Reload(force=True)
+            self.assertIsNot(store.open(usd_path, layer), manifest)
@@ -0,0 +1,240 @@
+import os
+import tempfile
+
+import numpy as np
+import omni.kit.test
+from pxr import Sdf, Usd, UsdGeom
+
+from nikoraes.autodesk.forma import forma_mesh
+
+
+class TestFormaMesh(omni.kit.test.AsyncTestCase):
+    async def test_triangle_soup_topology(self):
+        vertices = np.arange(7 * 3, dtype=np.float32).reshape((-1, 3))
+        mesh_data = forma_mesh.triangle_soup_to_mesh(vertices)
+
+        # The trailing incomplete triangle is dropped
+        self.assertEqual(mesh_data.vertex_count, 6)
+        self.assertEqual(list(mesh_data.face_vertex_counts), [3, 3])
+        self.assertEqual(list(mesh_data.face_vertex_indices), [0, 1, 2, 3, 4, 5])
+
+    async def test_author_mesh(self):
+        vertices = np.random.default_rng(0).random((9, 3), dtype=np.float32)
+        stage = Usd.Stage.CreateInMemory()
+
+        mesh_prim = forma_mesh.author_mesh(
+            stage, "/World/_mesh", forma_mesh.triangle_soup_to_mesh(vertices)
+        )
+
+        points = np.array(mesh_prim.GetPointsAttr().Get())
+        np.testing.assert_array_equal(points, vertices)
+        self.assertEqual(list(mesh_prim.GetFaceVertexCountsAttr().Get()), [3, 3, 3])
+        self.assertEqual(list(mesh_prim.GetFaceVertexIndicesAttr().Get()), list(range(9)))
+
+    async def test_weld_vertices(self):
+        # Two triangles of a quad, sharing an edge
+        quad = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 0, 0], [1, 1, 0], [0, 1, 0]], dtype=np.float32)
+        soup = forma_mesh.triangle_soup_to_mesh(quad)
+
+        welded = forma_mesh.weld_vertices(soup)
+
+        self.assertEqual(welded.vertex_count, 4)
+        self.assertEqual(list(welded.face_vertex_indices), [0, 1, 2, 0, 2, 3])
+        np.testing.assert_array_equal(welded.points[welded.face_vertex_indices], quad)
+
+    async def test_weld_vertices_tolerance(self):
+        quad = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0.001, 0, 0], [1, 1, 0], [0, 1, 0]], dtype=np.float32)
+        soup = forma_mesh.triangle_soup_to_mesh(quad)
+
+        self.assertEqual(forma_mesh.weld_vertices(soup).vertex_count, 5)
+        self.assertEqual(forma_mesh.weld_vertices(soup, 0.01).vertex_count, 4)
+
+        # A triangle that collapses to an edge is dropped
+        welded = forma_mesh.weld_vertices(soup, 4.0)
+        self.assertEqual(welded.face_count, 0)
+
+    async def test_author_mesh_spec(self):
+        vertices = np.random.default_rng(0).random((9, 3), dtype=np.float32)
+        mesh_data = forma_mesh.triangle_soup_to_mesh(vertices)
+
+        # The Sdf path writes the same layer content as the UsdGeom path
+        mesh_data = forma_mesh.prepare_mesh(mesh_data, forma_mesh.ConversionOptions(normals="vertex"))
+        usd_stage = Usd.Stage.CreateInMemory()
+        forma_mesh.author_mesh(usd_stage, "/World/_mesh", mesh_data)
+        sdf_stage = Usd.Stage.CreateInMemory()
+        with Sdf.ChangeBlock():
+            forma_mesh.author_mesh_spec(sdf_stage.GetRootLayer(), "/World/_mesh", mesh_data)
+
+        self.assertEqual(
+            sdf_stage.GetRootLayer().ExportToString(), usd_stage.GetRootLayer().ExportToString()
+        )
+        self.assertEqual([str(prim.GetPath()) for prim in sdf_stage.Traverse()], ["/World", "/World/_mesh"])
+
+    async def test_author_payload_spec(self):
+        vertices = np.array([[0, 0, 0], [2, 0, 1], [0, 3, 0]], dtype=np.float32)
+        mesh_data = forma_mesh.triangle_soup_to_mesh(vertices)
+        extent = forma_mesh.compute_extent(mesh_data.points)
+        self.assertEqual(extent.tolist(), [[0, 0, 0], [2, 3, 1]])
+
+        with tempfile.TemporaryDirectory() as folder:
+            payload_layer = Sdf.Layer.CreateNew(os.path.join(folder, "_a.usdc"))
+            forma_mesh.author_payload_layer(payload_layer, "_a", mesh_data)
+            payload_layer.Save()
+
+            root_layer = Sdf.Layer.CreateNew(os.path.join(folder, "root.usda"))
+            forma_mesh.author_mesh_spec(root_layer, "/World/_a", mesh_data)
+            forma_mesh.author_payload_spec(root_layer, "/World/_a", "./_a.usdc", extent)
+
+            # The bounds are known without loading the payload
+            stage = Usd.Stage.Open(root_layer, Usd.Stage.LoadNone)
+            prim = stage.GetPrimAtPath("/World/_a")
+            self.assertFalse(prim.IsLoaded())
+            self.assertTrue(prim.IsModel())
+            self.assertEqual(
+                [list(corner) for corner in UsdGeom.ModelAPI(prim).GetExtentsHintAttr().Get()],
+                extent.tolist(),
+            )
+            self.assertFalse(stage.GetPrimAtPath("/World/_a/mesh"))
+
+            stage.Load("/World/_a")
+            mesh = UsdGeom.Mesh(stage.GetPrimAtPath("/World/_a/mesh"))
+            self.assertEqual(len(mesh.GetPointsAttr().Get()), 3)
+
+            # Writing the mesh without payload again removes it
+            forma_mesh.author_mesh_spec(root_layer, "/World/_a", mesh_data)
+            self.assertFalse(root_layer.GetPrimAtPath("/World/_a").hasPayloads)
+            self.assertNotIn("extentsHint", root_layer.GetPrimAtPath("/World/_a").attributes)
+
+    async def test_compute_normals(self):
+        # Two triangles folded along the x axis, at a right angle
+        points = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]], dtype=np.float32)
+        mesh_data = forma_mesh.MeshData(
+            points, np.array([3, 3], dtype=np.int32), np.array([0, 1, 2, 0, 3, 1], dtype=np.int32)
+        )
+
+        faces = forma_mesh.compute_normals(mesh_data, "face")
+        self.assertEqual(faces.normals_interpolation, "uniform")
+        np.testing.assert_allclose(faces.normals, [[0, 0, 1], [0, 1, 0]], atol=1e-6)
+
+        vertices = forma_mesh.compute_normals(mesh_data, "vertex")
+        self.assertEqual(vertices.normals_interpolation, "vertex")
+        # The shared edge gets the average of both faces, the other corners keep their face normal
+        half = np.sqrt(0.5)
+        np.testing.assert_allclose(
+            vertices.normals, [[0, half, half], [0, half, half], [0, 0, 1], [0, 1, 0]], atol=1e-6
+        )
+
+        self.assertIsNone(forma_mesh.compute_normals(mesh_data, "none").normals)
+
+        # A misspelled mode is an error rather than vertex normals
+        with self.assertRaises(ValueError):
+            forma_mesh.ConversionOptions(normals="smooth")
+
+    def _terrain(self, size: int) -> np.ndarray:
+        """A triangle soup of a size x size grid with a bump in the middle"""
+        x, y = np.meshgrid(np.arange(size + 1, dtype=np.float32), np.arange(size + 1, dtype=np.float32))
+        z = np.exp(-((x - size / 2) ** 2 + (y - size / 2) ** 2) / size).astype(np.float32)
+        grid = np.stack([x, y, z], axis=-1)
+        quads = [grid[:-1, :-1], grid[:-1, 1:], grid[1:, 1:], grid[:-1, :-1], grid[1:, 1:], grid[1:, :-1]]
+        return np.stack(quads, axis=2).reshape((-1, 3))
+
+    async def test_simplify_mesh(self):
+        mesh_data = forma_mesh.prepare_mesh(
+            forma_mesh.triangle_soup_to_mesh(self._terrain(40)), forma_mesh.ConversionOptions(weld_vertices=True)
+        )
+        simplified = forma_mesh.simplify_mesh(mesh_data, 500)
+        self.assertLessEqual(simplified.face_count, 500)
+        self.assertGreaterEqual(simplified.face_count, 450)
+        self.assertLess(simplified.vertex_count, mesh_data.vertex_count)
+        # The clustered vertices stay within the bounds of the mesh
+        extent = forma_mesh.compute_extent(simplified.points)
+        self.assertTrue(np.all(extent[0] >= mesh_data.extent[0]) and np.all(extent[1] <= mesh_data.extent[1]))
+
+        # A mesh within the budget is not decimated
+        self.assertIs(forma_mesh.simplify_mesh(mesh_data, mesh_data.face_count), mesh_data)
+
+    async def test_lod_variants(self):
+        self.assertEqual(forma_mesh.parse_lod_budgets("100, 1000,100"), (1000, 100))
+        with self.assertRaises(ValueError):
+            forma_mesh.parse_lod_budgets("1000,-1")
+
+        options = forma_mesh.ConversionOptions(normals="vertex", lod_budgets=(1000, 100, 100_000))
+        mesh_data = forma_mesh.prepare_mesh(forma_mesh.triangle_soup_to_mesh(self._terrain(40)), options)
+        self.assertEqual(len(mesh_data.lods), 2)
+        stage = Usd.Stage.CreateInMemory()
+        with Sdf.ChangeBlock():
+            forma_mesh.author_mesh_spec(stage.GetRootLayer(), "/World/_terrain", mesh_data)
+
+        # The coarsest level is selected, lod0 is the full mesh
+        mesh = UsdGeom.Mesh(stage.GetPrimAtPath("/World/_terrain"))
+        variant_set = mesh.GetPrim().GetVariantSets().GetVariantSet(forma_mesh.LOD_VARIANT_SET)
+        self.assertEqual(variant_set.GetVariantNames(), ["lod0", "lod1", "lod2"])
+        self.assertEqual(variant_set.GetVariantSelection(), "lod2")
+        self.assertLessEqual(len(mesh.GetFaceVertexCountsAttr().Get()), 100)
+        self.assertEqual(mesh.GetNormalsInterpolation(), "vertex")
+        variant_set.SetVariantSelection("lod0")
+        self.assertEqual(len(mesh.GetFaceVertexCountsAttr().Get()), 3200)
+
+        # Writing the mesh without levels of detail drops the variant set
+        mesh_data.lods = None
+        with Sdf.ChangeBlock():
+            forma_mesh.author_mesh_spec(stage.GetRootLayer(), "/World/_terrain", mesh_data)
+        self.assertFalse(mesh.GetPrim().GetVariantSets().GetNames())
+        self.assertEqual(len(mesh.GetFaceVertexCountsAttr().Get()), 3200)
+
+    async def test_remove_prim_spec(self):
+        mesh_data = forma_mesh.triangle_soup_to_mesh(np.zeros((3, 3), dtype=np.float32))
+        layer = Sdf.Layer.CreateAnonymous()
+        forma_mesh.author_mesh_spec(layer, "/World/_a", mesh_data)
+        forma_mesh.author_mesh_spec(layer, "/World/_b", mesh_data)
+
+        self.assertTrue(forma_mesh.remove_prim_spec(layer, "/World/_a"))
+        self.assertFalse(forma_mesh.remove_prim_spec(layer, "/World/_a"))
+        self.assertFalse(layer.GetPrimAtPath("/World/_a"))
+        self.assertTrue(layer.GetPrimAtPath("/World/_b"))
+
+    async def test_content_hash(self):
+        vertices = np.random.default_rng(0).random((9, 3), dtype=np.float32)
+
+        # Hashing the vertex array is the same as hashing the uploaded bytes
+        self.assertEqual(forma_mesh.content_hash(vertices), forma_mesh.content_hash(vertices.tobytes()))
+        self.assertNotEqual(forma_mesh.content_hash(vertices), forma_mesh.content_hash(vertices[:6]))
+
+    async def test_instance_spec(self):
+        vertices = np.random.default_rng(0).random((9, 3), dtype=np.float32)
+        mesh_data = forma_mesh.center_mesh(forma_mesh.triangle_soup_to_mesh(vertices))
+        moved = forma_mesh.center_mesh(forma_mesh.triangle_soup_to_mesh(vertices + np.float32(1000)))
+
+        # Meshes that only differ by their translation share a geometry key and a prototype
+        self.assertEqual(mesh_data.geometry_key, moved.geometry_key)
+        stage = Usd.Stage.CreateInMemory()
+        layer = stage.GetRootLayer()
+        prototype_path = f"{forma_mesh.PROTOTYPES_PATH}/geometry_{mesh_data.geometry_key}"
+        with Sdf.ChangeBlock():
+            forma_mesh.author_prototype_spec(layer, prototype_path, mesh_data)
+        self.assertTrue(forma_mesh.matches_prototype(layer, prototype_path, moved))
+        with Sdf.ChangeBlock():
+            forma_mesh.author_instance_spec(layer, "/World/_mesh", prototype_path, moved.translation)
+
+        # The instance puts the mesh back in place
+        prim = stage.GetPrimAtPath("/World/_mesh")
+        self.assertTrue(prim.IsInstance())
+        transform = UsdGeom.Xformable(prim).ComputeLocalToWorldTransform(Usd.TimeCode.Default())
+        self.assertTrue(np.allclose(transform.ExtractTranslation(), vertices.min(axis=0) + 1000, atol=1e-3))
+
+    async def test_prepare_mesh(self):
+        quad = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 0, 0], [1, 1, 0], [0, 1, 0]], dtype=np.float32)
+        soup = forma_mesh.triangle_soup_to_mesh(quad)
+
+        prepared = forma_mesh.prepare_mesh(soup, forma_mesh.ConversionOptions())
+        self.assertEqual(prepared.vertex_count, 6)
+        self.assertEqual(prepared.extent.tolist(), [[0, 0, 0], [1, 1, 0]])
+        self.assertIsNone(prepared.normals)
+        welded = forma_mesh.prepare_mesh(soup, forma_mesh.ConversionOptions(weld_vertices=True))
+        self.assertEqual(welded.vertex_count, 4)
+
+        # Options that change the result change the signature
+        self.assertNotEqual(
+            forma_mesh.ConversionOptions().signature,
+            forma_mesh.ConversionOptions(weld_vertices=True).signature,
+        )
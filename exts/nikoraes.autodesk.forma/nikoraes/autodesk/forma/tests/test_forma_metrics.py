@@ -0,0 +1,40 @@
+import omni.kit.test
+
+from nikoraes.autodesk.forma.forma_metrics import Histogram, Metrics
+
+
+class TestFormaMetrics(omni.kit.test.AsyncTestCase):
+    async def test_histogram(self):
+        histogram = Histogram([0.1, 1.0])
+        for value in [0.05, 0.1, 0.5, 2.0]:
+            histogram.observe(value)
+
+        # Bounds are inclusive, the last count is +Inf
+        self.assertEqual(histogram.cumulative_counts(), [2, 3, 4])
+        self.assertEqual(histogram.quantile(0.5), 0.1)
+        self.assertEqual(histogram.quantile(0.99), 1.0)
+
+    async def test_span(self):
+        metrics = Metrics()
+        with self.assertRaises(ValueError):
+            with metrics.span("convert"):
+                raise ValueError()
+        metrics.increment("vertices_imported", 300)
+        metrics.increment("vertices_imported", 30)
+
+        # A span is recorded even when the step fails
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot["spans"]["convert"]["count"], 1)
+        self.assertEqual(snapshot["counters"], {"vertices_imported": 330})
+
+    async def test_prometheus(self):
+        metrics = Metrics()
+        metrics.observe("save", 0.002)
+        metrics.increment("bytes_received", 12)
+
+        text = metrics.to_prometheus({"stage_cache_hits": 3})
+        self.assertIn("# TYPE forma_bytes_received_total counter\nforma_bytes_received_total 12\n", text)
+        self.assertIn('forma_span_seconds_bucket{span="save",le="0.005"} 1\n', text)
+        self.assertIn('forma_span_seconds_bucket{span="save",le="+Inf"} 1\n', text)
+        self.assertIn('forma_span_seconds_count{span="save"} 1\n', text)
+        self.assertIn("forma_stage_cache_hits 3\n", text)
@@ -0,0 +1,233 @@
+import os
+import tempfile
+
+import numpy as np
+import omni.kit.test
+from pxr import Sdf
+
+from nikoraes.autodesk.forma import forma_mesh, forma_wire_format
+from nikoraes.autodesk.forma.forma_crate_cache import CrateCache
+from nikoraes.autodesk.forma.forma_manifest import StageManifest
+from nikoraes.autodesk.forma.forma_pipeline import ImportPipeline, get_prim_path
+from nikoraes.autodesk.forma.forma_save import DeferredSaver
+from nikoraes.autodesk.forma.forma_stage_cache import StageCache
+from nikoraes.autodesk.forma.forma_stage_router import StageRouter
+from nikoraes.autodesk.forma.utils import g_listing_cache, set_listing_cache_ttl
+
+
+class TestImportPipeline(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._folder = tempfile.TemporaryDirectory()
+        self._usd_path = os.path.join(self._folder.name, "site.usd").replace("\\", "/")
+        self._stage_cache = StageCache(max_size=2, idle_timeout=0)
+        saver = DeferredSaver(1.0, 1.0, on_saved=self._stage_cache.mark_saved)
+        self._pipeline = ImportPipeline(StageRouter(self._stage_cache), saver)
+        self._options = forma_mesh.ConversionOptions()
+        self._authoring = forma_mesh.AuthoringOptions()
+
+    async def tearDown(self):
+        self._stage_cache.invalidate()
+        self._folder.cleanup()
+
+    def _vertices(self, seed: int) -> np.ndarray:
+        return np.random.default_rng(seed).random((9, 3), dtype=np.float32)
+
+    async def _import(self, forma_path: str, payload, compact: bool = False) -> dict:
+        return await self._pipeline.import_mesh(
+            self._usd_path, forma_path, payload, compact, self._options, self._authoring, True
+        )
+
+    async def test_import_and_delete(self):
+        self.assertEqual(await self._import("site/a", self._vertices(0)), {"ok": True})
+        self.assertEqual(await self._import("site/a", self._vertices(0)), {"ok": True, "unchanged": True})
+        self.assertEqual(await self._import("site/a", self._vertices(1)), {"ok": True})
+
+        # The layer was saved with the mesh
+        layer = Sdf.Layer.OpenAsAnonymous(self._usd_path)
+        self.assertEqual(layer.GetPrimAtPath(get_prim_path("site/a")).typeName, "Mesh")
+
+        self.assertEqual(await self._pipeline.delete_mesh(self._usd_path, "site/a", True), {"ok": True})
+        layer = Sdf.Layer.OpenAsAnonymous(self._usd_path)
+        self.assertFalse(layer.GetPrimAtPath(get_prim_path("site/a")))
+
+    async def test_manifest(self):
+        # Forma paths ending in the same segment no longer overwrite each other
+        await self._import("site/a/wall", self._vertices(0))
+        await self._import("site/b/wall", self._vertices(1))
+        await self._pipeline.delete_mesh(self._usd_path, "site/a/wall", True)
+
+        manifest = StageManifest.load(Sdf.Layer.OpenAsAnonymous(self._usd_path))
+        self.assertNotIn("site/a/wall", manifest)
+        entry = manifest.get("site/b/wall")
+        self.assertEqual(entry.prim_path, "/World/_wall_2")
+        self.assertEqual(entry.vertex_count, 9)
+
+    async def test_delete_meshes(self):
+        elements = [(f"site/{i}", self._vertices(i)) for i in range(4)] + [("other/a", self._vertices(4))]
+        await self._pipeline.import_mesh_batch(self._usd_path, elements, False, self._options, self._authoring, True)
+
+        result = await self._pipeline.delete_meshes(self._usd_path, ["site/0", "site/9"], "", True)
+        self.assertEqual(result, {"ok": True, "removed": 1, "not_found": 1})
+        result = await self._pipeline.delete_meshes(self._usd_path, [], "site/", True)
+        self.assertEqual(result, {"ok": True, "removed": 3, "not_found": 0})
+
+        layer = Sdf.Layer.OpenAsAnonymous(self._usd_path)
+        self.assertEqual([prim.name for prim in layer.GetPrimAtPath("/World").nameChildren], ["_a"])
+
+    async def test_delete_prefix_segments(self):
+        forma_paths = ["proj/building1", "proj/building1/roof", "proj/building10"]
+        elements = [(forma_path, self._vertices(i)) for i, forma_path in enumerate(forma_paths)]
+        await self._pipeline.import_mesh_batch(self._usd_path, elements, False, self._options, self._authoring, True)
+
+        # A prefix only matches whole path segments, the sibling building10 is kept
+        result = await self._pipeline.delete_meshes(self._usd_path, [], "proj/building1", True)
+        self.assertEqual(result, {"ok": True, "removed": 2, "not_found": 0})
+        manifest = StageManifest.load(Sdf.Layer.OpenAsAnonymous(self._usd_path))
+        self.assertEqual([forma_path for forma_path, _ in manifest.items()], ["proj/building10"])
+
+    async def test_sync(self):
+        await self._import("site/a", self._vertices(0))
+        await self._import("site/b", self._vertices(1))
+        await self._import("other/c", self._vertices(2))
+
+        # a is unchanged, b changed, d is new, and c is kept as it is outside the prefix
+        elements = [
+            ("site/a", forma_mesh.content_hash(self._vertices(0))),
+            ("site/b", forma_mesh.content_hash(self._vertices(3))),
+            ("site/d", forma_mesh.content_hash(self._vertices(4))),
+        ]
+        result = await self._pipeline.sync(
+            self._usd_path, elements, "site/", True, self._options, self._authoring, True
+        )
+        self.assertEqual(result, {"ok": True, "upload": ["site/b", "site/d"], "deleted": []})
+
+        result = await self._pipeline.sync(
+            self._usd_path, elements[:1], "site/", True, self._options, self._authoring, True
+        )
+        self.assertEqual(result, {"ok": True, "upload": [], "deleted": ["site/b"]})
+        layer = Sdf.Layer.OpenAsAnonymous(self._usd_path)
+        self.assertFalse(layer.GetPrimAtPath(get_prim_path("site/b")))
+        self.assertTrue(layer.GetPrimAtPath(get_prim_path("other/c")))
+
+    async def test_missing_layer(self):
+        # Deletes and syncs never create the layer they target
+        self.assertEqual(await self._pipeline.delete_mesh(self._usd_path, "site/a", True), {"ok": True})
+        result = await self._pipeline.delete_meshes(self._usd_path, ["site/a"], "site", True)
+        self.assertEqual(result, {"ok": True, "removed": 0, "not_found": 1})
+        result = await self._pipeline.sync(
+            self._usd_path, [("site/a", "hash")], "site", True, self._options, self._authoring, True
+        )
+        self.assertEqual(result, {"ok": True, "upload": ["site/a"], "deleted": []})
+        self.assertFalse(os.path.exists(self._usd_path))
+
+    async def test_sync_stale_scope(self):
+        for forma_path in ["site/a/x", "site/ab/y"]:
+            await self._import(forma_path, self._vertices(0))
+
+        # Stale elements are only deleted under whole prefix segments, and never without a prefix
+        result = await self._pipeline.sync(self._usd_path, [], "site/a", True, self._options, self._authoring, True)
+        self.assertEqual(result["deleted"], ["site/a/x"])
+        with self.assertRaises(ValueError):
+            await self._pipeline.sync(self._usd_path, [], "", True, self._options, self._authoring, True)
+        result = await self._pipeline.sync(self._usd_path, [], "", False, self._options, self._authoring, True)
+        self.assertEqual(result["deleted"], [])
+        self.assertIn("site/ab/y", StageManifest.load(Sdf.Layer.OpenAsAnonymous(self._usd_path)))
+
+    async def test_instancing(self):
+        self._authoring = forma_mesh.AuthoringOptions(instancing=True)
+        vertices = self._vertices(0)
+        elements = [(f"site/{i}", vertices + np.float32(i * 100)) for i in range(3)] + [("site/3", self._vertices(1))]
+        await self._pipeline.import_mesh_batch(self._usd_path, elements, False, self._options, self._authoring, True)
+
+        # The translated copies share one prototype
+        layer = Sdf.Layer.OpenAsAnonymous(self._usd_path)
+        self.assertEqual(len(layer.GetPrimAtPath(forma_mesh.PROTOTYPES_PATH).nameChildren), 2)
+        instance = layer.GetPrimAtPath(get_prim_path("site/2"))
+        self.assertTrue(instance.instanceable)
+        self.assertEqual(instance.attributes["xformOp:translate"].default[0], float(vertices[:, 0].min() + 200))
+
+        # A prototype is removed with its last instance
+        await self._pipeline.delete_mesh(self._usd_path, "site/3", True)
+        await self._import("site/0", self._vertices(2))
+        layer = Sdf.Layer.OpenAsAnonymous(self._usd_path)
+        self.assertEqual(len(layer.GetPrimAtPath(forma_mesh.PROTOTYPES_PATH).nameChildren), 2)
+        await self._pipeline.delete_meshes(self._usd_path, ["site/1", "site/2"], "", True)
+        layer = Sdf.Layer.OpenAsAnonymous(self._usd_path)
+        self.assertEqual(len(layer.GetPrimAtPath(forma_mesh.PROTOTYPES_PATH).nameChildren), 1)
+
+    async def test_crate_cache(self):
+        crate_cache = CrateCache(os.path.join(self._folder.name, "cache"))
+        saver = DeferredSaver(1.0, 1.0)
+        self._pipeline = ImportPipeline(StageRouter(self._stage_cache), saver, crate_cache=crate_cache)
+        self._options = forma_mesh.ConversionOptions(lod_budgets=(2,))
+        elements = [(f"site/{i}", self._vertices(i)) for i in range(3)]
+        await self._pipeline.import_mesh_batch(self._usd_path, elements, False, self._options, self._authoring, True)
+        converted = Sdf.Layer.OpenAsAnonymous(self._usd_path).ExportToString()
+
+        # Another stage with the same elements copies them from the cache
+        other_path = os.path.join(self._folder.name, "other.usd").replace("\\", "/")
+        await self._pipeline.import_mesh_batch(other_path, elements, False, self._options, self._authoring, True)
+        self.assertEqual(Sdf.Layer.OpenAsAnonymous(other_path).ExportToString(), converted)
+        self.assertEqual(crate_cache.stats()["hits"], 3)
+
+        # Also in the payload layout, with the levels of detail
+        self._authoring = forma_mesh.AuthoringOptions(payload_layout=True)
+        await self._import("site/0", self._vertices(0))
+        self.assertEqual(crate_cache.stats()["hits"], 4)
+        payload = Sdf.Layer.OpenAsAnonymous(os.path.join(self._folder.name, "site_payloads", "_0.usdc"))
+        self.assertEqual(len(payload.GetAttributeAtPath("/geometry/mesh{LOD=lod0}.points").default), 9)
+
+    async def test_payload_layout(self):
+        self.addCleanup(set_listing_cache_ttl, g_listing_cache.ttl)
+        set_listing_cache_ttl(30.0)
+        self._authoring = forma_mesh.AuthoringOptions(payload_layout=True)
+        await self._import("site/a", self._vertices(0))
+        payload_path = os.path.join(self._folder.name, "site_payloads", "_a.usdc").replace("\\", "/")
+        self.assertTrue(os.path.exists(payload_path))
+
+        # The payload file goes with its prim, and the listing cache knows it is gone
+        await self._pipeline.delete_mesh(self._usd_path, "site/a", True)
+        self.assertFalse(os.path.exists(payload_path))
+        self.assertIs(g_listing_cache.get(payload_path), False)
+
+    async def test_lods(self):
+        self._options = forma_mesh.ConversionOptions(weld_vertices=True, lod_budgets=(50, 10))
+        vertices = np.random.default_rng(0).random((600, 3), dtype=np.float32)
+        await self._import("site/a", vertices)
+        layer = Sdf.Layer.OpenAsAnonymous(self._usd_path)
+        prim_spec = layer.GetPrimAtPath(get_prim_path("site/a"))
+        self.assertEqual(prim_spec.variantSelections[forma_mesh.LOD_VARIANT_SET], "lod2")
+
+        # Copies of a mesh share a prototype with the levels of detail
+        self._authoring = forma_mesh.AuthoringOptions(instancing=True)
+        await self._import("site/a", vertices)
+        await self._import("site/b", vertices + np.float32(100))
+        layer = Sdf.Layer.OpenAsAnonymous(self._usd_path)
+        prototypes = layer.GetPrimAtPath(forma_mesh.PROTOTYPES_PATH).nameChildren
+        self.assertEqual(len(prototypes), 1)
+        self.assertIn(forma_mesh.LOD_VARIANT_SET, prototypes[0].nameChildren["mesh"].variantSets)
+        self.assertNotIn(forma_mesh.LOD_VARIANT_SET, layer.GetPrimAtPath(get_prim_path("site/a")).variantSets)
+
+    async def test_import_batch(self):
+        elements = [(f"site/{i}", self._vertices(i)) for i in range(3)]
+        result = await self._pipeline.import_mesh_batch(
+            self._usd_path, elements, False, self._options, self._authoring, True
+        )
+        self.assertEqual(result, {"ok": True, "imported": 3, "unchanged": 0})
+
+        result = await self._pipeline.import_mesh_batch(
+            self._usd_path, elements, False, self._options, self._authoring, True
+        )
+        self.assertEqual(result, {"ok": True, "imported": 0, "unchanged": 3})
+
+    async def test_malformed_payload(self):
+        payload = forma_wire_format.encode_mesh(self._vertices(0))
+        with self.assertRaises(ValueError):
+            await self._import("site/a", payload[:-4], compact=True)
+
+        # The failed element holds no prim path
+        with self.assertRaises(ValueError):
+            await self._import("site/a/wall", payload[:-4], compact=True)
+        await self._import("site/b/wall", self._vertices(0))
+        manifest = StageManifest.load(Sdf.Layer.OpenAsAnonymous(self._usd_path))
+        self.assertEqual(manifest.get("site/b/wall").prim_path, get_prim_path("site/b/wall"))
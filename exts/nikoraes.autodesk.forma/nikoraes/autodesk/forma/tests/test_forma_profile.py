@@ -0,0 +1,64 @@
+import asyncio
+import concurrent.futures
+import os
+import tempfile
+
+import omni.kit.test
+
+from nikoraes.autodesk.forma.forma_profile import RequestProfiler, current_profiler
+from nikoraes.autodesk.forma.forma_request_manager import IMPORT, RequestManager
+
+
+def _busy_work(n: int) -> int:
+    return sum(i * i for i in range(n))
+
+
+class TestFormaProfile(omni.kit.test.AsyncTestCase):
+    async def test_request_profiler(self):
+        with tempfile.TemporaryDirectory() as folder:
+            pool = concurrent.futures.ThreadPoolExecutor(1)
+            with RequestProfiler("importmesh", folder, 10) as profiler:
+                self.assertIs(current_profiler(), profiler)
+                await asyncio.get_event_loop().run_in_executor(pool, profiler.wrap(_busy_work), 1000)
+            pool.shutdown()
+
+            # The worker pool call is merged in the profile of the request
+            self.assertIsNone(current_profiler())
+            self.assertTrue(os.path.isfile(profiler.path))
+            with open(profiler.path[: -len(".prof")] + ".txt") as f:
+                summary = f.read()
+            self.assertIn("importmesh", summary)
+            self.assertIn("_busy_work", [function for _, _, function in profiler.stats().stats])
+
+    async def test_one_request_at_a_time(self):
+        with tempfile.TemporaryDirectory() as folder:
+            with RequestProfiler("importmesh", folder) as first:
+                # A second request isn't profiled while the first one is
+                with RequestProfiler("deletemesh", folder) as second:
+                    self.assertIs(current_profiler(), first)
+            self.assertIsNone(second.path)
+            self.assertEqual(len(os.listdir(folder)), 2)
+
+    async def test_lane_does_not_keep_profiler(self):
+        manager = RequestManager(8, 1.0)
+        release = asyncio.Event()
+        profilers = []
+
+        async def first():
+            profilers.append(current_profiler())
+            await release.wait()
+
+        async def second():
+            profilers.append(current_profiler())
+
+        with tempfile.TemporaryDirectory() as folder:
+            with RequestProfiler("importmesh", folder) as profiler:
+                first_request = asyncio.ensure_future(manager.submit("site.usd", IMPORT, "a", profiler.bind(first)))
+                await asyncio.sleep(0)
+
+            # An unprofiled request queued in the lane the profiled one started is not profiled
+            second_request = asyncio.ensure_future(manager.submit("site.usd", IMPORT, "b", second))
+            await asyncio.sleep(0)
+            release.set()
+            await asyncio.gather(first_request, second_request)
+        self.assertEqual(profilers, [profiler, None])
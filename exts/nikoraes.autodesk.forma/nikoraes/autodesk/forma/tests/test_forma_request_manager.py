@@ -0,0 +1,84 @@
+import asyncio
+
+import omni.kit.test
+
+from nikoraes.autodesk.forma import forma_request_manager
+from nikoraes.autodesk.forma.forma_request_manager import DELETE, IMPORT, QueueFullError, RequestManager
+
+
+class TestRequestManager(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._events = []
+        self._busy = []
+        self._manager = RequestManager(
+            4, 2.0, on_busy=lambda: self._busy.append(True), on_idle=lambda: self._busy.append(False)
+        )
+
+    def _work(self, name: str, delay: float = 0.01):
+        async def work():
+            self._events.append(f"start {name}")
+            await asyncio.sleep(delay)
+            self._events.append(f"end {name}")
+            return name
+
+        return work
+
+    async def test_serialized_per_usd_path(self):
+        results = await asyncio.gather(
+            self._manager.submit("a.usd", IMPORT, "p/1", self._work("a1")),
+            self._manager.submit("a.usd", IMPORT, "p/2", self._work("a2")),
+            self._manager.submit("b.usd", IMPORT, "p/1", self._work("b1")),
+        )
+
+        self.assertEqual(results, ["a1", "a2", "b1"])
+        # Requests to a.usd never overlap, b.usd runs next to them
+        self.assertLess(self._events.index("end a1"), self._events.index("start a2"))
+        self.assertLess(self._events.index("start b1"), self._events.index("end a1"))
+        self.assertEqual(self._busy, [True, False])
+
+    async def test_coalescing(self):
+        results = await asyncio.gather(
+            self._manager.submit("a.usd", IMPORT, "p/0", self._work("running")),
+            self._manager.submit("a.usd", IMPORT, "p/1", self._work("old import")),
+            self._manager.submit("a.usd", IMPORT, "p/1", self._work("new import")),
+            self._manager.submit("a.usd", IMPORT, "p/2", self._work("import")),
+            self._manager.submit("a.usd", DELETE, "p/2", self._work("delete")),
+        )
+
+        self.assertEqual(
+            results,
+            [
+                "running",
+                forma_request_manager.SUPERSEDED_RESULT,
+                "new import",
+                forma_request_manager.SUPERSEDED_RESULT,
+                "delete",
+            ],
+        )
+        self.assertEqual(self._manager.superseded, 2)
+
+    async def test_queue_full(self):
+        # The first request starts running right away, the next four fill the queue
+        tasks = []
+        for i in range(5):
+            tasks.append(
+                asyncio.ensure_future(self._manager.submit("a.usd", IMPORT, f"p/{i}", self._work(str(i), 0.1)))
+            )
+            await asyncio.sleep(0)
+        self.assertEqual(self._manager.pending, 4)
+
+        with self.assertRaises(QueueFullError) as context:
+            await self._manager.submit("a.usd", IMPORT, "p/5", self._work("5"))
+        self.assertEqual(context.exception.retry_after, 2.0)
+
+        # Replacing a pending request does not need room in the queue
+        self.assertEqual(await self._manager.submit("a.usd", IMPORT, "p/4", self._work("4 again")), "4 again")
+        await asyncio.gather(*tasks)
+
+    async def test_errors_are_raised(self):
+        async def fail():
+            raise RuntimeError("failed")
+
+        with self.assertRaises(RuntimeError):
+            await self._manager.submit("a.usd", IMPORT, "p/1", fail)
+        self.assertFalse(self._manager.busy)
@@ -0,0 +1,55 @@
+import asyncio
+
+import omni.kit.test
+
+from nikoraes.autodesk.forma.forma_save import DeferredSaver
+
+
+class _FakeStage:
+    def __init__(self) -> None:
+        self.saves = 0
+
+    def Save(self):
+        self.saves += 1
+
+
+class TestDeferredSaver(omni.kit.test.AsyncTestCase):
+    async def test_burst_is_saved_once(self):
+        saved_paths = []
+        saver = DeferredSaver(0.05, 1.0, on_saved=saved_paths.append)
+        stage = _FakeStage()
+
+        for _ in range(20):
+            saver.mark_dirty("a.usd", stage)
+        self.assertEqual(stage.saves, 0)
+        self.assertTrue(saver.is_dirty("a.usd"))
+
+        await asyncio.sleep(0.2)
+        self.assertEqual(stage.saves, 1)
+        self.assertEqual(saved_paths, ["a.usd"])
+        self.assertFalse(saver.is_dirty("a.usd"))
+
+    async def test_max_delay(self):
+        saver = DeferredSaver(0.1, 0.15)
+        stage = _FakeStage()
+
+        # Changes keep coming faster than the quiet period, the max delay still forces a save
+        for _ in range(10):
+            saver.mark_dirty("a.usd", stage)
+            await asyncio.sleep(0.05)
+        self.assertGreaterEqual(stage.saves, 1)
+
+    async def test_flush_and_immediate_save(self):
+        saver = DeferredSaver(10.0, 10.0)
+        stage_a = _FakeStage()
+        stage_b = _FakeStage()
+
+        saver.mark_dirty("a.usd", stage_a)
+        saver.mark_dirty("b.usd", stage_b)
+        self.assertEqual(saver.flush("a.usd"), ["a.usd"])
+        self.assertEqual(stage_a.saves, 1)
+
+        # An immediate save replaces the deferred one
+        saver.save("b.usd", stage_b)
+        self.assertEqual(stage_b.saves, 1)
+        self.assertEqual(saver.flush(), [])
@@ -0,0 +1,127 @@
+import asyncio
+import os
+import tempfile
+
+import omni.kit.test
+from pxr import Sdf
+
+from nikoraes.autodesk.forma.forma_stage_cache import StageCache
+from nikoraes.autodesk.forma.utils import g_listing_cache, set_listing_cache_ttl
+
+_OUTSIDE_LAYER = '#usda 1.0\n\ndef "Outside"\n{\n}\n'
+
+
+class TestStageCache(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._folder = tempfile.TemporaryDirectory()
+
+    async def tearDown(self):
+        self._folder.cleanup()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self._folder.name, f"{name}.usda").replace("\\", "/")
+
+    def _set_listing_cache_ttl(self, ttl: float):
+        self.addCleanup(set_listing_cache_ttl, g_listing_cache.ttl)
+        set_listing_cache_ttl(ttl)
+
+    def _counters(self, cache: StageCache) -> tuple:
+        stats = cache.stats()
+        return (stats["hits"], stats["misses"], stats["reloads"], stats["evictions"])
+
+    async def test_lru_eviction(self):
+        cache = StageCache(max_size=2, idle_timeout=0)
+        layers = {name: cache.open_layer(self._path(name)) for name in ["a", "b"]}
+        self.assertIs(cache.open_layer(self._path("a")), layers["a"])
+
+        # b is the least recently used stage when c comes in
+        cache.open_layer(self._path("c"))
+        self.assertEqual(cache.stats()["size"], 2)
+        self.assertEqual(self._counters(cache), (1, 3, 0, 1))
+        cache.open_layer(self._path("a"))
+        self.assertEqual(self._counters(cache), (2, 3, 0, 1))
+        cache.open_layer(self._path("b"))
+        self.assertEqual(self._counters(cache), (2, 4, 0, 2))
+
+    async def test_idle_eviction(self):
+        cache = StageCache(max_size=2, idle_timeout=0.05)
+        cache.open_layer(self._path("a"))
+        await asyncio.sleep(0.1)
+
+        cache.open_layer(self._path("b"))
+        self.assertEqual(cache.stats()["size"], 1)
+        self.assertEqual(self._counters(cache), (0, 2, 0, 1))
+
+    async def test_stage(self):
+        cache = StageCache(max_size=2, idle_timeout=0)
+        stage = cache.open(self._path("a"))
+        self.assertIs(cache.open(self._path("a")), stage)
+        self.assertIs(stage.GetRootLayer(), cache.open_layer(self._path("a")))
+
+    async def test_reload_changed_file(self):
+        usd_path = self._path("a")
+        cache = StageCache(max_size=2, idle_timeout=0)
+        layer = cache.open_layer(usd_path)
+        layer.Save()
+        cache.mark_saved(usd_path)
+        self.assertEqual(self._counters(cache), (0, 1, 0, 0))
+
+        # A save of the connector is not an outside change
+        cache.open_layer(usd_path)
+        self.assertEqual(self._counters(cache), (1, 1, 0, 0))
+
+        with open(usd_path, "w") as file:
+            file.write(_OUTSIDE_LAYER)
+        self.assertIs(cache.open_layer(usd_path), layer)
+        self.assertTrue(layer.GetPrimAtPath("/Outside"))
+        self.assertEqual(self._counters(cache), (1, 1, 1, 0))
+
+        # A deleted file starts over with a new layer
+        os.remove(usd_path)
+        self.assertFalse(cache.open_layer(usd_path).GetPrimAtPath("/Outside"))
+        self.assertTrue(os.path.exists(usd_path))
+        self.assertEqual(self._counters(cache), (1, 2, 1, 0))
+
+    async def test_deleted_uncached_file(self):
+        usd_path = self._path("a")
+        self._set_listing_cache_ttl(30.0)
+        cache = StageCache(max_size=0, idle_timeout=0)
+        cache.open_layer(usd_path)
+
+        # The listing cache still knows the file, which was deleted while no layer was open
+        os.remove(usd_path)
+        self.assertIs(g_listing_cache.get(usd_path), True)
+        self.assertIsNone(cache.open_layer(usd_path, create=False))
+        self.assertIs(g_listing_cache.get(usd_path), False)
+        self.assertIsNotNone(cache.open_layer(usd_path))
+        self.assertTrue(os.path.exists(usd_path))
+
+    async def test_unreadable_file(self):
+        usd_path = self._path("a")
+        with open(usd_path, "w") as file:
+            file.write("#usda 1.0\n(")
+        with self.assertRaises(Exception):
+            StageCache(max_size=2, idle_timeout=0).open_layer(usd_path)
+        self.assertTrue(os.path.exists(usd_path))
+
+    async def test_keep_unsaved_edits(self):
+        usd_path = self._path("a")
+        cache = StageCache(max_size=2, idle_timeout=0)
+        layer = cache.open_layer(usd_path)
+        layer.Save()
+        cache.mark_saved(usd_path)
+
+        # Edits waiting for a deferred save survive an outside change of the file
+        Sdf.CreatePrimInLayer(layer, "/Unsaved")
+        with open(usd_path, "w") as file:
+            file.write(_OUTSIDE_LAYER)
+        cache.open_layer(usd_path)
+        self.assertTrue(layer.GetPrimAtPath("/Unsaved"))
+        self.assertEqual(self._counters(cache), (1, 1, 0, 0))
+
+        # Once saved, the connector's layer wins
+        layer.Save()
+        cache.mark_saved(usd_path)
+        cache.open_layer(usd_path)
+        self.assertTrue(layer.GetPrimAtPath("/Unsaved"))
+        self.assertEqual(self._counters(cache), (2, 1, 0, 0))
@@ -0,0 +1,64 @@
+import os
+import tempfile
+from unittest import mock
+
+import omni.kit.test
+import omni.usd
+from pxr import Usd
+
+from nikoraes.autodesk.forma.forma_stage_cache import StageCache
+from nikoraes.autodesk.forma.forma_stage_router import StageRouter
+
+
+class _FakeContext:
+    def __init__(self, stage: Usd.Stage = None, url: str = "") -> None:
+        self._stage = stage
+        self._url = url
+
+    def get_stage(self):
+        return self._stage
+
+    def get_stage_url(self):
+        return self._url
+
+
+class TestStageRouter(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._folder = tempfile.TemporaryDirectory()
+        self._usd_path = os.path.join(self._folder.name, "site.usda").replace("\\", "/")
+        self._router = StageRouter(StageCache(max_size=2, idle_timeout=0))
+
+    async def tearDown(self):
+        self._folder.cleanup()
+
+    def _context(self, stage: Usd.Stage = None, url: str = ""):
+        return mock.patch.object(omni.usd, "get_context", lambda: _FakeContext(stage, url))
+
+    async def test_resolve(self):
+        with self._context():
+            self.assertEqual(self._router.resolve(self._usd_path), self._usd_path)
+            self.assertEqual(self._router.resolve(self._usd_path.replace("/", "\\")), self._usd_path)
+            # Without a usd_path or a stage open in Kit there is nothing to write to
+            self.assertEqual(self._router.resolve(""), "")
+            with self.assertRaises(ValueError):
+                self._router.open_layer("")
+            with self.assertRaises(ValueError):
+                self._router.open("")
+
+    async def test_context_stage(self):
+        stage = Usd.Stage.CreateInMemory()
+        with self._context(stage, self._usd_path):
+            # The stage open in Kit is used as is, for an empty usd_path and its own url
+            self.assertEqual(self._router.resolve(""), self._usd_path)
+            self.assertIs(self._router.open(self._usd_path), stage)
+            self.assertIs(self._router.open_layer(self._usd_path), stage.GetRootLayer())
+        self.assertFalse(os.path.exists(self._usd_path))
+
+    async def test_open_cached(self):
+        with self._context():
+            self.assertIsNone(self._router.open_layer(self._usd_path, create=False))
+            self.assertFalse(os.path.exists(self._usd_path))
+
+            layer = self._router.open_layer(self._usd_path)
+            self.assertIs(self._router.open_layer(self._usd_path, create=False), layer)
+            self.assertIs(self._router.open(self._usd_path).GetRootLayer(), layer)
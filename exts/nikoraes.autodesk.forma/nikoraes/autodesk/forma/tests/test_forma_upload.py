@@ -0,0 +1,95 @@
+import gc
+import io
+import os
+import tempfile
+import weakref
+from unittest import mock
+
+import numpy as np
+import omni.kit.test
+
+from nikoraes.autodesk.forma import forma_upload
+
+
+class _FakeUpload:
+    """An UploadFile that returns at most read_size bytes per read, like a stream cut at any byte"""
+
+    def __init__(self, data: bytes, read_size: int) -> None:
+        self.file = io.BytesIO(data)
+        self._read_size = read_size
+
+    async def read(self, size: int = -1) -> bytes:
+        return self.file.read(min(size, self._read_size))
+
+
+class TestFormaUpload(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._vertices = np.random.default_rng(0).random((30, 3), dtype=np.float32)
+
+    async def test_read_chunks(self):
+        data = self._vertices.tobytes()
+        # Reads cut through vertices, the chunk size is not a multiple of a vertex either
+        for read_size, chunk_size in [(7, 100), (1000, 50), (5, 5)]:
+            vertices = await forma_upload.read_upload_vertices(_FakeUpload(data, read_size), chunk_size, 0)
+            np.testing.assert_array_equal(vertices, self._vertices)
+
+    async def test_read_partial_vertex(self):
+        data = self._vertices.tobytes() + bytes(7)
+        vertices = await forma_upload.read_upload_vertices(_FakeUpload(data, 7), 64, 0)
+        np.testing.assert_array_equal(vertices, self._vertices)
+
+        vertices = await forma_upload.read_upload_vertices(_FakeUpload(bytes(7), 7), 64, 0)
+        self.assertEqual(vertices.shape, (0, 3))
+
+    async def test_read_empty(self):
+        vertices = await forma_upload.read_upload_vertices(_FakeUpload(b"", 7), 64, 0)
+        self.assertEqual(vertices.shape, (0, 3))
+        self.assertEqual(vertices.dtype, np.float32)
+
+    async def test_read_spooled(self):
+        data = self._vertices.tobytes()
+        temporary_file = tempfile.TemporaryFile
+        files = []
+
+        def _temporary_file(*args, **kwargs):
+            file = temporary_file(*args, **kwargs)
+            files.append(weakref.ref(file))
+            return file
+
+        with tempfile.TemporaryDirectory() as folder, mock.patch.object(
+            forma_upload.tempfile, "TemporaryFile", lambda: _temporary_file(dir=folder)
+        ):
+            # Small payloads stay in memory, larger ones are memory-mapped
+            vertices = await forma_upload.read_upload_vertices(_FakeUpload(data, 7), 64, len(data))
+            self.assertNotIsInstance(vertices, np.memmap)
+            self.assertEqual(files, [])
+
+            vertices = await forma_upload.read_upload_vertices(_FakeUpload(data, 7), 64, len(data) - 1)
+            self.assertIsInstance(vertices, np.memmap)
+            np.testing.assert_array_equal(vertices, self._vertices)
+
+            # The temporary file is closed and gone once the array is released
+            del vertices
+            gc.collect()
+            self.assertEqual(len(files), 1)
+            self.assertTrue(files[0]() is None or files[0]().closed)
+            self.assertEqual(os.listdir(folder), [])
+
+    async def test_slice_batch(self):
+        vertices = np.arange(18, dtype=np.float32).reshape(6, 3)
+        elements = forma_upload.slice_batch(vertices, False, [("a", 0, 36), ("b", 36, 36)])
+        self.assertEqual([forma_path for forma_path, _ in elements], ["a", "b"])
+        self.assertTrue(np.array_equal(elements[1][1], vertices[3:]))
+
+        payload = bytes(range(10))
+        elements = forma_upload.slice_batch(payload, True, [("a", 2, 5)])
+        self.assertEqual(bytes(elements[0][1]), payload[2:7])
+
+    async def test_slice_batch_invalid(self):
+        vertices = np.zeros((6, 3), dtype=np.float32)
+        # Negative, empty, out of the buffer and unaligned ranges are rejected
+        for offset, length in [(-12, 24), (12, 0), (0, -12), (36, 48), (4, 12), (0, 10)]:
+            with self.assertRaises(ValueError):
+                forma_upload.slice_batch(vertices, False, [("a", offset, length)])
+        with self.assertRaises(ValueError):
+            forma_upload.slice_batch(bytes(10), True, [("a", 10, 0)])
@@ -0,0 +1,92 @@
+import unittest
+import zlib
+from unittest import mock
+
+import numpy as np
+import omni.kit.test
+
+from nikoraes.autodesk.forma import forma_wire_format
+
+
+class TestFormaWireFormat(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        rng = np.random.default_rng(0)
+        self._points = (rng.random((100, 3)) * 1000 - 500).astype(np.float32)
+        self._indices = rng.integers(0, 100, 300).astype(np.int32)
+
+    async def test_is_compact(self):
+        self.assertFalse(forma_wire_format.is_compact("1.0"))
+        self.assertTrue(forma_wire_format.is_compact("2.0"))
+        self.assertTrue(forma_wire_format.is_compact("2.1"))
+        self.assertFalse(forma_wire_format.is_compact("invalid"))
+
+    async def test_float32_roundtrip(self):
+        payload = forma_wire_format.encode_mesh(
+            self._points,
+            self._indices,
+            position_type=forma_wire_format.POSITION_FLOAT32,
+            compression=forma_wire_format.COMPRESSION_NONE,
+        )
+        mesh_data = forma_wire_format.decode_mesh(payload)
+
+        np.testing.assert_array_equal(mesh_data.points, self._points)
+        np.testing.assert_array_equal(mesh_data.face_vertex_indices, self._indices)
+        self.assertEqual(mesh_data.face_count, 100)
+
+    async def test_quantized_roundtrip(self):
+        for position_type, tolerance in [
+            (forma_wire_format.POSITION_INT16, 0.02),
+            (forma_wire_format.POSITION_INT32, 1e-4),
+        ]:
+            payload = forma_wire_format.encode_mesh(self._points, self._indices, position_type=position_type)
+            mesh_data = forma_wire_format.decode_mesh(payload)
+            np.testing.assert_allclose(mesh_data.points, self._points, atol=tolerance)
+
+    async def test_triangle_soup(self):
+        payload = forma_wire_format.encode_mesh(self._points[:99])
+        mesh_data = forma_wire_format.decode_mesh(payload)
+
+        self.assertEqual(mesh_data.face_count, 33)
+        self.assertEqual(list(mesh_data.face_vertex_indices), list(range(99)))
+
+    async def test_malformed_payloads(self):
+        payload = forma_wire_format.encode_mesh(self._points, self._indices)
+        with self.assertRaises(ValueError):
+            forma_wire_format.decode_mesh(payload[:20])
+        with self.assertRaises(ValueError):
+            forma_wire_format.decode_mesh(b"XXXX" + payload[4:])
+        with self.assertRaises(ValueError):
+            forma_wire_format.decode_mesh(payload[:-10])
+
+    async def test_oversize_payload(self):
+        payload = forma_wire_format.encode_mesh(self._points[:3], position_type=forma_wire_format.POSITION_FLOAT32)
+        header = payload[: forma_wire_format._HEADER.size]
+        # The body inflates to far more than the 3 vertices of the header
+        body = zlib.compress(bytes(1024 * 1024))
+        with self.assertRaises(ValueError):
+            forma_wire_format.decode_mesh(header + body)
+        # Trailing bytes after the compressed stream are rejected too
+        with self.assertRaises(ValueError):
+            forma_wire_format.decode_mesh(payload + b"\0")
+
+    @unittest.skipIf(forma_wire_format.zstandard is None, "zstandard is not installed")
+    async def test_oversize_zstd_payload(self):
+        zstandard = forma_wire_format.zstandard
+        payload = forma_wire_format.encode_mesh(
+            self._points[:3],
+            position_type=forma_wire_format.POSITION_FLOAT32,
+            compression=forma_wire_format.COMPRESSION_ZSTD,
+        )
+        np.testing.assert_array_equal(forma_wire_format.decode_mesh(payload).points, self._points[:3])
+
+        # A frame declaring far more than the 3 vertices of the header is rejected before it is decompressed
+        header = payload[: forma_wire_format._HEADER.size]
+        body = zstandard.ZstdCompressor().compress(bytes(1024 * 1024))
+        with mock.patch.object(zstandard, "ZstdDecompressor", side_effect=AssertionError("decompressed")):
+            with self.assertRaises(ValueError):
+                forma_wire_format.decode_mesh(header + body)
+
+        # Without a declared size, decompressing stops at the size of the header
+        body = zstandard.ZstdCompressor(write_content_size=False).compress(bytes(1024 * 1024))
+        with self.assertRaises(ValueError):
+            forma_wire_format.decode_mesh(header + body)
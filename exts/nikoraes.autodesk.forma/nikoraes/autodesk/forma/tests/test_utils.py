@@ -0,0 +1,88 @@
+from unittest import mock
+
+import omni.client
+import omni.kit.test
+
+from nikoraes.autodesk.forma import utils
+
+FOLDER = "omniverse://localhost/Projects/Forma"
+
+
+class _FakeClient:
+    """Stand-in for the omni.client listing and stat calls, over a large in-memory folder"""
+
+    def __init__(self, file_count: int) -> None:
+        self.files = {f"{FOLDER}/stage_{i}.usd" for i in range(file_count)}
+        self.stat_calls = 0
+        self.list_calls = 0
+
+    def stat(self, url: str):
+        self.stat_calls += 1
+        if url in self.files:
+            return omni.client.Result.OK, None
+        return omni.client.Result.ERROR_NOT_FOUND, None
+
+    def list(self, url: str):
+        self.list_calls += 1
+        raise AssertionError("nucleus_file_exists should not list folders")
+
+
+class TestNucleusFileExists(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._client = _FakeClient(10000)
+        self._patches = [
+            mock.patch.object(omni.client, "stat", self._client.stat),
+            mock.patch.object(omni.client, "list", self._client.list),
+        ]
+        for patch in self._patches:
+            patch.start()
+        # The listing cache is shared with the other test modules, its TTL is put back after every test
+        self._ttl = utils.g_listing_cache.ttl
+        utils.set_listing_cache_ttl(30.0)
+
+    async def tearDown(self):
+        for patch in self._patches:
+            patch.stop()
+        utils.set_listing_cache_ttl(self._ttl)
+
+    async def test_single_stat_per_file(self):
+        self.assertTrue(utils.nucleus_file_exists(f"{FOLDER}/stage_9999.usd"))
+        self.assertFalse(utils.nucleus_file_exists(f"{FOLDER}/missing.usd"))
+        self.assertEqual(self._client.stat_calls, 2)
+
+        # Repeated checks are answered from the cache
+        for _ in range(100):
+            self.assertTrue(utils.nucleus_file_exists(f"{FOLDER}/stage_9999.usd"))
+            self.assertFalse(utils.nucleus_file_exists(f"{FOLDER}/missing.usd"))
+        self.assertEqual(self._client.stat_calls, 2)
+        self.assertEqual(self._client.list_calls, 0)
+
+    async def test_created_and_deleted_files(self):
+        path = f"{FOLDER}/new.usd"
+        self.assertFalse(utils.nucleus_file_exists(path))
+
+        self._client.files.add(path)
+        utils.mark_file_created(path)
+        self.assertTrue(utils.nucleus_file_exists(path))
+
+        self._client.files.remove(path)
+        utils.mark_file_deleted(path)
+        self.assertFalse(utils.nucleus_file_exists(path))
+        self.assertEqual(self._client.stat_calls, 1)
+
+    async def test_invalidate(self):
+        path = f"{FOLDER}/stage_0.usd"
+        self.assertTrue(utils.nucleus_file_exists(path))
+
+        # A change made outside the connector is seen after invalidating the folder
+        self._client.files.remove(path)
+        utils.invalidate_listing_cache(FOLDER)
+        self.assertFalse(utils.nucleus_file_exists(path))
+        self.assertEqual(self._client.stat_calls, 2)
+
+    async def test_ttl_disabled(self):
+        utils.set_listing_cache_ttl(0)
+        path = f"{FOLDER}/stage_0.usd"
+        for _ in range(3):
+            self.assertTrue(utils.nucleus_file_exists(path))
+        self.assertEqual(self._client.stat_calls, 3)
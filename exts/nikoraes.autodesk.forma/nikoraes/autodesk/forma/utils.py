@@ -1,6 +1,5 @@
-import os
-import pathlib
 import shutil
+import time
 from collections import namedtuple
 from typing import List, Dict, Callable
 
@@ -12,12 +11,77 @@ from pxr import Usd, UsdShade, Sdf
 import carb
 
 
+class _ListingCache:
+    """Known entries of Nucleus folders, filled one stat at a time and forgotten after `ttl` seconds"""
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self._folders = {}
+
+    def get(self, file_path: str):
+        """True or False when the existence of file_path is known, None otherwise"""
+        folder, filename = _split_url(file_path)
+        listing = self._folders.get(folder)
+        if listing is None:
+            return None
+        expires, entries = listing
+        if expires < time.monotonic():
+            del self._folders[folder]
+            return None
+        return entries.get(filename)
+
+    def set(self, file_path: str, exists: bool):
+        if self.ttl <= 0:
+            return
+        folder, filename = _split_url(file_path)
+        listing = self._folders.get(folder)
+        if listing is None or listing[0] < time.monotonic():
+            listing = (time.monotonic() + self.ttl, {})
+            self._folders[folder] = listing
+        listing[1][filename] = exists
+
+    def invalidate(self, folder: str = None):
+        if folder is None:
+            self._folders.clear()
+        else:
+            self._folders.pop(folder.rstrip("/"), None)
+
+
+g_listing_cache = _ListingCache(ttl=30.0)
+
+
+def _split_url(file_path: str):
+    folder, _, filename = file_path.rstrip("/").rpartition("/")
+    return folder, filename
+
+
 def nucleus_file_exists(file_path: str) -> bool:
-    p = pathlib.Path(file_path)
-    filename = p.name
+    """Check if a file exists with a single stat, answering from the listing cache when possible"""
+    exists = g_listing_cache.get(file_path)
+    if exists is None:
+        result, _ = omni.client.stat(file_path)
+        exists = result == omni.client.Result.OK
+        g_listing_cache.set(file_path, exists)
+
+    return exists
+
+
+def mark_file_created(file_path: str):
+    """Record in the listing cache that the connector created file_path"""
+    g_listing_cache.set(file_path, True)
+
+
+def mark_file_deleted(file_path: str):
+    """Record in the listing cache that the connector deleted file_path"""
+    g_listing_cache.set(file_path, False)
+
+
+def invalidate_listing_cache(folder: str = None):
+    """Forget the cached entries of folder, or of every folder when no folder is given"""
+    g_listing_cache.invalidate(folder)
 
-    for entry in omni.client.list(os.path.dirname(file_path))[1]:
-        if entry.relative_path == filename:
-            return True
 
-    return False
+def set_listing_cache_ttl(ttl: float):
+    """Seconds the existence of a file is cached, 0 to always stat"""
+    g_listing_cache.ttl = ttl
+    g_listing_cache.invalidate()